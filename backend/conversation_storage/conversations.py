@@ -10,7 +10,7 @@ import logging
 import uuid
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from backend.gcs_storage import StorageBackend
 
@@ -225,6 +225,50 @@ class ConversationStore:
             logger.error(f"Error loading conversation: {conversation_id} - {e}")
             return None
 
+    def get_or_create_conversation(
+        self,
+        conversation_id: str,
+        area: str,
+        site: str,
+        profile_name: Optional[str] = None,
+    ) -> Tuple[Conversation, bool]:
+        """
+        Load a conversation, creating and saving it if it doesn't exist.
+
+        The new conversation is written with a create-if-absent upload, so two
+        concurrent first messages can't overwrite each other; the loser loads
+        the winner's conversation instead.
+
+        Args:
+            conversation_id: Conversation ID
+            area: Location area (used when creating)
+            site: Location site (used when creating)
+            profile_name: Optional WhatsApp profile name (used when creating)
+
+        Returns:
+            Tuple of (conversation, created)
+
+        Raises:
+            IOError: If the conversation can't be created or loaded
+        """
+        conversation = self.get_conversation(conversation_id)
+        if conversation:
+            return conversation, False
+
+        conversation = self.create_conversation(
+            area=area, site=site, conversation_id=conversation_id, profile_name=profile_name
+        )
+        content = json.dumps(conversation.to_dict(), ensure_ascii=False, indent=2)
+        if self.storage.write_file_if_absent(self._get_gcs_path(conversation_id), content):
+            logger.info(f"Saved new conversation: {conversation_id}")
+            return conversation, True
+
+        # Lost the race: another request created it first
+        existing = self.get_conversation(conversation_id)
+        if existing is None:
+            raise IOError(f"Conversation exists but could not be loaded: {conversation_id}")
+        return existing, False
+
     def save_conversation(self, conversation: Conversation) -> bool:
         """
         Save conversation to GCS.
@@ -12,6 +12,7 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import List, Optional
 
+from google.api_core.exceptions import NotFound, PreconditionFailed
 from google.cloud import storage
 from google.oauth2 import service_account
 
@@ -44,6 +45,20 @@ class StorageBackend(ABC):
         """Check if file exists at path."""
         pass
 
+    def write_file_if_absent(self, path: str, content: str) -> bool:
+        """
+        Write content only if no file exists at path.
+
+        Default implementation checks then writes (not atomic); backends with
+        conditional writes override it.
+
+        Returns:
+            True if written, False if the file already existed
+        """
+        if self.file_exists(path):
+            return False
+        return self.write_file(path, content)
+
 
 class GCSStorage(StorageBackend):
     """Google Cloud Storage implementation"""
@@ -93,10 +108,38 @@ class GCSStorage(StorageBackend):
             print(f"Error writing to GCS: {e}")
             return False
 
+    def write_file_if_absent(self, path: str, content: str) -> bool:
+        """
+        Create GCS blob only if it doesn't exist (single conditional upload)
+
+        Uses ifGenerationMatch=0, so concurrent creators can't overwrite each other.
+
+        Args:
+            path: Blob path
+            content: Text content to write
+
+        Returns:
+            True if created, False if the blob already existed
+
+        Raises:
+            IOError: On other GCS errors
+        """
+        try:
+            blob = self.bucket.blob(path)
+            blob.upload_from_string(content, content_type="text/plain", if_generation_match=0)
+            return True
+        except PreconditionFailed:
+            return False
+        except Exception as e:
+            raise IOError(f"Error writing to GCS: {e}")
+
     def read_file(self, path: str) -> str:
         """
         Read content from GCS blob
 
+        Downloads directly and maps 404 to FileNotFoundError (one request, no
+        separate exists() check).
+
         Args:
             path: Blob path
 
@@ -107,13 +150,10 @@ class GCSStorage(StorageBackend):
             FileNotFoundError: If blob doesn't exist
         """
         try:
-            blob = self.bucket.blob(path)
-            if not blob.exists():
-                raise FileNotFoundError(f"File not found in GCS: {path}")
-            return blob.download_as_text()
+            return self.bucket.blob(path).download_as_text()
+        except NotFound:
+            raise FileNotFoundError(f"File not found in GCS: {path}")
         except Exception as e:
-            if isinstance(e, FileNotFoundError):
-                raise
             raise IOError(f"Error reading from GCS: {e}")
 
     def read_file_bytes(self, path: str) -> bytes:
@@ -313,6 +353,22 @@ class CachedGCSStorage(StorageBackend):
 
         return success
 
+    def write_file_if_absent(self, path: str, content: str) -> bool:
+        """
+        Create in GCS only if absent, then write-through to cache
+
+        Args:
+            path: Blob path
+            content: Text content
+
+        Returns:
+            True if created, False if the blob already existed
+        """
+        created = self.gcs.write_file_if_absent(path, content)
+        if created:
+            self._write_to_cache(path, content)
+        return created
+
     def read_file(self, path: str) -> str:
         """
         Read from cache first, fall back to GCS (read-through)
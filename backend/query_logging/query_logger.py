@@ -12,9 +12,24 @@ from typing import Dict, List, Optional
 
 from backend.gcs_storage import StorageBackend
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+def _dumps_line(log_entry: dict) -> str:
+    """Serialize a log entry as one JSONL line (orjson when installed)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            log_entry, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        ).decode("utf-8")
+    return json.dumps(log_entry, ensure_ascii=False) + "\n"
+
+
 class QueryLogger:
     """
     Logs queries to GCS in JSONL format (one JSON object per line).
@@ -49,7 +64,7 @@ class QueryLogger:
 
         return f"{self.gcs_prefix}/{date_str}.jsonl"
 
-    def log_query(
+    def build_entry(
         self,
         conversation_id: str,
         area: str,
@@ -67,33 +82,17 @@ class QueryLogger:
         citations: Optional[List[dict]] = None,
         images: Optional[List[dict]] = None,
         timing_breakdown: Optional[Dict[str, float]] = None,
-    ):
+    ) -> dict:
         """
-        Log a query to GCS.
-
-        Appends to today's JSONL file. Failures are logged but do not raise exceptions
-        (graceful degradation - logging should not break API requests).
+        Build a query log entry (timestamped now) without writing it.
 
         Args:
-            conversation_id: Conversation ID
-            area: Location area
-            site: Location site
-            query: User query text
-            response_text: Assistant response text
-            latency_ms: Query latency in milliseconds
-            citations_count: Number of citations in response (deprecated, use citations)
-            images_count: Number of images in response (deprecated, use images)
-            model_name: Model used for response
-            temperature: Temperature used for response
-            error: Error message if query failed
-            should_include_images: Boolean indicating if images should be shown
-            image_relevance: List of dicts with image_uri and relevance_score
-            citations: Full list of citations with source, chunk_id, text
-            images: List of displayed images with uri, caption, context, relevance_score
-            timing_breakdown: Dict of timing checkpoints to timestamps (milliseconds since epoch)
+            Same as log_query()
+
+        Returns:
+            Log entry dict, ready for log_batch()
         """
         timestamp = datetime.utcnow().isoformat() + "Z"
-        log_path = self._get_log_path()
 
         # Create log entry with all fields
         log_entry = {
@@ -131,34 +130,122 @@ class QueryLogger:
                 k: round(v, 2) for k, v in timing_breakdown.items()
             }
 
-        try:
-            # Read existing content
+        return log_entry
+
+    def log_query(
+        self,
+        conversation_id: str,
+        area: str,
+        site: str,
+        query: str,
+        response_text: str,
+        latency_ms: float,
+        citations_count: int = 0,
+        images_count: int = 0,
+        model_name: Optional[str] = None,
+        temperature: Optional[float] = None,
+        error: Optional[str] = None,
+        should_include_images: Optional[bool] = None,
+        image_relevance: Optional[List[dict]] = None,
+        citations: Optional[List[dict]] = None,
+        images: Optional[List[dict]] = None,
+        timing_breakdown: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Log a query to GCS.
+
+        Appends to today's JSONL file. Failures are logged but do not raise exceptions
+        (graceful degradation - logging should not break API requests).
+
+        Args:
+            conversation_id: Conversation ID
+            area: Location area
+            site: Location site
+            query: User query text
+            response_text: Assistant response text
+            latency_ms: Query latency in milliseconds
+            citations_count: Number of citations in response (deprecated, use citations)
+            images_count: Number of images in response (deprecated, use images)
+            model_name: Model used for response
+            temperature: Temperature used for response
+            error: Error message if query failed
+            should_include_images: Boolean indicating if images should be shown
+            image_relevance: List of dicts with image_uri and relevance_score
+            citations: Full list of citations with source, chunk_id, text
+            images: List of displayed images with uri, caption, context, relevance_score
+            timing_breakdown: Dict of timing checkpoints to timestamps (milliseconds since epoch)
+        """
+        log_entry = self.build_entry(
+            conversation_id=conversation_id,
+            area=area,
+            site=site,
+            query=query,
+            response_text=response_text,
+            latency_ms=latency_ms,
+            citations_count=citations_count,
+            images_count=images_count,
+            model_name=model_name,
+            temperature=temperature,
+            error=error,
+            should_include_images=should_include_images,
+            image_relevance=image_relevance,
+            citations=citations,
+            images=images,
+            timing_breakdown=timing_breakdown,
+        )
+        self.log_batch([log_entry])
+
+        logger.debug(
+            f"Logged query: {conversation_id} ({area}/{site}) - {latency_ms:.0f}ms"
+        )
+
+    def log_batch(self, entries: List[dict]):
+        """
+        Append several log entries with one read-modify-write per daily file.
+
+        Entries are grouped by the date of their timestamp. Failures are logged
+        but do not raise exceptions; an entry that can't be serialized is
+        skipped without dropping the rest of the batch.
+
+        Args:
+            entries: Log entries from build_entry()
+        """
+        lines_by_path: Dict[str, List[str]] = {}
+        for log_entry in entries:
+            try:
+                date_str = log_entry["timestamp"][:10]  # YYYY-MM-DD
+                line = _dumps_line(log_entry)
+            except Exception as e:
+                logger.error(
+                    f"Skipping unserializable query log entry "
+                    f"({log_entry.get('conversation_id')}): {e}"
+                )
+                continue
+            lines_by_path.setdefault(self._get_log_path(date_str), []).append(line)
+
+        for log_path, lines in lines_by_path.items():
             try:
-                existing_content = self.storage.read_file(log_path)
-            except FileNotFoundError:
-                existing_content = ""
+                # Read existing content
+                try:
+                    existing_content = self.storage.read_file(log_path)
+                except FileNotFoundError:
+                    existing_content = ""
 
-            # Append new log entry as JSON line
-            json_line = json.dumps(log_entry, ensure_ascii=False)
-            new_content = existing_content + json_line + "\n"
+                # Append new log entries as JSON lines
+                new_content = existing_content + "".join(lines)
 
-            # Write back to GCS
-            self.storage.write_file(log_path, new_content)
+                # Write back to GCS
+                self.storage.write_file(log_path, new_content)
 
-            logger.debug(
-                f"Logged query to {log_path}: "
-                f"{conversation_id} ({area}/{site}) - {latency_ms:.0f}ms"
-            )
+                logger.debug(f"Logged {len(lines)} {'query' if len(lines) == 1 else 'queries'} to {log_path}")
 
-        except Exception as e:
-            # Log error but don't fail the API request
-            logger.error(f"Failed to write query log to GCS: {e}")
-
-            # Fallback: log to Cloud Logging (stderr)
-            logger.warning(
-                f"Query log (fallback to Cloud Logging): "
-                f"{json.dumps(log_entry, ensure_ascii=False)}"
-            )
+            except Exception as e:
+                # Log error but don't fail the API request
+                logger.error(f"Failed to write query log to GCS: {e}")
+
+                # Fallback: log to Cloud Logging (stderr)
+                for line in lines:
+                    logger.warning(f"Query log (fallback to Cloud Logging): {line.rstrip()}")
 
     def get_logs(self, date_str: str) -> List[dict]:
         """
@@ -167,6 +167,57 @@ class TestConversationStore:
         conv = store.get_conversation("test-123")
         assert conv is None
 
+    def test_get_or_create_conversation_existing(self, store, mock_storage):
+        """Test that an existing conversation is loaded without writing."""
+        mock_storage.read_file.return_value = json.dumps({
+            "conversation_id": "test-123",
+            "area": "area1",
+            "site": "site1",
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:00Z",
+            "messages": [],
+        })
+
+        conv, created = store.get_or_create_conversation("test-123", "area1", "site1")
+
+        assert created is False
+        assert conv.conversation_id == "test-123"
+        mock_storage.write_file_if_absent.assert_not_called()
+
+    def test_get_or_create_conversation_creates(self, store, mock_storage):
+        """Test that a missing conversation is created with one conditional write."""
+        mock_storage.read_file.side_effect = FileNotFoundError()
+        mock_storage.write_file_if_absent.return_value = True
+
+        conv, created = store.get_or_create_conversation(
+            "test-123", "area1", "site1", profile_name="Dana"
+        )
+
+        assert created is True
+        assert conv.profile_name == "Dana"
+        path, content = mock_storage.write_file_if_absent.call_args[0]
+        assert path == "test-conversations/test-123.json"
+        assert json.loads(content)["conversation_id"] == "test-123"
+        mock_storage.write_file.assert_not_called()
+
+    def test_get_or_create_conversation_lost_race(self, store, mock_storage):
+        """Test that losing the create race loads the winner's conversation."""
+        winner = json.dumps({
+            "conversation_id": "test-123",
+            "area": "area1",
+            "site": "site1",
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:00Z",
+            "messages": [{"role": "user", "content": "hi", "timestamp": datetime.utcnow().isoformat() + "Z"}],
+        })
+        mock_storage.read_file.side_effect = [FileNotFoundError(), winner]
+        mock_storage.write_file_if_absent.return_value = False
+
+        conv, created = store.get_or_create_conversation("test-123", "area1", "site1")
+
+        assert created is False
+        assert len(conv.messages) == 1
+
     def test_save_conversation(self, store, mock_storage):
         """Test saving a conversation."""
         conv = Conversation(
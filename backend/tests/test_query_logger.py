@@ -426,3 +426,55 @@ class TestQueryLogger:
         assert log_entry["citations"][0]["text"] == "טקסט בעברית עם ציטוט מהמסמך המקורי"
         assert log_entry["images"][0]["caption"] == "כיתוב בעברית"
         assert "הקשר לפני" in log_entry["images"][0]["context"]
+
+    def test_log_batch_single_write_per_day(self, logger, mock_storage):
+        """Test that a batch is appended with one read and one write per daily file."""
+        mock_storage.read_file.return_value = '{"query": "old"}\n'
+
+        entries = [
+            logger.build_entry("conv-1", "area1", "site1", "q1", "r1", 10.0),
+            logger.build_entry("conv-2", "area1", "site1", "q2", "r2", 20.0),
+        ]
+        old_entry = dict(entries[0], timestamp="2024-01-15T10:00:00Z", query="q0")
+        logger.log_batch(entries + [old_entry])
+
+        assert mock_storage.read_file.call_count == 2
+        assert mock_storage.write_file.call_count == 2
+        written = {c[0][0]: c[0][1] for c in mock_storage.write_file.call_args_list}
+
+        today_content = written[logger._get_log_path()]
+        lines = today_content.splitlines()
+        assert lines[0] == '{"query": "old"}'
+        assert [json.loads(line)["query"] for line in lines[1:]] == ["q1", "q2"]
+
+        old_content = written["test-logs/2024-01-15.jsonl"]
+        assert json.loads(old_content.splitlines()[-1])["query"] == "q0"
+
+    def test_log_batch_skips_unserializable_entry(self, logger, mock_storage):
+        """Test that one entry that can't be serialized doesn't drop the batch."""
+        mock_storage.read_file.side_effect = FileNotFoundError()
+
+        entries = [
+            logger.build_entry("conv-1", "area1", "site1", "q1", "r1", 10.0),
+            logger.build_entry("conv-2", "area1", "site1", "q2", "r2", 20.0),
+        ]
+        entries[0]["image_relevance"] = [{"image_uri": object()}]
+        logger.log_batch(entries)
+
+        mock_storage.write_file.assert_called_once()
+        lines = mock_storage.write_file.call_args[0][1].splitlines()
+        assert [json.loads(line)["query"] for line in lines] == ["q2"]
+
+    def test_log_query_unserializable_field_does_not_raise(self, logger, mock_storage):
+        """Test that log_query never raises on a field it can't serialize."""
+        logger.log_query(
+            conversation_id="conv-123",
+            area="area1",
+            site="site1",
+            query="q",
+            response_text="r",
+            latency_ms=10.0,
+            image_relevance=[{"image_uri": object()}],
+        )
+
+        mock_storage.write_file.assert_not_called()
@@ -25,7 +25,9 @@ import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TextIO
+
+import httpx
 from dotenv import load_dotenv
 
 # Import WhatsApp utility functions
@@ -36,6 +38,12 @@ from whatsapp_utils import (
     send_image_message,
 )
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 load_dotenv()
 
 # Logging directory (same as whatsapp_bot.py)
@@ -47,6 +55,17 @@ def eprint(*args: object) -> None:
     print(*args, file=sys.stderr)
 
 
+def write_json(data: dict, stream: Optional[TextIO] = None) -> None:
+    """Pretty-print JSON (UTF-8, sorted keys) to a text stream (default: stdout), newline-terminated."""
+    if stream is None:
+        stream = sys.stdout  # Looked up per call so redirection keeps working
+    if ORJSON_AVAILABLE:
+        text = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode("utf-8")
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True)
+    stream.write(text + "\n")
+
+
 def log_event(event_type: str, data: dict) -> None:
     """Log event to daily JSONL file (same format as whatsapp_bot.py)."""
     timestamp = datetime.now(timezone.utc).isoformat()
@@ -98,32 +117,38 @@ def main(
     eprint(f"Using phone number ID: {phone_number_id}")
     eprint(f"Sending to: {to_msisdn}")
 
-    if image:
-        # Upload image and send (text becomes caption)
-        eprint(f"Uploading image: {image}")
-        status, resp_json = upload_media(token, phone_number_id, image)
-
-        if 200 <= status < 300 and "id" in resp_json:
-            media_id = resp_json["id"]
-            eprint(f"✓ Upload successful! Media ID: {media_id}")
-
-            caption_msg = f" with caption: {text}" if text else ""
-            eprint(f"Sending image message{caption_msg}...")
-            status, resp_json = send_image_message(
-                token, phone_number_id, to_msisdn, media_id, text
-            )
+    # One pooled client for the whole run: the image upload and send reuse
+    # one keep-alive connection to graph.facebook.com
+    with httpx.Client() as client:
+        if image:
+            # Upload image and send (text becomes caption)
+            eprint(f"Uploading image: {image}")
+            status, resp_json = upload_media(token, phone_number_id, image, client=client)
+
+            if 200 <= status < 300 and "id" in resp_json:
+                media_id = resp_json["id"]
+                eprint(f"✓ Upload successful! Media ID: {media_id}")
+
+                caption_msg = f" with caption: {text}" if text else ""
+                eprint(f"Sending image message{caption_msg}...")
+                status, resp_json = send_image_message(
+                    token, phone_number_id, to_msisdn, media_id, text, client=client
+                )
+            else:
+                eprint(f"✗ Upload failed with status {status}")
+                eprint("Error response:")
+                write_json(resp_json, sys.stderr)
         else:
-            eprint(f"✗ Upload failed with status {status}")
-            eprint(f"Error response: {json.dumps(resp_json, ensure_ascii=False, indent=2)}")
-    else:
-        # Send text message
-        assert text is not None  # For type checker
-        eprint(f"Sending text message...")
-        status, resp_json = send_text_message(token, phone_number_id, to_msisdn, text)
+            # Send text message
+            assert text is not None  # For type checker
+            eprint(f"Sending text message...")
+            status, resp_json = send_text_message(
+                token, phone_number_id, to_msisdn, text, client=client
+            )
 
     # Print results to stdout
     print(status)
-    print(json.dumps(resp_json, ensure_ascii=False, indent=2))
+    write_json(resp_json)
 
     # Print clear success/failure indicator to stderr
     if 200 <= status < 300:
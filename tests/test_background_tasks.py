@@ -0,0 +1,230 @@
+"""
+Tests for BackgroundTaskManager worker pool.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from whatsapp.background_tasks import BackgroundTaskManager
+
+
+def test_execute_async_runs_target_with_correlation_id():
+    """Test that tasks run on the pool and receive correlation_id."""
+    manager = BackgroundTaskManager(max_workers=2)
+    received = {}
+
+    def target(value, correlation_id=None):
+        received["value"] = value
+        received["correlation_id"] = correlation_id
+
+    future = manager.execute_async(target, value=42, correlation_id="corr-1")
+    future.result(timeout=5)
+
+    assert received == {"value": 42, "correlation_id": "corr-1"}
+
+
+def test_workers_are_reused():
+    """Test that tasks share a fixed set of worker threads."""
+    manager = BackgroundTaskManager(max_workers=2)
+    thread_names = set()
+
+    def target():
+        thread_names.add(threading.current_thread().name)
+
+    futures = [manager.execute_async(target) for _ in range(20)]
+    for future in futures:
+        future.result(timeout=5)
+
+    assert len(thread_names) <= 2
+    assert all(name.startswith("wa-bg") for name in thread_names)
+
+
+def test_active_count_and_queue_depth():
+    """Test tracking of running and queued tasks."""
+    manager = BackgroundTaskManager(max_workers=1, max_queue_size=5)
+    release = threading.Event()
+
+    futures = [manager.execute_async(release.wait) for _ in range(3)]
+    time.sleep(0.1)
+
+    assert manager.get_active_count() == 3
+    assert manager.get_queue_depth() == 2
+
+    release.set()
+    for future in futures:
+        future.result(timeout=5)
+    time.sleep(0.05)
+
+    assert manager.get_active_count() == 0
+    assert manager.get_queue_depth() == 0
+
+
+def test_saturated_queue_applies_backpressure():
+    """Test that execute_async blocks when pool and queue are full."""
+    manager = BackgroundTaskManager(max_workers=1, max_queue_size=1)
+    release = threading.Event()
+
+    manager.execute_async(release.wait)
+    manager.execute_async(release.wait)
+
+    submitted = threading.Event()
+
+    def submit_third():
+        manager.execute_async(lambda: None)
+        submitted.set()
+
+    threading.Thread(target=submit_third, daemon=True).start()
+
+    # Third submit must wait for a free slot
+    assert not submitted.wait(timeout=0.2)
+
+    release.set()
+    assert submitted.wait(timeout=5)
+
+
+def test_saturated_queue_overflows_after_timeout():
+    """Test that a saturated submit stops blocking and runs the task on an overflow thread."""
+    logger = MagicMock()
+    manager = BackgroundTaskManager(
+        logger=logger, max_workers=1, max_queue_size=1, saturation_timeout_seconds=0.1
+    )
+    release = threading.Event()
+    manager.execute_async(release.wait)
+    manager.execute_async(release.wait)
+
+    ran = threading.Event()
+    manager.execute_async(ran.set).result(timeout=5)
+
+    assert ran.is_set()
+    events = [c.args[0] for c in logger.log_event.call_args_list]
+    assert "queue_saturated" in events and "queue_overflow" in events
+
+    release.set()
+    assert manager.wait_for_completion(max_wait_seconds=5) == 0
+    # The overflow task held no slot: all pool slots are free again
+    assert all(manager._slots.acquire(blocking=False) for _ in range(2))
+
+
+def test_submit_after_shutdown_releases_slot_and_counts():
+    """Test that a rejected submit leaves no slot or counter behind."""
+    manager = BackgroundTaskManager(max_workers=1, max_queue_size=0)
+    manager.shutdown()
+
+    with pytest.raises(RuntimeError):
+        manager.execute_async(lambda: None)
+
+    assert manager.get_active_count() == 0
+    assert manager.get_queue_depth() == 0
+    assert manager._slots.acquire(blocking=False)
+
+
+def test_wait_for_completion_returns_zero_when_idle():
+    """Test graceful shutdown with no active tasks."""
+    manager = BackgroundTaskManager(max_workers=1)
+    assert manager.wait_for_completion(max_wait_seconds=1) == 0
+
+
+def test_wait_for_completion_reports_remaining_tasks():
+    """Test graceful shutdown timeout with a task still running."""
+    manager = BackgroundTaskManager(max_workers=1)
+    release = threading.Event()
+    manager.execute_async(release.wait)
+
+    remaining = manager.wait_for_completion(max_wait_seconds=0.2)
+    assert remaining == 1
+
+    release.set()
+    assert manager.wait_for_completion(max_wait_seconds=5) == 0
+
+
+def test_shutdown_cancels_queued_tasks():
+    """Test that shutdown drops queued work but lets the running task finish."""
+    manager = BackgroundTaskManager(max_workers=1)
+    release = threading.Event()
+    running = manager.execute_async(release.wait)
+    queued = manager.execute_async(lambda: None)
+
+    manager.shutdown()
+    release.set()
+
+    running.result(timeout=5)
+    assert queued.cancelled()
+    assert manager.get_queue_depth() == 0
+
+
+def test_timeouts_reported_by_shared_monitor():
+    """Test that only tasks running past their deadline are reported, without Timer threads."""
+    logger = MagicMock()
+    manager = BackgroundTaskManager(timeout_seconds=0.1, logger=logger, max_workers=2)
+
+    threads_before = threading.active_count()
+    slow = manager.execute_async(lambda correlation_id=None: time.sleep(0.4), correlation_id="slow")
+    fast = manager.execute_async(lambda correlation_id=None: None, correlation_id="fast")
+    fast.result(timeout=5)
+    slow.result(timeout=5)
+    time.sleep(0.2)  # Let the monitor drain the fast task's stale deadline
+
+    timed_out = [
+        c.args[1]["correlation_id"]
+        for c in logger.log_event.call_args_list
+        if c.args[0] == "background_task_timeout"
+    ]
+    assert timed_out == ["slow"]
+    # Pool workers plus the one monitor; no per-task timer threads
+    assert threading.active_count() <= threads_before + 3
+
+
+def test_task_exception_is_reported(capsys):
+    """Test that an exception raised by a task is logged instead of staying in its Future."""
+    logger = MagicMock()
+    manager = BackgroundTaskManager(logger=logger, max_workers=1)
+
+    def fail(correlation_id=None):
+        raise ValueError("boom")
+
+    future = manager.execute_async(fail, correlation_id="corr-err")
+    assert manager.wait_for_completion(max_wait_seconds=5) == 0
+
+    assert isinstance(future.exception(), ValueError)
+    logger.log_event.assert_any_call("background_task_error", {
+        "correlation_id": "corr-err",
+        "error": "boom",
+        "error_type": "ValueError",
+    }, "corr-err")
+    err = capsys.readouterr().err
+    assert "Background task failed: corr-err" in err
+    assert "ValueError: boom" in err
+
+
+def test_monitor_thread_started_on_first_task():
+    """Test that an idle manager holds no monitor thread."""
+    manager = BackgroundTaskManager(max_workers=1)
+    assert manager._monitor is None
+
+    manager.execute_async(lambda: None).result(timeout=5)
+    assert manager._monitor.is_alive()
+
+
+def test_default_pool_size_larger_under_gevent():
+    """Pool defaults to 2x CPU with OS threads and to GEVENT_POOL_SIZE with greenlets."""
+    from whatsapp import background_tasks
+
+    with patch.object(background_tasks, "threads_are_greenlets", return_value=False), \
+         patch.object(background_tasks.os, "cpu_count", return_value=4):
+        assert background_tasks.default_pool_size() == 8
+
+    with patch.object(background_tasks, "threads_are_greenlets", return_value=True):
+        assert background_tasks.default_pool_size() == background_tasks.GEVENT_POOL_SIZE
+
+
+@pytest.mark.parametrize("cpus, expected", [(None, 4), (1, 4), (2, 4), (4, 8), (8, 16), (64, 16)])
+def test_default_pool_size_clamped(cpus, expected):
+    """OS-thread pool is 2x CPU count, at least MIN_POOL_SIZE and at most MAX_POOL_SIZE."""
+    from whatsapp import background_tasks
+
+    with patch.object(background_tasks, "threads_are_greenlets", return_value=False), \
+         patch.object(background_tasks.os, "cpu_count", return_value=cpus):
+        assert background_tasks.default_pool_size() == expected
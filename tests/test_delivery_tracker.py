@@ -26,11 +26,12 @@ def test_delivery_tracker_register_and_get():
     metadata = tracker.get_and_remove("wamid.123")
 
     assert metadata is not None
-    assert metadata["correlation_id"] == "corr-456"
-    assert metadata["phone"] == "972501234567"
-    assert metadata["conversation_id"] == "whatsapp_972501234567"
-    assert metadata["sent_timestamp_ms"] == 1234567890123.45
-    assert "registered_at" in metadata
+    assert metadata.correlation_id == "corr-456"
+    assert metadata.phone == "972501234567"
+    assert metadata.conversation_id == "whatsapp_972501234567"
+    assert metadata.sent_timestamp_ms == 1234567890123.45
+    assert metadata.registered_at > 0
+    assert metadata.to_dict()["phone"] == "972501234567"
 
     # Should be removed after retrieval
     assert tracker.get_pending_count() == 0
@@ -65,15 +66,15 @@ def test_delivery_tracker_multiple_messages():
 
     # Retrieve in different order
     meta2 = tracker.get_and_remove("wamid.2")
-    assert meta2["correlation_id"] == "corr-2"
+    assert meta2.correlation_id == "corr-2"
     assert tracker.get_pending_count() == 2
 
     meta1 = tracker.get_and_remove("wamid.1")
-    assert meta1["correlation_id"] == "corr-1"
+    assert meta1.correlation_id == "corr-1"
     assert tracker.get_pending_count() == 1
 
     meta3 = tracker.get_and_remove("wamid.3")
-    assert meta3["correlation_id"] == "corr-3"
+    assert meta3.correlation_id == "corr-3"
     assert tracker.get_pending_count() == 0
 
 
@@ -182,6 +183,41 @@ def test_delivery_tracker_overwrite_same_message_id():
 
     # Should have latest data
     meta = tracker.get_and_remove("wamid.123")
-    assert meta["correlation_id"] == "corr-2"
-    assert meta["phone"] == "phone2"
-    assert meta["sent_timestamp_ms"] == 2000.0
+    assert meta.correlation_id == "corr-2"
+    assert meta.phone == "phone2"
+    assert meta.sent_timestamp_ms == 2000.0
+
+
+def test_delivery_tracker_expired_entry_not_reused():
+    """Test that an entry held by a caller is unchanged after it expires."""
+    tracker = DeliveryTracker(ttl_seconds=60)
+    tracker.register_outgoing_message("wamid.old", "corr-old", "phone", "conv", 1000.0)
+    old_entry = tracker.get("wamid.old")
+    old_entry.registered_at -= 120
+
+    assert tracker.cleanup_expired() == 1
+
+    tracker.register_outgoing_message("wamid.new", "corr-new", "phone2", "conv2", 2000.0)
+    assert tracker.get("wamid.new") is not old_entry
+    assert old_entry.correlation_id == "corr-old"
+    assert old_entry.phone == "phone"
+    assert old_entry.sent_timestamp_ms == 1000.0
+
+
+def test_delivery_tracker_janitor_sweeps_expired():
+    """Test that the janitor thread removes expired entries on its own."""
+    tracker = DeliveryTracker(ttl_seconds=60, cleanup_interval=0.05)
+    try:
+        tracker.register_outgoing_message("wamid.old", "corr-old", "phone", "conv", 1000.0)
+        tracker.get("wamid.old").registered_at -= 120
+
+        deadline = time.monotonic() + 5
+        while tracker.get_pending_count() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert tracker.get("wamid.old") is None
+    finally:
+        tracker.stop()
+
+    tracker._janitor_thread.join(timeout=1)
+    assert not tracker._janitor_thread.is_alive()
@@ -106,8 +106,9 @@ def test_timing_context_marks_in_milliseconds():
     ts = ctx.mark("test")
     after = time.time() * 1000
 
-    # Timestamp should be between before and after
-    assert before <= ts <= after
+    # Timestamp should be between before and after (perf_counter offsets from
+    # a per-context wall-clock base drift by microseconds; allow 5 ms)
+    assert before - 5 <= ts <= after + 5
 
     # Should be roughly current time in milliseconds
     # Unix timestamp in milliseconds is 13 digits
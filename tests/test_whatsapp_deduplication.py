@@ -9,6 +9,7 @@ message processing on webhook retries.
 import pytest
 import threading
 import time
+from unittest.mock import patch
 
 # Import refactored deduplication module
 import sys
@@ -17,7 +18,11 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from whatsapp.deduplication import MessageDeduplicator
+from whatsapp.deduplication import (
+    REDIS_SOCKET_TIMEOUT_SECONDS,
+    MessageDeduplicator,
+    RedisMessageDeduplicator,
+)
 
 
 @pytest.fixture
@@ -69,9 +74,10 @@ def test_ttl_expiration(deduplicator):
     assert deduplicator.is_duplicate(msg_id) is False
 
     # Manually set timestamp to 6 minutes ago (past TTL of 5 minutes)
-    deduplicator._cache[msg_id] = time.time() - 360  # 6 minutes ago
+    deduplicator._cache[msg_id] = time.monotonic() - 360  # 6 minutes ago
 
-    # Process a different message to trigger cleanup
+    # Process a different message to trigger cleanup (interval elapsed)
+    deduplicator._last_cleanup -= 60
     new_msg_id = "wamid.trigger_cleanup"
     deduplicator.is_duplicate(new_msg_id)
 
@@ -138,11 +144,12 @@ def test_cache_size_bounded(deduplicator):
     assert deduplicator.get_cache_size() == 100
 
     # Set all entries to expired (7 minutes ago)
-    old_time = time.time() - 420  # 7 minutes ago
+    old_time = time.monotonic() - 420  # 7 minutes ago
     for msg_id in deduplicator._cache:
         deduplicator._cache[msg_id] = old_time
 
-    # Process a new message to trigger cleanup
+    # Process a new message to trigger cleanup (interval elapsed)
+    deduplicator._last_cleanup -= 60
     deduplicator.is_duplicate("wamid.trigger_cleanup_bounded")
 
     # Cache should only have 1 entry now (the new one)
@@ -183,3 +190,192 @@ def test_performance_large_cache(deduplicator):
     elapsed = time.time() - start
 
     assert elapsed < 0.01  # 10ms
+
+
+def test_expired_message_is_new_again(deduplicator):
+    """Test that a message ID seen longer than TTL ago is processed again."""
+    msg_id = "wamid.test_reseen"
+    newer_id = "wamid.test_newer"
+
+    assert deduplicator.is_duplicate(newer_id) is False
+    assert deduplicator.is_duplicate(msg_id) is False
+
+    # Expire only the second entry (the front entry stays live, so no sweep removes it)
+    deduplicator._cache[msg_id] = time.monotonic() - 360
+    deduplicator._hot.clear()  # Also age out the 100 ms hot layer
+
+    assert deduplicator.is_duplicate(msg_id) is False
+    assert deduplicator.is_duplicate(msg_id) is True
+
+
+def test_cleanup_is_rate_limited(deduplicator):
+    """Test that expired entries are swept at most once per cleanup interval."""
+    msg_id = "wamid.test_rate_limited"
+
+    assert deduplicator.is_duplicate(msg_id) is False
+    deduplicator._cache[msg_id] = time.monotonic() - 360
+
+    # Within the interval: no sweep, but the stale entry is not a duplicate
+    deduplicator.is_duplicate("wamid.other")
+    assert msg_id in deduplicator._cache
+    deduplicator._hot.clear()
+    assert deduplicator.is_duplicate(msg_id) is False
+
+
+def test_duplicate_detected_after_sweep():
+    """Test that a live entry survives the periodic sweep."""
+    deduplicator = MessageDeduplicator(ttl_seconds=300)
+    msg_id = "wamid.test_sweep"
+
+    assert deduplicator.is_duplicate(msg_id) is False
+
+    # Force a sweep on the next check
+    deduplicator._last_cleanup -= 60
+
+    assert deduplicator.is_duplicate(msg_id) is True
+    assert deduplicator.is_duplicate(msg_id) is True
+
+
+def test_concurrent_reseen_expired_message(deduplicator):
+    """Test that only one thread treats a re-seen expired ID as new."""
+    msg_id = "wamid.test_concurrent_expired"
+    assert deduplicator.is_duplicate(msg_id) is False
+    deduplicator._cache[msg_id] = time.monotonic() - 360
+    deduplicator._hot.clear()
+
+    results = []
+    barrier = threading.Barrier(10)
+
+    def check():
+        barrier.wait()
+        results.append(deduplicator.is_duplicate(msg_id))
+
+    threads = [threading.Thread(target=check) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results.count(False) == 1
+
+
+def test_clear_forgets_message_ids(deduplicator):
+    """Test that clear() forgets IDs in both the cache and the hot layer."""
+    msg_id = "wamid.test_clear"
+
+    assert deduplicator.is_duplicate(msg_id) is False
+    deduplicator.clear()
+
+    assert deduplicator.get_cache_size() == 0
+    assert deduplicator.is_duplicate(msg_id) is False
+
+
+def test_hot_layer_detects_immediate_duplicate_without_lock(deduplicator):
+    """Test that a repeat within the hot window is answered before the locked cache check."""
+    msg_id = "wamid.test_hot"
+    assert deduplicator.is_duplicate(msg_id) is False
+
+    # Hold the cache lock: the hot layer must answer without blocking on it
+    with deduplicator._lock:
+        assert deduplicator.is_duplicate(msg_id) is True
+
+
+def test_hot_layer_is_bounded(deduplicator):
+    """Test that the hot layer keeps at most 4096 recent IDs."""
+    for i in range(5000):
+        deduplicator.is_duplicate(f"wamid.hot_{i}")
+
+    assert len(deduplicator._hot) == 4096
+    assert "wamid.hot_0" not in deduplicator._hot
+    assert "wamid.hot_4999" in deduplicator._hot
+
+
+def test_hot_layer_concurrent_eviction_is_not_an_error(deduplicator):
+    """Test that a hot entry removed by another thread before move_to_end() is tolerated."""
+    from collections import OrderedDict
+
+    class _RacingOrderedDict(OrderedDict):
+        def move_to_end(self, key, last=True):
+            self.pop(key)  # Another thread evicts it first
+            super().move_to_end(key, last)
+
+    deduplicator._hot = _RacingOrderedDict()
+
+    assert deduplicator.is_duplicate("wamid.race") is False
+    assert deduplicator.is_duplicate("wamid.race") is True  # Caught by the main cache
+
+
+class _FakeRedis:
+    """Minimal stand-in for redis.Redis SET NX EX semantics."""
+
+    def __init__(self):
+        self.store = {}
+        self.calls = []
+
+    def set(self, key, value, nx=False, ex=None):
+        self.calls.append((key, nx, ex))
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+
+def test_redis_dedup_shared_across_processes():
+    """Test that an ID seen by one process is a duplicate in another."""
+    shared = _FakeRedis()
+    worker_a = RedisMessageDeduplicator(shared, ttl_seconds=300)
+    worker_b = RedisMessageDeduplicator(shared, ttl_seconds=300)
+
+    assert worker_a.is_duplicate("wamid.shared") is False
+    assert worker_b.is_duplicate("wamid.shared") is True
+    assert shared.calls[0] == ("wa:dedup:wamid.shared", True, 300)
+
+
+def test_redis_dedup_local_hit_skips_round_trip():
+    """Test that IDs this process already saw are answered without Redis."""
+    shared = _FakeRedis()
+    deduplicator = RedisMessageDeduplicator(shared)
+
+    assert deduplicator.is_duplicate("wamid.local") is False
+    assert deduplicator.is_duplicate("wamid.local") is True
+    assert len(shared.calls) == 1
+
+
+def test_redis_dedup_timeout_fails_open():
+    """Test that a Redis timeout falls back to per-process deduplication."""
+    redis = pytest.importorskip("redis")
+
+    class _TimingOutRedis:
+        def set(self, *args, **kwargs):
+            raise redis.TimeoutError("Timeout reading from socket")
+
+    deduplicator = RedisMessageDeduplicator(_TimingOutRedis())
+
+    assert deduplicator.is_duplicate("wamid.timeout") is False
+    assert deduplicator.is_duplicate("wamid.timeout") is True  # Per-process layer
+
+
+def test_redis_dedup_from_url_sets_socket_timeouts():
+    """Test that the Redis client is created with short socket timeouts."""
+    redis = pytest.importorskip("redis")
+
+    with patch.object(redis.Redis, "from_url") as from_url:
+        RedisMessageDeduplicator.from_url("redis://10.0.0.3:6379/0")
+
+    from_url.assert_called_once_with(
+        "redis://10.0.0.3:6379/0",
+        socket_connect_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+    )
+
+
+def test_cache_is_bounded():
+    """Test that a burst of unique IDs evicts the oldest entries beyond max_entries."""
+    deduplicator = MessageDeduplicator(ttl_seconds=300, max_entries=3)
+
+    for i in range(5):
+        assert deduplicator.is_duplicate(f"wamid.burst_{i}") is False
+
+    assert deduplicator.get_cache_size() == 3
+    assert list(deduplicator._cache) == ["wamid.burst_2", "wamid.burst_3", "wamid.burst_4"]
+    assert deduplicator.is_duplicate("wamid.burst_4") is True
@@ -0,0 +1,40 @@
+"""
+Unit tests for whatsapp_utils Graph API helpers on a pooled httpx client.
+"""
+import httpx
+import pytest
+
+from whatsapp_utils import send_image_message, send_text_message, upload_media_bytes
+
+
+def _client(response):
+    return httpx.Client(transport=httpx.MockTransport(lambda request: response))
+
+
+@pytest.mark.parametrize("send", [
+    lambda client: send_text_message("token", "PHONE_ID", "972501234567", "hi", client=client),
+    lambda client: send_image_message("token", "PHONE_ID", "972501234567", "media-1", client=client),
+    lambda client: upload_media_bytes("token", "PHONE_ID", b"\x89PNG", "image.png", client=client),
+])
+def test_non_json_success_body_returns_error(send):
+    with _client(httpx.Response(200, content=b"<html>gateway</html>")) as client:
+        status, response = send(client)
+
+    assert status == 0
+    assert "JSONDecodeError" in response["error"]["message"]
+
+
+def test_json_success_body_is_decoded():
+    with _client(httpx.Response(200, json={"messages": [{"id": "wamid.1"}]})) as client:
+        status, response = send_text_message("token", "PHONE_ID", "972501234567", "hi", client=client)
+
+    assert status == 200
+    assert response == {"messages": [{"id": "wamid.1"}]}
+
+
+def test_error_status_body_is_decoded():
+    with _client(httpx.Response(400, json={"error": {"message": "bad"}})) as client:
+        status, response = send_text_message("token", "PHONE_ID", "972501234567", "hi", client=client)
+
+    assert status == 400
+    assert response == {"error": {"message": "bad"}}
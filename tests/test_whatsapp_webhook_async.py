@@ -74,6 +74,9 @@ def clear_state():
 
     yield
 
+    # Drain in-flight background tasks so they can't run under the next test's patches
+    from whatsapp import dependencies
+    dependencies.get_task_manager().wait_for_completion(max_wait_seconds=1)
     clear_message_dedup_cache()
     clear_active_threads()
 
@@ -239,8 +242,8 @@ def test_background_processing_completes():
             assert "Test response" in call_args[1]
 
 
-def test_typing_indicator_sent_before_200_ok():
-    """Test that read receipt (with typing indicator) is sent before returning 200 OK."""
+def test_typing_indicator_sent_before_processing():
+    """Test that the worker sends the read receipt (with typing indicator) before processing."""
     call_order = []
 
     # Mock WhatsApp client
@@ -257,16 +260,12 @@ def test_typing_indicator_sent_before_200_ok():
     from whatsapp import dependencies
     dependencies.get_whatsapp_clients.cache_clear()
 
-    # Patch process_message to track when it's called
-    from whatsapp import message_handler
-    original_process = message_handler.process_message
     def track_process(*args, **kwargs):
         call_order.append("process")
-        return original_process(*args, **kwargs)
 
     with patch('whatsapp.dependencies.get_whatsapp_client_for', return_value=mock_whatsapp), \
          patch('whatsapp.app.verify_webhook_signature', return_value=True), \
-         patch('whatsapp.message_handler.process_message', side_effect=track_process):
+         patch('whatsapp.app.process_message', side_effect=track_process):
 
         # Create app with mocked dependencies
         from whatsapp.app import create_app
@@ -283,13 +282,55 @@ def test_typing_indicator_sent_before_200_ok():
                                   content_type='application/json')
             elapsed = time.time() - start
 
-            # Verify order: read receipt with typing indicator before response
-            # Both are sent in single call, process_message is async in thread
-            assert call_order[0] == "read"
-            assert call_order[1] == "typing"  # Verified typing_indicator param was True
             assert response.status_code == 200
             assert elapsed < 1.5
 
+            # Wait for background processing
+            time.sleep(0.5)
+
+            # Read receipt with typing indicator (single call) precedes processing
+            assert call_order == ["read", "typing", "process"]
+
+
+def test_webhook_ack_does_not_wait_for_read_receipts():
+    """Test that slow read receipts for a multi-message webhook don't delay the 200 OK."""
+    mock_whatsapp = MagicMock()
+    def slow_read(*args, **kwargs):
+        time.sleep(0.5)
+        return (200, {"success": True})
+    mock_whatsapp.send_read_receipt.side_effect = slow_read
+
+    from whatsapp import dependencies
+    dependencies.get_whatsapp_clients.cache_clear()
+
+    with patch('whatsapp.dependencies.get_whatsapp_client_for', return_value=mock_whatsapp), \
+         patch('whatsapp.app.verify_webhook_signature', return_value=True), \
+         patch('whatsapp.app.process_message') as mock_process:
+
+        from whatsapp.app import create_app
+        app = create_app()
+        app.config['TESTING'] = True
+
+        payload = create_webhook_payload()
+        value = payload["entry"][0]["changes"][0]["value"]
+        value["messages"] = [
+            dict(value["messages"][0], id=f"wamid.batch_{i}") for i in range(4)
+        ]
+
+        with app.test_client() as client:
+            start = time.time()
+            response = client.post('/webhook',
+                                  data=json.dumps(payload),
+                                  content_type='application/json')
+            elapsed = time.time() - start
+
+            assert response.status_code == 200
+            assert elapsed < 0.5
+
+        dependencies.get_task_manager().wait_for_completion(max_wait_seconds=5)
+        assert mock_whatsapp.send_read_receipt.call_count == 4
+        assert mock_process.call_count == 4
+
 
 @patch('whatsapp_utils.send_read_receipt')
 @patch('whatsapp_bot.call_backend_qa')
@@ -443,6 +484,12 @@ def _make_mock_config(phone_number_map):
     mock_config.graph_api_version = "v22.0"
     mock_config.background_task_timeout_seconds = 180
     mock_config.message_dedup_ttl_seconds = 300
+    mock_config.message_dedup_max_entries = 10000
+    mock_config.conversation_cache_size = 0
+    mock_config.background_task_pool_size = 4
+    mock_config.background_task_queue_size = 100
+    mock_config.redis_url = None
+    mock_config.log_event_types = None
     mock_config.app_secret = None
     mock_config.backend_api_url = "http://localhost:8001"
     mock_config.backend_api_key = "test-key"
@@ -566,3 +613,118 @@ def test_unknown_phone_number_id_falls_back_to_defaults(mock_sig, mock_process):
         kwargs = mock_process.call_args[1]
         assert kwargs.get("area") == "default_area"
         assert kwargs.get("site") == "default_site"
+
+
+# ── Webhook verification (GET) tests ──────────────────────────────────────────
+
+def test_webhook_verification_returns_challenge(client):
+    """Matching verify token returns the challenge."""
+    from whatsapp import dependencies
+    token = dependencies.get_config().verify_token
+
+    resp = client.get('/webhook', query_string={
+        "hub.mode": "subscribe",
+        "hub.verify_token": token,
+        "hub.challenge": "12345",
+    })
+    assert resp.status_code == 200
+    assert resp.get_data(as_text=True) == "12345"
+
+
+@pytest.mark.parametrize("params", [
+    {"hub.mode": "subscribe", "hub.verify_token": "wrong-token", "hub.challenge": "1"},
+    {"hub.mode": "subscribe", "hub.challenge": "1"},
+    {"hub.mode": "unsubscribe", "hub.verify_token": None, "hub.challenge": "1"},
+])
+def test_webhook_verification_rejects_invalid_requests(client, params):
+    """Wrong/missing token or wrong mode is rejected with 403."""
+    from whatsapp import dependencies
+    if "hub.verify_token" in params and params["hub.verify_token"] is None:
+        params = dict(params, **{"hub.verify_token": dependencies.get_config().verify_token})
+
+    resp = client.get('/webhook', query_string=params)
+    assert resp.status_code == 403
+
+
+# ── Fixed webhook responses ───────────────────────────────────────────────────
+
+def test_webhook_ok_response_body(client):
+    """Accepted webhook returns the JSON ok body."""
+    resp = client.post('/webhook', data=json.dumps({"object": "whatsapp_business_account"}),
+                       content_type='application/json')
+    assert resp.status_code == 200
+    assert resp.get_json() == {"status": "ok"}
+
+
+def test_webhook_invalid_signature_response(client):
+    """Invalid signature returns 403 with a JSON error body."""
+    with patch('whatsapp.app.verify_webhook_signature', return_value=False):
+        resp = client.post('/webhook', data=json.dumps(create_webhook_payload()),
+                           content_type='application/json')
+    assert resp.status_code == 403
+    assert resp.get_json() == {"status": "error", "message": "Invalid signature"}
+
+
+def test_webhook_empty_payload_response(client):
+    """Empty JSON payload returns 400 with a JSON error body."""
+    resp = client.post('/webhook', data="{}", content_type='application/json')
+    assert resp.status_code == 400
+    assert resp.get_json() == {"status": "error", "message": "No data"}
+
+
+def test_health_check(client):
+    """Health endpoint returns status and a current UTC timestamp."""
+    from datetime import datetime, timezone
+
+    resp = client.get('/health')
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["status"] == "healthy"
+    ts = datetime.strptime(body["timestamp"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    assert abs((datetime.now(timezone.utc) - ts).total_seconds()) < 5
+
+
+def test_create_app_builds_whatsapp_clients_at_startup(client):
+    """WhatsApp clients (one connection pool each) are built once, before any webhook."""
+    from whatsapp import dependencies
+
+    assert dependencies.get_whatsapp_clients.cache_info().currsize == 1
+
+
+@patch('whatsapp.app.process_message')
+def test_signed_webhook_verified_from_streamed_body(mock_process):
+    """Real HMAC check over the streamed request body accepts valid and rejects tampered payloads."""
+    import hashlib
+    import hmac as hmac_mod
+    from whatsapp.config import PhoneNumberConfig
+    from whatsapp.security import verify_webhook_signature as real_verify
+
+    mock_client = MagicMock()
+    mock_client.send_read_receipt.return_value = (200, {})
+    mock_config = _make_mock_config({"id1": PhoneNumberConfig("id1", "token1", "area1", "site1")})
+    mock_config.app_secret = "test-app-secret"
+
+    _clear_all_dependency_caches()
+    with patch('whatsapp.dependencies.get_config', return_value=mock_config), \
+         patch('whatsapp.dependencies.get_whatsapp_client_for', return_value=mock_client), \
+         patch('whatsapp.app.verify_webhook_signature', side_effect=real_verify):
+        from whatsapp.app import create_app
+        app = create_app()
+        app.config['TESTING'] = True
+
+        body = json.dumps(create_webhook_payload(phone_number_id="id1", msg_id="wamid.signed")).encode()
+        signature = "sha256=" + hmac_mod.new(b"test-app-secret", body, hashlib.sha256).hexdigest()
+
+        with app.test_client() as c:
+            resp = c.post('/webhook', data=body, content_type='application/json',
+                          headers={"X-Hub-Signature-256": signature})
+            assert resp.status_code == 200
+            assert resp.get_json() == {"status": "ok"}
+
+            resp = c.post('/webhook', data=body + b" ", content_type='application/json',
+                          headers={"X-Hub-Signature-256": signature})
+            assert resp.status_code == 403
+
+        from whatsapp import dependencies
+        dependencies.get_task_manager().wait_for_completion(max_wait_seconds=5)
+        assert mock_process.call_count == 1
@@ -0,0 +1,130 @@
+"""
+Unit tests for BackendClient /qa calls and retry policy.
+"""
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from whatsapp.backend_client import BackendClient, BACKEND_MAX_ATTEMPTS, _read_prefix
+
+
+def _make_client(handler):
+    client = BackendClient("https://backend.example", "test-key")
+    client._client = httpx.Client(transport=httpx.MockTransport(handler), headers=client.headers)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    # Replace only backend_client's view of the time module: patching time.sleep
+    # globally would also catch sleeps from unrelated background threads
+    mock_sleep = MagicMock()
+    fake_time = SimpleNamespace(time=time.time, sleep=mock_sleep)
+    with patch("whatsapp.backend_client.time", fake_time):
+        yield mock_sleep
+
+
+def test_success_returns_parsed_response():
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request)
+        return httpx.Response(200, json={"response_text": "שלום"})
+
+    client = _make_client(handler)
+    result = client.call_qa_endpoint("conv", "area", "site", "מה נשמע?")
+
+    assert result == {"response_text": "שלום"}
+    assert len(requests_seen) == 1
+    request = requests_seen[0]
+    assert request.url == "https://backend.example/qa"
+    assert request.headers["Authorization"] == "Bearer test-key"
+    assert request.headers["Content-Type"] == "application/json"
+    assert json.loads(request.content) == {
+        "conversation_id": "conv", "area": "area", "site": "site", "query": "מה נשמע?",
+    }
+
+
+def test_server_error_is_retried(no_sleep):
+    responses = iter([httpx.Response(503), httpx.Response(200, json={"response_text": "ok"})])
+    client = _make_client(lambda request: next(responses))
+
+    result = client.call_qa_endpoint("conv", "area", "site", "q")
+
+    assert result == {"response_text": "ok"}
+    assert no_sleep.call_count == 1
+    assert 1.0 <= no_sleep.call_args[0][0] <= 1.25  # Base delay + jitter
+
+
+def test_client_error_is_not_retried(no_sleep):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(400, text="bad request")
+
+    client = _make_client(handler)
+    result = client.call_qa_endpoint("conv", "area", "site", "q")
+
+    assert "error" in result
+    assert len(calls) == 1
+    assert no_sleep.call_count == 0
+
+
+def test_gives_up_after_max_attempts(no_sleep):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError("connection refused")
+
+    client = _make_client(handler)
+    with pytest.raises(Exception, match="Backend request failed"):
+        client.call_qa_endpoint("conv", "area", "site", "q")
+
+    assert len(calls) == BACKEND_MAX_ATTEMPTS
+    delays = [c[0][0] for c in no_sleep.call_args_list]
+    assert len(delays) == BACKEND_MAX_ATTEMPTS - 1
+    assert 1.0 <= delays[0] <= 1.25
+    assert 2.0 <= delays[1] <= 2.25
+
+
+def test_read_prefix_stops_at_limit():
+    def chunks():
+        for _ in range(10):
+            yield b"x" * 300
+
+    with httpx.Client(transport=httpx.MockTransport(lambda r: httpx.Response(400, content=chunks()))) as http:
+        with http.stream("GET", "https://backend.example/") as response:
+            assert _read_prefix(response, 500) == b"x" * 500
+
+
+def test_malformed_response_fields_are_normalized():
+    body = {"response_text": 42, "images": [{"uri": "https://img", "caption": ["x"]}]}
+    client = _make_client(lambda request: httpx.Response(200, json=body))
+
+    result = client.call_qa_endpoint("conv", "area", "site", "q")
+
+    assert result["response_text"] == "42"
+    assert result["images"] == [{"uri": "https://img", "caption": ""}]
+
+
+def test_non_list_images_are_dropped():
+    body = {"response_text": "ok", "images": {"uri": "https://img"}}
+    client = _make_client(lambda request: httpx.Response(200, json=body))
+
+    assert client.call_qa_endpoint("conv", "area", "site", "q")["images"] == []
+
+
+def test_null_response_text_reads_as_missing():
+    body = {"response_text": None, "images": []}
+    client = _make_client(lambda request: httpx.Response(200, json=body))
+
+    result = client.call_qa_endpoint("conv", "area", "site", "q")
+
+    assert "response_text" not in result
+    assert result.get("response_text", "default") == "default"
@@ -133,3 +133,45 @@ class TestPhoneNumberMapSeeding:
         assert "id2" in config.phone_number_map
         assert config.phone_number_map["id1"].area == "area1"
         assert config.phone_number_map["id2"].site == "site2"
+
+
+class TestProductionDetection:
+    """Test that the production flag is read once by from_env."""
+
+    def test_production_flag_from_k_service(self, monkeypatch):
+        monkeypatch.setenv("K_SERVICE", "whatsapp-bot")
+        monkeypatch.delenv("GAE_ENV", raising=False)
+
+        config = WhatsAppConfig.from_env()
+        assert config.is_production is True
+        assert config.use_local_backend is False
+
+    def test_production_requires_app_secret(self, monkeypatch):
+        monkeypatch.setenv("K_SERVICE", "whatsapp-bot")
+        monkeypatch.delenv("WHATSAPP_APP_SECRET", raising=False)
+        monkeypatch.setenv("PHONE_NUMBER_MAP", "id1:tok1:area1:site1")
+        monkeypatch.setenv("WHATSAPP_VERIFY_TOKEN", "tok")
+        monkeypatch.setenv("BACKEND_API_KEY", "key")
+        monkeypatch.setenv("GCS_BUCKET", "bucket")
+
+        config = WhatsAppConfig.from_env()
+        with pytest.raises(RuntimeError, match="WHATSAPP_APP_SECRET"):
+            config.validate()
+
+    def test_local_when_no_platform_vars(self, monkeypatch):
+        monkeypatch.delenv("K_SERVICE", raising=False)
+        monkeypatch.delenv("GAE_ENV", raising=False)
+
+        assert WhatsAppConfig.from_env().is_production is False
+
+
+class TestLogEventTypes:
+    def test_unset_logs_all_events(self, monkeypatch):
+        monkeypatch.delenv("WHATSAPP_LOG_EVENTS", raising=False)
+        assert WhatsAppConfig.from_env().log_event_types is None
+
+    def test_parses_comma_separated_types(self, monkeypatch):
+        monkeypatch.setenv("WHATSAPP_LOG_EVENTS", " incoming_message, backend_response ,")
+        assert WhatsAppConfig.from_env().log_event_types == frozenset(
+            {"incoming_message", "backend_response"}
+        )
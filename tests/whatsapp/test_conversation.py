@@ -0,0 +1,78 @@
+"""
+Unit tests for ConversationLoader's conversation cache.
+"""
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from whatsapp.conversation import ConversationLoader
+
+
+def _make_store():
+    store = MagicMock()
+    store.get_or_create_conversation.side_effect = lambda conversation_id, **kwargs: (
+        SimpleNamespace(conversation_id=conversation_id, messages=[]),
+        False,
+    )
+    return store
+
+
+def test_cache_disabled_by_default():
+    store = _make_store()
+    loader = ConversationLoader(store)
+
+    loader.load_conversation("972501234567", "area", "site")
+    loader.load_conversation("972501234567", "area", "site")
+
+    assert store.get_or_create_conversation.call_count == 2
+    assert loader.get_cache_stats() == {"size": 0, "hits": 0, "misses": 0, "evictions": 0}
+
+
+def test_cached_conversation_skips_store_read():
+    store = _make_store()
+    loader = ConversationLoader(store, cache_size=2)
+
+    first = loader.load_conversation("972501234567", "area", "site")
+    second = loader.load_conversation("972501234567", "area", "site", profile_name="Dana")
+
+    assert second is first
+    assert store.get_or_create_conversation.call_count == 1
+    store.update_profile_name.assert_called_once_with(first, "Dana")
+    assert loader.get_cache_stats()["hits"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    store = _make_store()
+    loader = ConversationLoader(store, cache_size=2)
+
+    loader.load_conversation("1", "area", "site")
+    loader.load_conversation("2", "area", "site")
+    loader.load_conversation("1", "area", "site")  # 2 is now least recently used
+    loader.load_conversation("3", "area", "site")
+
+    assert list(loader._cache) == ["whatsapp_1", "whatsapp_3"]
+    assert loader.get_cache_stats()["evictions"] == 1
+
+
+def test_cache_entry_expires_after_ttl():
+    store = _make_store()
+    loader = ConversationLoader(store, cache_size=2, cache_ttl_seconds=60)
+
+    with patch("whatsapp.conversation.time.monotonic", return_value=1000.0):
+        loader.load_conversation("1", "area", "site")
+    with patch("whatsapp.conversation.time.monotonic", return_value=1061.0):
+        loader.load_conversation("1", "area", "site")
+
+    assert store.get_or_create_conversation.call_count == 2
+
+
+def test_reset_replaces_cached_conversation():
+    store = _make_store()
+    fresh = SimpleNamespace(conversation_id="whatsapp_1", messages=[])
+    store.create_conversation.return_value = fresh
+    loader = ConversationLoader(store, cache_size=2)
+
+    loader.load_conversation("1", "area", "site")
+    loader.reset_conversation("1", "area", "site")
+
+    assert loader.load_conversation("1", "area", "site") is fresh
+    assert store.get_or_create_conversation.call_count == 1
@@ -0,0 +1,42 @@
+"""
+Unit tests for JSON helpers (orjson with stdlib fallback).
+"""
+import pytest
+
+from whatsapp import json_utils
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param and not json_utils.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(json_utils, "ORJSON_AVAILABLE", request.param)
+    return request.param
+
+
+def test_round_trip_hebrew(backend):
+    obj = {"query": "מה יש לראות באגמון?", "n": 3, "items": [1.5, None, True]}
+    encoded = json_utils.dumps(obj)
+    assert isinstance(encoded, bytes)
+    assert "מה יש".encode("utf-8") in encoded  # Non-ASCII not escaped
+    assert json_utils.loads(encoded) == obj
+
+
+def test_dumps_is_compact(backend):
+    assert json_utils.dumps({"a": [1, 2]}) == b'{"a":[1,2]}'
+
+
+def test_loads_accepts_str_and_bytes(backend):
+    assert json_utils.loads('{"a": 1}') == {"a": 1}
+    assert json_utils.loads(b'{"a": 1}') == {"a": 1}
+
+
+def test_loads_invalid_raises_value_error(backend):
+    with pytest.raises(ValueError):
+        json_utils.loads(b"{not json")
+
+
+def test_dumps_line_is_newline_terminated(backend):
+    line = json_utils.dumps_line({"event": "שלום", "n": 1})
+    assert line.endswith(b"\n") and line.count(b"\n") == 1
+    assert json_utils.loads(line) == {"event": "שלום", "n": 1}
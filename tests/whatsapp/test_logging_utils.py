@@ -0,0 +1,150 @@
+"""
+Unit tests for EventLogger batched JSONL writing.
+"""
+import json
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from whatsapp.logging_utils import EventLogger, eprint
+
+
+def _read_entries(log_dir):
+    entries = []
+    for log_file in sorted(log_dir.glob("*.jsonl")):
+        with open(log_file, encoding="utf-8") as f:
+            entries.extend(json.loads(line) for line in f)
+    return entries
+
+
+def test_log_event_written_after_flush(tmp_path):
+    logger = EventLogger(tmp_path)
+    logger.log_event("incoming_message", {"text": "שלום"}, "cid-1")
+
+    assert logger.flush()
+
+    entries = _read_entries(tmp_path)
+    assert len(entries) == 1
+    assert entries[0]["event_type"] == "incoming_message"
+    assert entries[0]["correlation_id"] == "cid-1"
+    assert entries[0]["data"] == {"text": "שלום"}
+    assert "timestamp" in entries[0]
+
+
+def test_events_written_in_order(tmp_path):
+    logger = EventLogger(tmp_path, batch_size=8)
+    for i in range(50):
+        logger.log_event("event", {"i": i})
+
+    assert logger.flush()
+
+    assert [e["data"]["i"] for e in _read_entries(tmp_path)] == list(range(50))
+
+
+def test_log_event_does_not_block_on_write(tmp_path):
+    logger = EventLogger(tmp_path)
+    written = []
+    original_write = logger._write_batch
+
+    def slow_write(events):
+        time.sleep(0.2)
+        written.extend(events)
+        original_write(events)
+
+    logger._write_batch = slow_write
+
+    start = time.time()
+    logger.log_event("event", {})
+    assert time.time() - start < 0.1
+
+    assert logger.flush()
+    assert len(written) == 1
+
+
+def test_unserializable_event_does_not_drop_batch(tmp_path):
+    logger = EventLogger(tmp_path)
+    logger.log_event("bad", {"obj": object()})
+    logger.log_event("good", {"ok": True})
+
+    assert logger.flush()
+
+    assert [e["event_type"] for e in _read_entries(tmp_path)] == ["good"]
+
+
+def test_log_file_kept_open_between_batches(tmp_path):
+    logger = EventLogger(tmp_path)
+    logger.log_event("first", {})
+    assert logger.flush()
+    fd = logger._fd
+
+    logger.log_event("second", {})
+    assert logger.flush()
+
+    assert logger._fd == fd
+    assert [e["event_type"] for e in _read_entries(tmp_path)] == ["first", "second"]
+
+    logger.close()
+    assert logger._fd is None
+    with pytest.raises(OSError):
+        os.fstat(fd)
+
+
+def test_event_data_snapshotted_at_log_time(tmp_path):
+    logger = EventLogger(tmp_path)
+    data = {"status": "queued"}
+    logger.log_event("event", data)
+    data["status"] = "changed"
+
+    assert logger.flush()
+
+    assert _read_entries(tmp_path)[0]["data"] == {"status": "queued"}
+
+
+def test_eprint_matches_print_format(capsys):
+    eprint("[MONITOR]", 3, None, "שלום")
+    assert capsys.readouterr().err == "[MONITOR] 3 None שלום\n"
+
+
+def test_event_type_filter(tmp_path):
+    logger = EventLogger(tmp_path, event_types=["incoming_message"])
+    logger.log_event("incoming_message", {})
+    logger.log_event("periodic_monitor", {})
+    logger.log_event("error", {"type": "boom"})
+
+    assert logger.flush()
+
+    assert [e["event_type"] for e in _read_entries(tmp_path)] == ["incoming_message", "error"]
+
+
+def test_daily_file_named_after_event_utc_date(tmp_path):
+    logger = EventLogger(tmp_path)
+    logger.log_event("event", {})
+    assert logger.flush()
+
+    [log_file] = tmp_path.glob("*.jsonl")
+    assert log_file.stem == _read_entries(tmp_path)[0]["timestamp"][:10]
+
+
+def test_close_stops_writer_thread(tmp_path):
+    with patch("whatsapp.logging_utils.atexit") as mock_atexit:
+        logger = EventLogger(tmp_path)
+        logger.log_event("queued", {})
+        logger.close()
+
+    assert not logger._writer.is_alive()
+    mock_atexit.unregister.assert_called_once_with(logger.close)
+    assert [e["event_type"] for e in _read_entries(tmp_path)] == ["queued"]
+
+
+def test_event_after_close_written_synchronously(tmp_path):
+    logger = EventLogger(tmp_path)
+    logger.close()
+
+    logger.log_event("late", {})
+
+    assert logger.flush(timeout=0)
+    assert [e["event_type"] for e in _read_entries(tmp_path)] == ["late"]
+    logger.close()
+    assert logger._fd is None
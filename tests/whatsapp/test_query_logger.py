@@ -4,7 +4,7 @@ Unit tests for WhatsApp query logger.
 Tests WhatsAppQueryLogger for logging queries with timing data to GCS.
 """
 
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 import pytest
 
 from whatsapp.query_logger import WhatsAppQueryLogger
@@ -222,6 +222,8 @@ class TestWhatsAppQueryLogger:
         # Verify original timing breakdown was preserved
         assert enhanced_timing["webhook_received"] == 1705318245123.45
         assert enhanced_timing["text_sent"] == 1705318256789.23
+        # Caller's dict is not modified
+        assert "whatsapp_sent" not in timing_breakdown
 
     def test_log_query_with_error(self, query_logger):
         """Test logging query with error message."""
@@ -414,3 +416,91 @@ class TestWhatsAppQueryLogger:
         assert call_args["should_include_images"] is True
         assert len(call_args["timing_breakdown"]) == 12
         assert call_args["error"] is None
+
+
+class TestWhatsAppQueryLoggerBatching:
+    """Test suite for batched (flush_interval) mode."""
+
+    def _log(self, query_logger, i):
+        query_logger.log_query(
+            conversation_id=f"whatsapp_97250000000{i}",
+            area="עמק חפר",
+            site="אגמון חפר",
+            query=f"שאלה {i}",
+            response_text="תשובה",
+            latency_ms=100.0 + i,
+            phone=f"97250000000{i}",
+            message_id=f"wamid.{i}",
+        )
+
+    def test_entries_written_in_one_batch(self):
+        """Queued entries are appended with a single read-modify-write."""
+        import json
+
+        storage = Mock()
+        storage.read_file.side_effect = FileNotFoundError()
+        query_logger = WhatsAppQueryLogger(storage, gcs_prefix="test_logs", flush_interval=0.5)
+
+        for i in range(3):
+            self._log(query_logger, i)
+
+        assert query_logger.flush()
+
+        storage.write_file.assert_called_once()
+        path, content = storage.write_file.call_args[0]
+        assert path.startswith("test_logs/") and path.endswith(".jsonl")
+        entries = [json.loads(line) for line in content.splitlines()]
+        assert [e["query"] for e in entries] == ["שאלה 0", "שאלה 1", "שאלה 2"]
+
+    def test_batch_appends_to_existing_content(self):
+        """Batched write preserves existing log lines."""
+        storage = Mock()
+        storage.read_file.return_value = '{"query": "old"}\n'
+        query_logger = WhatsAppQueryLogger(storage, gcs_prefix="test_logs", flush_interval=0.1)
+
+        self._log(query_logger, 1)
+        assert query_logger.flush()
+
+        content = storage.write_file.call_args[0][1]
+        assert content.startswith('{"query": "old"}\n')
+        assert content.count("\n") == 2
+
+    def test_log_query_does_not_touch_storage(self):
+        """log_query only queues in batched mode (no GCS I/O on the caller's thread)."""
+        storage = Mock()
+        query_logger = WhatsAppQueryLogger(storage, gcs_prefix="test_logs", flush_interval=60)
+
+        self._log(query_logger, 1)
+
+        storage.read_file.assert_not_called()
+        storage.write_file.assert_not_called()
+
+    def test_flush_without_batching_is_noop(self):
+        """flush() returns immediately in synchronous mode."""
+        query_logger = WhatsAppQueryLogger(Mock(), gcs_prefix="test_logs")
+        assert query_logger.flush() is True
+
+    def test_close_writes_queued_entries_and_stops_flusher(self):
+        """close() writes what's queued, joins the flusher and drops the atexit hook."""
+        storage = Mock()
+        storage.read_file.side_effect = FileNotFoundError()
+        with patch("whatsapp.query_logger.atexit") as mock_atexit:
+            query_logger = WhatsAppQueryLogger(storage, gcs_prefix="test_logs", flush_interval=60)
+            self._log(query_logger, 1)
+            query_logger.close()
+
+        storage.write_file.assert_called_once()
+        assert not query_logger._flusher.is_alive()
+        mock_atexit.unregister.assert_called_once_with(query_logger.close)
+
+    def test_log_query_after_close_writes_synchronously(self):
+        """Entries logged after close() are written on the caller's thread."""
+        storage = Mock()
+        storage.read_file.side_effect = FileNotFoundError()
+        query_logger = WhatsAppQueryLogger(storage, gcs_prefix="test_logs", flush_interval=60)
+        query_logger.close()
+
+        self._log(query_logger, 1)
+
+        storage.write_file.assert_called_once()
+        assert query_logger.flush(timeout=0)
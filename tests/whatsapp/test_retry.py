@@ -0,0 +1,74 @@
+"""
+Unit tests for the retry decorator.
+"""
+import pytest
+
+from whatsapp import retry as retry_module
+from whatsapp.retry import PermanentError, retry
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(retry_module.time, "sleep", calls.append)
+    return calls
+
+
+def test_success_does_not_sleep(sleeps):
+    @retry(max_attempts=3)
+    def ok(x, y=1):
+        return x + y
+
+    assert ok(1, y=2) == 3
+    assert sleeps == []
+
+
+def test_retries_with_exponential_backoff(sleeps):
+    attempts = []
+
+    @retry(max_attempts=4, base_delay=1.0, max_delay=3.0)
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 4:
+            raise ConnectionError("down")
+        return "ok"
+
+    assert flaky() == "ok"
+    assert sleeps == [1.0, 2.0, 3.0]
+
+
+def test_raises_last_exception_after_all_attempts(sleeps):
+    messages = []
+
+    @retry(max_attempts=2, base_delay=0.5, logger=messages.append)
+    def broken():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        broken()
+    assert sleeps == [0.5]
+    assert messages[-1].startswith("[RETRY] All 2 attempts failed")
+
+
+def test_unlisted_exception_is_not_retried(sleeps):
+    @retry(max_attempts=3, exceptions=(ConnectionError,))
+    def broken():
+        raise KeyError("k")
+
+    with pytest.raises(KeyError):
+        broken()
+    assert sleeps == []
+
+
+def test_permanent_error_is_not_retried(sleeps):
+    attempts = []
+
+    @retry(max_attempts=3)
+    def rejected():
+        attempts.append(1)
+        raise PermanentError("invalid recipient")
+
+    with pytest.raises(PermanentError):
+        rejected()
+    assert len(attempts) == 1
+    assert sleeps == []
@@ -0,0 +1,100 @@
+"""
+Unit tests for webhook signature verification.
+"""
+import hashlib
+import hmac
+
+import pytest
+
+from whatsapp.security import verify_webhook_signature
+
+
+PAYLOAD = b'{"object":"whatsapp_business_account","entry":[]}'
+
+
+def _sign(secret: str, payload: bytes = PAYLOAD) -> str:
+    return "sha256=" + hmac.new(secret.encode(), payload, hashlib.sha256).hexdigest()
+
+
+def test_valid_signature_accepted():
+    assert verify_webhook_signature(PAYLOAD, _sign("secret"), app_secret="secret")
+
+
+def test_uppercase_hex_signature_accepted():
+    signature = "sha256=" + _sign("secret")[7:].upper()
+    assert verify_webhook_signature(PAYLOAD, signature, app_secret="secret")
+
+
+def test_wrong_secret_rejected():
+    assert not verify_webhook_signature(PAYLOAD, _sign("other"), app_secret="secret")
+
+
+def test_tampered_payload_rejected():
+    signature = _sign("secret")
+    assert not verify_webhook_signature(PAYLOAD + b" ", signature, app_secret="secret")
+
+
+def test_malformed_signature_rejected():
+    assert not verify_webhook_signature(PAYLOAD, "sha256=not-hex", app_secret="secret")
+    assert not verify_webhook_signature(PAYLOAD, "md5=abcd", app_secret="secret")
+    assert not verify_webhook_signature(PAYLOAD, "", app_secret="secret")
+    assert not verify_webhook_signature(PAYLOAD, _sign("secret")[:-2], app_secret="secret")
+    # Bare hex digest, and a same-length header with the wrong prefix
+    assert not verify_webhook_signature(PAYLOAD, _sign("secret")[7:], app_secret="secret")
+    assert not verify_webhook_signature(PAYLOAD, "sha512" + _sign("secret")[6:], app_secret="secret")
+
+
+def test_extra_secret_accepted():
+    signature = _sign("second")
+    assert verify_webhook_signature(
+        PAYLOAD, signature, app_secret="first", extra_secrets=["second"]
+    )
+
+
+def test_chunked_payload_accepted():
+    chunks = [PAYLOAD[:10], PAYLOAD[10:25], PAYLOAD[25:]]
+    assert verify_webhook_signature(iter(chunks), _sign("secret"), app_secret="secret")
+
+
+def test_chunked_payload_with_multiple_secrets():
+    chunks = [PAYLOAD[:7], PAYLOAD[7:]]
+    signature = _sign("second")
+    assert verify_webhook_signature(
+        iter(chunks), signature, app_secret="first", extra_secrets=["second"]
+    )
+    assert not verify_webhook_signature(
+        iter(chunks + [b"x"]), signature, app_secret="first", extra_secrets=["second"]
+    )
+
+
+def test_repeated_verification_reuses_clean_key_state():
+    # The cached keyed template must not accumulate earlier payloads
+    for payload in (PAYLOAD, b"{}", PAYLOAD):
+        assert verify_webhook_signature(payload, _sign("secret", payload), app_secret="secret")
+
+
+def test_env_app_secret_read_once(monkeypatch):
+    from whatsapp import security
+
+    security._env_app_secret.cache_clear()
+    monkeypatch.setenv("WHATSAPP_APP_SECRET", "env-secret")
+    try:
+        assert verify_webhook_signature(PAYLOAD, _sign("env-secret"))
+        monkeypatch.setenv("WHATSAPP_APP_SECRET", "rotated")
+        assert verify_webhook_signature(PAYLOAD, _sign("env-secret"))
+    finally:
+        security._env_app_secret.cache_clear()
+
+
+@pytest.mark.parametrize("production", [False, True])
+def test_missing_secret_warns_once(monkeypatch, capsys, production):
+    from whatsapp import security
+
+    monkeypatch.setattr(security, "is_production_environment", lambda: production)
+    security._warn_missing_secret.cache_clear()
+    try:
+        for _ in range(3):
+            assert verify_webhook_signature(PAYLOAD, "", app_secret="") is not production
+        assert capsys.readouterr().err.count("WHATSAPP_APP_SECRET not set") == 1
+    finally:
+        security._warn_missing_secret.cache_clear()
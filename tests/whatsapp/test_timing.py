@@ -6,8 +6,11 @@ and timing breakdown generation.
 """
 
 import time
+from unittest.mock import MagicMock
 
-from whatsapp.timing import TimingContext
+import pytest
+
+from whatsapp.timing import TimingContext, mark_overhead_ns
 
 
 class TestTimingContext:
@@ -25,6 +28,31 @@ class TestTimingContext:
         assert ctx.correlation_id is None
         assert ctx.checkpoints == {}
 
+    def test_init_with_initial_checkpoints(self):
+        """Test TimingContext initialization with pre-set checkpoints."""
+        ctx = TimingContext("test-123", {"webhook_received": 1000.0})
+        assert ctx.correlation_id == "test-123"
+        assert ctx.get_breakdown() == {"webhook_received": 1000.0}
+
+    def test_contexts_do_not_share_checkpoints(self):
+        """Test that each context gets its own checkpoints dict."""
+        ctx1 = TimingContext()
+        ctx2 = TimingContext()
+        ctx1.mark("only_in_ctx1")
+        assert ctx2.checkpoints == {}
+
+    def test_slots_no_instance_dict(self):
+        """Test that TimingContext uses __slots__ (no per-instance __dict__)."""
+        ctx = TimingContext()
+        assert not hasattr(ctx, "__dict__")
+
+    def test_now_ms_matches_epoch_milliseconds(self):
+        """Test that now_ms() returns epoch time in milliseconds."""
+        before = time.time() * 1000
+        now = TimingContext.now_ms()
+        after = time.time() * 1000
+        assert before <= now <= after
+
     def test_mark_creates_checkpoint(self):
         """Test that mark() creates a checkpoint with timestamp."""
         ctx = TimingContext()
@@ -44,6 +72,16 @@ class TestTimingContext:
         now_ms = time.time() * 1000
         assert abs(timestamp_ms - now_ms) < 1000  # Within 1 second of current time
 
+    def test_mark_ignores_wall_clock_jumps(self, monkeypatch):
+        """Test that marks are offsets from the context's base, not time.time() reads."""
+        ctx = TimingContext()
+        ctx.mark("before")
+        monkeypatch.setattr(time, "time", lambda: 0.0)
+        monkeypatch.setattr(time, "time_ns", lambda: 0)
+        ctx.mark("after")
+
+        assert ctx.get_elapsed("before", "after") >= 0
+
     def test_mark_multiple_checkpoints(self):
         """Test marking multiple checkpoints."""
         ctx = TimingContext()
@@ -256,3 +294,53 @@ class TestTimingContext:
         assert "checkpoint_1" not in ctx2.checkpoints
         assert "checkpoint_2" in ctx2.checkpoints
         assert "checkpoint_2" not in ctx1.checkpoints
+
+    def test_get_elapsed_adjusted_subtracts_mark_overhead(self):
+        """Test that get_elapsed_adjusted() removes calibrated mark() cost."""
+        ctx = TimingContext()
+        ctx.set_checkpoint("start", 1000.0)
+        ctx.set_checkpoint("end", 1010.0)
+
+        overhead_ms = mark_overhead_ns() / 1_000_000
+        assert overhead_ms > 0
+        assert ctx.get_elapsed_adjusted("start", "end", 4) == pytest.approx(10.0 - 4 * overhead_ms)
+        assert ctx.get_elapsed_adjusted("start", "end", 10**12) == 0
+        assert ctx.get_elapsed_adjusted("start", "missing", 1) is None
+
+    def test_deferred_events_flushed_with_recorded_time(self):
+        """Test that defer_event() buffers events until flush_events()."""
+        ctx = TimingContext(correlation_id="req-1")
+        before_s = time.time()
+        ctx.defer_event("outgoing_message", {"message_type": "text"})
+        ctx.defer_event("message_sent", {"status_code": 200})
+        logger = MagicMock()
+
+        ctx.flush_events(logger)
+        ctx.flush_events(logger)  # Buffer is emptied by the first flush
+
+        assert [c.args[0] for c in logger.log_event.call_args_list] == [
+            "outgoing_message", "message_sent",
+        ]
+        first = logger.log_event.call_args_list[0]
+        assert first.args[1:] == ({"message_type": "text"}, "req-1")
+        assert abs(first.kwargs["timestamp"] - before_s) < 1
+
+    def test_get_total_elapsed_tracks_bounds(self):
+        """Test get_total_elapsed() with explicit, out-of-order and overwritten checkpoints."""
+        ctx = TimingContext(checkpoints={"b": 2000.0})
+        ctx.set_checkpoint("a", 1000.0)
+        ctx.set_checkpoint("c", 4000.0)
+        assert ctx.get_total_elapsed() == 3000.0
+
+        # Overwriting the latest checkpoint shrinks the span
+        ctx.set_checkpoint("c", 2500.0)
+        assert ctx.get_total_elapsed() == 1500.0
+
+    def test_get_checkpoint(self):
+        """Test single-checkpoint reads without building the breakdown."""
+        ctx = TimingContext(checkpoints={"webhook_received": 1000.5})
+        ctx.mark("text_sent")
+
+        assert ctx.get_checkpoint("webhook_received") == 1000.5
+        assert ctx.get_checkpoint("text_sent") == ctx.get_breakdown()["text_sent"]
+        assert ctx.get_checkpoint("missing") is None
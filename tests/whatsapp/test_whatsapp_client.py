@@ -0,0 +1,164 @@
+"""
+Unit tests for WhatsAppClient Graph API calls.
+"""
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from whatsapp.retry import PermanentError
+from whatsapp.whatsapp_client import WhatsAppClient, image_suffix
+
+
+def _make_client(handler):
+    client = WhatsAppClient("test-token", "PHONE_ID")
+    client._client = httpx.Client(transport=httpx.MockTransport(handler))
+    return client
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    # Replace only retry's view of the time module: patching time.sleep
+    # globally would also catch sleeps from unrelated background threads
+    mock_sleep = MagicMock()
+    with patch("whatsapp.retry.time", SimpleNamespace(sleep=mock_sleep)):
+        yield mock_sleep
+
+
+def test_send_text_message_posts_payload():
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request)
+        return httpx.Response(200, json={"messages": [{"id": "wamid.1"}]})
+
+    client = _make_client(handler)
+    status, response = client.send_text_message("+972-50-123-4567", "שלום")
+
+    assert status == 200
+    assert response == {"messages": [{"id": "wamid.1"}]}
+    request = requests_seen[0]
+    assert request.url == "https://graph.facebook.com/v22.0/PHONE_ID/messages"
+    assert request.headers["Authorization"] == "Bearer test-token"
+    assert json.loads(request.content) == {
+        "messaging_product": "whatsapp",
+        "to": "972501234567",
+        "type": "text",
+        "text": {"body": "שלום"},
+    }
+    assert "שלום".encode("utf-8") in request.content  # UTF-8, not \u-escaped
+
+
+def test_send_text_message_client_error_is_not_retried(no_sleep):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(400, json={"error": {"message": "bad recipient"}})
+
+    client = _make_client(handler)
+    with pytest.raises(PermanentError, match="HTTP 400: bad recipient"):
+        client.send_text_message("972501234567", "hi")
+
+    assert len(calls) == 1
+    assert no_sleep.call_count == 0
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_send_text_message_transient_error_raises_after_retries(no_sleep, status):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(status, json={"error": {"message": "try later"}})
+
+    client = _make_client(handler)
+    with pytest.raises(Exception, match=f"HTTP {status}: try later") as exc_info:
+        client.send_text_message("972501234567", "hi")
+
+    assert not isinstance(exc_info.value, PermanentError)
+    assert len(calls) == 3
+
+
+def test_send_text_message_non_json_error_body(no_sleep):
+    client = _make_client(lambda request: httpx.Response(502, content=b"Bad Gateway"))
+
+    with pytest.raises(Exception, match="HTTP 502: Bad Gateway"):
+        client.send_text_message("972501234567", "hi")
+
+
+def test_requests_share_pooled_client():
+    hosts = []
+
+    def handler(request):
+        hosts.append(request.url.host)
+        if request.url.host == "storage.example":
+            # Signed download URLs must not receive the Graph API token
+            assert "Authorization" not in request.headers
+            return httpx.Response(200, content=b"image-bytes")
+        return httpx.Response(200, json={})
+
+    client = _make_client(handler)
+    client.send_text_message("972501234567", "hi")
+    image = client.download_image_from_url("https://storage.example/a.jpg", client=client._client)
+    client.send_read_receipt("wamid.1")
+
+    assert image == b"image-bytes"
+    assert hosts == ["graph.facebook.com", "storage.example", "graph.facebook.com"]
+
+
+def test_download_failure_status_raises():
+    client = _make_client(lambda request: httpx.Response(404))
+
+    with pytest.raises(Exception, match="status 404"):
+        client.download_image_from_url("https://storage.example/a.jpg", client=client._client)
+
+
+def test_download_follows_redirects():
+    def handler(request):
+        if request.url.path == "/a.jpg":
+            return httpx.Response(302, headers={"Location": "https://cdn.example/b.jpg"})
+        return httpx.Response(200, content=b"image-bytes")
+
+    client = _make_client(handler)
+
+    image = client.download_image_from_url("https://storage.example/a.jpg", client=client._client)
+
+    assert image == b"image-bytes"
+
+
+@pytest.mark.parametrize("header, suffix", [
+    (b"\xff\xd8\xff\xe0\x00\x10JFIF", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n\x00\x00", ".png"),
+    (b"GIF89a\x01\x00", ".gif"),
+    (b"RIFF\x24\x00\x00\x00WEBPVP8 ", ".webp"),
+    (b"not an image", ".jpg"),
+    (b"", ".jpg"),
+])
+def test_image_suffix(header, suffix):
+    assert image_suffix(header) == suffix
+
+
+def test_send_image_uploads_downloaded_bytes():
+    png = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+    uploads = []
+
+    def handler(request):
+        if request.url.host == "storage.example":
+            return httpx.Response(200, content=png)
+        if request.url.path.endswith("/media"):
+            uploads.append(request.content)
+            return httpx.Response(200, json={"id": "media-1"})
+        assert json.loads(request.content)["image"] == {"id": "media-1", "caption": "cap"}
+        return httpx.Response(200, json={"messages": [{"id": "wamid.2"}]})
+
+    client = _make_client(handler)
+    status, _ = client.send_image("972501234567", "https://storage.example/a", "cap")
+
+    assert status == 200
+    assert len(uploads) == 1
+    assert png in uploads[0]
+    assert b'filename="image.png"' in uploads[0]
+    assert b"Content-Type: image/png" in uploads[0]
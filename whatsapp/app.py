@@ -6,15 +6,128 @@ Provides webhook verification and message handling endpoints.
 
 from __future__ import annotations
 
-import uuid
-from datetime import datetime, timezone
+import hmac
+import operator
+import os
+import random
+import time
+from typing import Iterator, Optional, Tuple
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 
-from . import dependencies
+from . import dependencies, json_utils
 from .message_handler import process_message
 from .security import verify_webhook_signature
 from .timing import TimingContext
+from .whatsapp_client import WhatsAppClient
+
+# Correlation ID generator: 96 random bits are plenty for trace IDs and avoid a
+# urandom syscall + UUID object per call. Re-seeded in forked workers so
+# pre-forked gunicorn processes never share a sequence.
+_rng = random.Random(os.urandom(32))
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: _rng.seed(os.urandom(32)))
+
+
+def _cid() -> str:
+    """
+    Generate a correlation ID (24 hex characters, 96 random bits).
+
+    Returns:
+        Correlation ID string
+    """
+    return _rng.getrandbits(96).to_bytes(12, "big").hex()
+
+
+# Pre-encoded bodies for fixed webhook responses (avoids jsonify per request).
+# A fresh Response is still built per request: Flask/Werkzeug may mutate
+# response headers after the view returns, so instances are not shared.
+_OK_BODY = b'{"status":"ok"}'
+_INVALID_SIGNATURE_BODY = b'{"status":"error","message":"Invalid signature"}'
+_NO_DATA_BODY = b'{"status":"error","message":"No data"}'
+
+
+def _json_response(body: bytes, status: int) -> Response:
+    """
+    Wrap a pre-encoded JSON body in a response.
+
+    Args:
+        body: UTF-8 encoded JSON document
+        status: HTTP status code
+
+    Returns:
+        Flask Response with application/json mimetype
+    """
+    return Response(body, status=status, mimetype="application/json")
+
+
+# /health body, rebuilt at most once per second: (unix_second, encoded body).
+# Replaced atomically as a tuple, so concurrent probes never see a torn pair.
+_health_cache: Tuple[int, bytes] = (0, b"")
+
+
+def _health_body() -> bytes:
+    """
+    Get the encoded /health response body for the current second.
+
+    Returns:
+        JSON body with status and UTC timestamp (second resolution)
+    """
+    global _health_cache
+    now = int(time.time())
+    cached_second, body = _health_cache
+    if now != cached_second:
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+        body = b'{"status":"healthy","timestamp":"%s"}' % timestamp.encode("ascii")
+        _health_cache = (now, body)
+    return body
+
+
+# Status updates that carry delivery timing for tracked messages
+_TRACKED_STATUSES = frozenset(("sent", "delivered", "read"))
+
+# Sender, type and ID of an incoming message in one C-level lookup
+_message_fields = operator.itemgetter("from", "type", "id")
+
+# Request body read size for streamed signature verification
+_BODY_CHUNK_SIZE = 64 * 1024
+
+# Shared read-only default for missing payload objects (never mutated)
+_EMPTY_DICT: dict = {}
+
+
+def _iter_changes(data: dict) -> Iterator[dict]:
+    """
+    Yield the value object of every change in a webhook payload.
+
+    Flattens the entry -> changes -> value nesting into one loop, without
+    allocating empty defaults for missing keys.
+
+    Args:
+        data: Parsed webhook payload
+
+    Yields:
+        Change value dicts (may contain "messages" and/or "statuses")
+    """
+    for entry in data.get("entry") or ():
+        for change in entry.get("changes") or ():
+            yield change.get("value") or _EMPTY_DICT
+
+
+def _read_body(stream, buffer: bytearray) -> Iterator[bytes]:
+    """
+    Read a request body in chunks, collecting it into buffer as it goes.
+
+    Args:
+        stream: Request input stream (e.g. request.stream)
+        buffer: Bytearray that receives the full body
+
+    Yields:
+        Body chunks in order
+    """
+    while chunk := stream.read(_BODY_CHUNK_SIZE):
+        buffer.extend(chunk)
+        yield chunk
 
 
 def create_app() -> Flask:
@@ -42,7 +155,80 @@ def create_app() -> Flask:
     query_logger = dependencies.get_query_logger()
     delivery_tracker = dependencies.get_delivery_tracker()
     error_rate_limiter = dependencies.get_error_rate_limiter()
-    # WhatsApp clients are fetched per-message using get_whatsapp_client_for(phone_number_id)
+    # WhatsApp clients are fetched per-message using get_whatsapp_client_for(phone_number_id).
+    # Build them now: each owns a connection pool, and lru_cache doesn't stop two
+    # concurrent first webhooks from both building (and one leaking) a set
+    dependencies.get_whatsapp_clients()
+
+    # Static per-number app secrets (multi-app setups), collected once
+    per_number_secrets = [
+        pnc.app_secret for pnc in config.phone_number_map.values() if pnc.app_secret
+    ]
+
+    # Encoded once for constant-time comparison in webhook_verification
+    verify_token_b = (config.verify_token or "").encode("utf-8")
+
+    def _handle_text_message(
+        phone: str,
+        text: Optional[str],
+        message_id: str,
+        profile_name: Optional[str],
+        area: str,
+        site: str,
+        whatsapp_client: WhatsAppClient,
+        timing_ctx: TimingContext,
+        correlation_id: str,
+    ) -> None:
+        """
+        Process one incoming text message on a background worker.
+
+        Sends the read receipt (with typing indicator) and then runs the full
+        message pipeline. Runs off the request thread so the webhook returns
+        200 OK without waiting on per-message Graph API calls.
+
+        Args:
+            phone: Sender phone number
+            text: Message text body
+            message_id: WhatsApp message ID
+            profile_name: Sender's WhatsApp profile name (if provided)
+            area: Area for this phone number
+            site: Site for this phone number
+            whatsapp_client: WhatsApp client for the receiving phone number
+            timing_ctx: Per-message timing context
+            correlation_id: Correlation ID for this message
+        """
+        # Send read receipt with typing indicator
+        # Per Meta docs: both are sent in a single API call
+        try:
+            status, resp = whatsapp_client.send_read_receipt(message_id, typing_indicator=True)
+            if status == 200:
+                logger.eprint("[READ+TYPING] Message marked as read with typing indicator")
+            else:
+                logger.eprint(f"[WARNING] Read receipt/typing indicator returned status {status}: {resp}")
+        except Exception as e:
+            # Never block on read receipt or typing indicator failure
+            logger.eprint(f"[WARNING] Failed to send read receipt/typing indicator: {e}")
+
+        # Mark background task started
+        timing_ctx.mark("background_task_started")
+
+        process_message(
+            phone=phone,
+            text=text,
+            message_id=message_id,
+            correlation_id=correlation_id,
+            profile_name=profile_name,
+            area=area,
+            site=site,
+            conversation_loader=conversation_loader,
+            backend_client=backend_client,
+            whatsapp_client=whatsapp_client,
+            logger=logger,
+            query_logger=query_logger,
+            delivery_tracker=delivery_tracker,
+            error_rate_limiter=error_rate_limiter,
+            timing_ctx=timing_ctx
+        )
 
     @app.route("/webhook", methods=["GET"])
     def webhook_verification():
@@ -61,7 +247,11 @@ def create_app() -> Flask:
 
         logger.eprint(f"[VERIFICATION] mode={mode}, token={token}")
 
-        if mode == "subscribe" and token == config.verify_token:
+        if (
+            mode == "subscribe"
+            and token is not None
+            and hmac.compare_digest(token.encode("utf-8"), verify_token_b)
+        ):
             logger.eprint(f"[VERIFICATION] Success! Returning challenge: {challenge}")
             return challenge, 200
         else:
@@ -76,8 +266,8 @@ def create_app() -> Flask:
         Processes webhook payloads from Meta:
         - Verifies signature (HMAC-SHA256)
         - Deduplicates messages (5-minute TTL)
-        - Sends typing indicator
-        - Launches background thread for async processing
+        - Submits each text message to the worker pool (read receipt with
+          typing indicator + processing)
         - Returns 200 OK immediately (async pattern)
 
         Returns:
@@ -85,203 +275,191 @@ def create_app() -> Flask:
         """
         try:
             # Mark webhook received timestamp (will be copied to each message's timing context)
-            webhook_received_ts = TimingContext().mark("webhook_received")
+            webhook_received_ts = TimingContext.now_ms()
 
             # Verify webhook signature (Meta X-Hub-Signature-256)
             # Pass per-number app secrets so multi-app setups work correctly.
+            # The body is hashed chunk-by-chunk as it is read off the stream.
             signature = request.headers.get("X-Hub-Signature-256", "")
-            payload = request.get_data()
-            per_number_secrets = [
-                pnc.app_secret for pnc in config.phone_number_map.values() if pnc.app_secret
-            ]
-
-            if not verify_webhook_signature(payload, signature, app_secret=config.app_secret, extra_secrets=per_number_secrets):
+            body = bytearray()
+            body_chunks = _read_body(request.stream, body)
+            signature_valid = verify_webhook_signature(
+                body_chunks, signature, app_secret=config.app_secret, extra_secrets=per_number_secrets
+            )
+            for _ in body_chunks:
+                pass  # Finish reading if the verifier didn't need the body
+
+            if not signature_valid:
                 logger.eprint("[SECURITY] Invalid webhook signature - rejecting request")
                 logger.log_event("error", {
                     "type": "invalid_webhook_signature",
                     "signature": signature[:20] + "..." if len(signature) > 20 else signature,
                     "ip": request.remote_addr,
                 })
-                return jsonify({"status": "error", "message": "Invalid signature"}), 403
+                return _json_response(_INVALID_SIGNATURE_BODY, 403)
 
-            data = request.get_json()
+            # Parse the already-verified body directly (no second read via request.get_json)
+            data = json_utils.loads(body)
 
             if not data:
-                return jsonify({"status": "error", "message": "No data"}), 400
+                return _json_response(_NO_DATA_BODY, 400)
 
             # Generate correlation ID for this webhook
-            webhook_correlation_id = str(uuid.uuid4())
+            webhook_correlation_id = _cid()
 
             # Log the raw webhook
             logger.log_event("incoming_webhook", data, webhook_correlation_id)
 
+            # Hoist bound methods out of the per-message/per-status loops
+            log_event = logger.log_event
+            is_duplicate = deduplicator.is_duplicate
+            submit = task_manager.execute_async
+            tracker_get = delivery_tracker.get
+
             # Process webhook entries
-            for entry in data.get("entry", []):
-                for change in entry.get("changes", []):
-                    value = change.get("value", {})
-
-                    # Process messages
-                    if "messages" in value:
-                        # Extract phone_number_id from metadata for routing
-                        incoming_phone_number_id = value.get("metadata", {}).get("phone_number_id", "")
-
-                        # Look up area/site from routing map
-                        pnc = config.phone_number_map.get(incoming_phone_number_id)
-                        if pnc:
-                            msg_area = pnc.area
-                            msg_site = pnc.site
+            for value in _iter_changes(data):
+                # Process messages
+                messages = value.get("messages")
+                if messages:
+                    # Extract phone_number_id from metadata for routing
+                    incoming_phone_number_id = (value.get("metadata") or _EMPTY_DICT).get("phone_number_id", "")
+
+                    # Look up area/site from routing map
+                    pnc = config.phone_number_map.get(incoming_phone_number_id)
+                    if pnc:
+                        msg_area = pnc.area
+                        msg_site = pnc.site
+                    else:
+                        logger.eprint(
+                            f"[WARNING] Unknown phone_number_id '{incoming_phone_number_id}', "
+                            f"falling back to defaults"
+                        )
+                        msg_area = config.default_area
+                        msg_site = config.default_site
+
+                    # Select WhatsApp client for this phone number
+                    msg_whatsapp_client = dependencies.get_whatsapp_client_for(incoming_phone_number_id)
+
+                    # Extract contact profile names (keyed by wa_id)
+                    contacts_map = {
+                        wa_id: profile_name
+                        for contact in value.get("contacts", ())
+                        if (wa_id := contact.get("wa_id"))
+                        and (profile_name := (contact.get("profile") or {}).get("name"))
+                    }
+
+                    for message in messages:
+                        try:
+                            msg_from, msg_type, msg_id = _message_fields(message)
+                        except KeyError:
+                            # Malformed message: fall back to per-key lookups (None if missing)
+                            msg_from, msg_type, msg_id = (
+                                message.get("from"), message.get("type"), message.get("id")
+                            )
+                        profile_name = contacts_map.get(msg_from)  # Get name for this sender
+
+                        # Generate unique correlation ID for this message
+                        correlation_id = _cid()
+
+                        # Create new timing context for each message
+                        # Copy webhook_received timestamp from webhook-level timing
+                        msg_timing_ctx = TimingContext(
+                            correlation_id,
+                            {"webhook_received": webhook_received_ts},
+                        )
+
+                        log_event("incoming_message", {
+                            "from": msg_from,
+                            "type": msg_type,
+                            "message_id": msg_id,
+                            "profile_name": profile_name,
+                            "phone_number_id": incoming_phone_number_id,
+                            "area": msg_area,
+                            "site": msg_site,
+                        }, correlation_id)
+
+                        if msg_type == "text":
+                            # Check for duplicate message (webhook retry)
+                            if is_duplicate(msg_id):
+                                logger.eprint(f"[DEDUP] Ignoring duplicate message: {msg_id}")
+                                log_event("message_deduplicated", {
+                                    "message_id": msg_id,
+                                    "from": msg_from,
+                                }, correlation_id)
+                                continue  # Skip duplicate, don't process
+
+                            # Read receipt + processing run on the worker pool, so the
+                            # webhook ack does not wait on one Graph API call per message
+                            submit(
+                                _handle_text_message,
+                                msg_from,
+                                (message.get("text") or _EMPTY_DICT).get("body"),
+                                msg_id,
+                                profile_name=profile_name,
+                                area=msg_area,
+                                site=msg_site,
+                                whatsapp_client=msg_whatsapp_client,
+                                timing_ctx=msg_timing_ctx,
+                                correlation_id=correlation_id,
+                            )
+                            logger.eprint(f"[WEBHOOK] Background task queued for message {msg_id}")
+
                         else:
-                            logger.eprint(
-                                f"[WARNING] Unknown phone_number_id '{incoming_phone_number_id}', "
-                                f"falling back to defaults"
+                            # Unsupported message type
+                            logger.eprint(f"\n📱 Unsupported message type: {msg_type} from {msg_from}")
+                            msg_whatsapp_client.send_text_message(
+                                msg_from,
+                                "מצטער, אני תומך רק בהודעות טקסט כרגע."
                             )
-                            msg_area = config.default_area
-                            msg_site = config.default_site
-
-                        # Select WhatsApp client for this phone number
-                        msg_whatsapp_client = dependencies.get_whatsapp_client_for(incoming_phone_number_id)
-
-                        # Extract contact profile names (keyed by wa_id)
-                        contacts_map = {}
-                        for contact in value.get("contacts", []):
-                            wa_id = contact.get("wa_id")
-                            profile_name = contact.get("profile", {}).get("name")
-                            if wa_id and profile_name:
-                                contacts_map[wa_id] = profile_name
-
-                        for message in value["messages"]:
-                            msg_type = message.get("type")
-                            msg_from = message.get("from")
-                            msg_id = message.get("id")
-                            profile_name = contacts_map.get(msg_from)  # Get name for this sender
-
-                            # Create new timing context for each message
-                            # Copy webhook_received timestamp from webhook-level timing
-                            msg_timing_ctx = TimingContext()
-                            msg_timing_ctx.set_checkpoint("webhook_received", webhook_received_ts)
-
-                            # Generate unique correlation ID for this message
-                            correlation_id = str(uuid.uuid4())
-                            msg_timing_ctx.correlation_id = correlation_id
-
-                            logger.log_event("incoming_message", {
-                                "from": msg_from,
-                                "type": msg_type,
-                                "message_id": msg_id,
-                                "profile_name": profile_name,
-                                "phone_number_id": incoming_phone_number_id,
-                                "area": msg_area,
-                                "site": msg_site,
-                            }, correlation_id)
-
-                            if msg_type == "text":
-                                text_body = message.get("text", {}).get("body")
-
-                                # Check for duplicate message (webhook retry)
-                                if deduplicator.is_duplicate(msg_id):
-                                    logger.eprint(f"[DEDUP] Ignoring duplicate message: {msg_id}")
-                                    logger.log_event("message_deduplicated", {
-                                        "message_id": msg_id,
-                                        "from": msg_from,
-                                    }, correlation_id)
-                                    continue  # Skip duplicate, don't process
-
-                                # Send read receipt with typing indicator immediately
-                                # Per Meta docs: both are sent in a single API call
-                                try:
-                                    status, resp = msg_whatsapp_client.send_read_receipt(msg_id, typing_indicator=True)
-                                    if status == 200:
-                                        logger.eprint("[READ+TYPING] Message marked as read with typing indicator")
-                                    else:
-                                        logger.eprint(f"[WARNING] Read receipt/typing indicator returned status {status}: {resp}")
-                                except Exception as e:
-                                    # Never block on read receipt or typing indicator failure
-                                    logger.eprint(f"[WARNING] Failed to send read receipt/typing indicator: {e}")
-
-                                # Mark background task started
-                                msg_timing_ctx.mark("background_task_started")
-
-                                # Launch background thread to process message
-                                task_manager.execute_async(
-                                    process_message,
-                                    phone=msg_from,
-                                    text=text_body,
-                                    message_id=msg_id,
-                                    correlation_id=correlation_id,
-                                    profile_name=profile_name,
-                                    area=msg_area,
-                                    site=msg_site,
-                                    conversation_loader=conversation_loader,
-                                    backend_client=backend_client,
-                                    whatsapp_client=msg_whatsapp_client,
-                                    logger=logger,
-                                    query_logger=query_logger,
-                                    delivery_tracker=delivery_tracker,
-                                    error_rate_limiter=error_rate_limiter,
-                                    timing_ctx=msg_timing_ctx
-                                )
-                                logger.eprint(f"[WEBHOOK] Background thread started for message {msg_id}")
-
-                            else:
-                                # Unsupported message type
-                                logger.eprint(f"\n📱 Unsupported message type: {msg_type} from {msg_from}")
-                                msg_whatsapp_client.send_text_message(
-                                    msg_from,
-                                    "מצטער, אני תומך רק בהודעות טקסט כרגע."
+
+                # Process status updates (sent, delivered, read, failed)
+                statuses = value.get("statuses")
+                if statuses:
+                    for status in statuses:
+                        msg_id = status.get("id")
+                        status_type = status.get("status")  # sent, delivered, read, failed
+                        timestamp_unix = status.get("timestamp")  # Unix timestamp (seconds)
+
+                        log_event("status_update", {
+                            "message_id": msg_id,
+                            "status": status_type,
+                            "timestamp": timestamp_unix,
+                            "recipient_id": status.get("recipient_id"),
+                        }, webhook_correlation_id)
+
+                        # Check if this message is tracked for delivery timing
+                        # Use get() instead of get_and_remove() to preserve tracking for all status updates
+                        if status_type in _TRACKED_STATUSES and (metadata := tracker_get(msg_id)):
+                            # Convert timestamp to milliseconds
+                            if timestamp_ms := (float(timestamp_unix) * 1000 if timestamp_unix else None):
+                                logger.eprint(
+                                    f"[DELIVERY] Status update for {msg_id}: "
+                                    f"{status_type} at {timestamp_ms}"
                                 )
 
-                    # Process status updates (sent, delivered, read, failed)
-                    if "statuses" in value:
-                        for status in value["statuses"]:
-                            msg_id = status.get("id")
-                            status_type = status.get("status")  # sent, delivered, read, failed
-                            timestamp_unix = status.get("timestamp")  # Unix timestamp (seconds)
-                            recipient_id = status.get("recipient_id")
-
-                            status_info = {
-                                "message_id": msg_id,
-                                "status": status_type,
-                                "timestamp": timestamp_unix,
-                                "recipient_id": recipient_id,
-                            }
-                            logger.log_event("status_update", status_info, webhook_correlation_id)
-
-                            # Check if this message is tracked for delivery timing
-                            # Use get() instead of get_and_remove() to preserve tracking for all status updates
-                            metadata = delivery_tracker.get(msg_id)
-                            if metadata and status_type in ("sent", "delivered", "read"):
-                                # Convert timestamp to milliseconds
-                                timestamp_ms = float(timestamp_unix) * 1000 if timestamp_unix else None
-
-                                if timestamp_ms:
-                                    logger.eprint(
-                                        f"[DELIVERY] Status update for {msg_id}: "
-                                        f"{status_type} at {timestamp_ms}"
-                                    )
-
-                                    # TODO: Update the existing query log entry in GCS with delivery timing
-                                    # This would require reading the log, finding the entry by correlation_id,
-                                    # updating the timing_breakdown, and writing back.
-                                    # For MVP, we just log the event - full implementation can be added later
-                                    logger.log_event("delivery_timing", {
-                                        "message_id": msg_id,
-                                        "correlation_id": metadata["correlation_id"],
-                                        "phone": metadata["phone"],
-                                        "conversation_id": metadata["conversation_id"],
-                                        "sent_timestamp_ms": metadata["sent_timestamp_ms"],
-                                        "status_type": status_type,
-                                        "status_timestamp_ms": timestamp_ms,
-                                        "delivery_latency_ms": timestamp_ms - metadata["sent_timestamp_ms"],
-                                    }, metadata["correlation_id"])
-
-                            # Note: Cleanup of delivery tracker entries happens automatically via TTL (30 minutes)
-                            # or explicit cleanup_expired() calls. We don't remove entries on status updates
-                            # to capture all sequential status changes (sent -> delivered -> read).
-
-            return jsonify({"status": "ok"}), 200
+                                # TODO: Update the existing query log entry in GCS with delivery timing
+                                # This would require reading the log, finding the entry by correlation_id,
+                                # updating the timing_breakdown, and writing back.
+                                # For MVP, we just log the event - full implementation can be added later
+                                log_event("delivery_timing", {
+                                    "message_id": msg_id,
+                                    "correlation_id": metadata.correlation_id,
+                                    "phone": metadata.phone,
+                                    "conversation_id": metadata.conversation_id,
+                                    "sent_timestamp_ms": metadata.sent_timestamp_ms,
+                                    "status_type": status_type,
+                                    "status_timestamp_ms": timestamp_ms,
+                                    "delivery_latency_ms": timestamp_ms - metadata.sent_timestamp_ms,
+                                }, metadata.correlation_id)
+
+                        # Note: Cleanup of delivery tracker entries happens automatically via TTL (30 minutes)
+                        # or explicit cleanup_expired() calls. We don't remove entries on status updates
+                        # to capture all sequential status changes (sent -> delivered -> read).
+
+            return _json_response(_OK_BODY, 200)
 
         except Exception as e:
-            correlation_id = str(uuid.uuid4())
+            correlation_id = _cid()
             logger.eprint(f"[ERROR] {type(e).__name__}: {e}")
             logger.log_event("error", {
                 "type": "webhook_handler_exception",
@@ -298,9 +476,6 @@ def create_app() -> Flask:
         Returns:
             JSON response with status and timestamp
         """
-        return jsonify({
-            "status": "healthy",
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }), 200
+        return _json_response(_health_body(), 200)
 
     return app
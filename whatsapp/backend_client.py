@@ -7,22 +7,43 @@ and location context.
 
 from __future__ import annotations
 
+import random
 import time
 from typing import Dict, Any, Optional
 
-import requests
+import httpx
 
+from . import json_utils
 from .logging_utils import eprint, EventLogger
-from .retry import retry
 from .timing import TimingContext
 
+# Fail fast on connect, allow slow LLM responses on read
+BACKEND_CONNECT_TIMEOUT = 5
+BACKEND_READ_TIMEOUT = 60
+
+# Bytes of a 4xx error body echoed to the log
+ERROR_SNIPPET_BYTES = 500
+
+# Retry policy for /qa: 3 attempts, exponential backoff 1s -> 2s (capped at 4s) + jitter
+BACKEND_MAX_ATTEMPTS = 3
+BACKEND_BASE_DELAY = 1.0
+BACKEND_MAX_DELAY = 4.0
+BACKEND_RETRY_JITTER = 0.25
+# Backoff before each retry (jitter is added per attempt)
+_BACKEND_RETRY_DELAYS = tuple(
+    min(BACKEND_BASE_DELAY * (1 << attempt), BACKEND_MAX_DELAY)
+    for attempt in range(BACKEND_MAX_ATTEMPTS - 1)
+)
+
 
 class BackendClient:
     """
     Backend API client for Tourism RAG QA endpoint.
 
     Handles communication with the backend FastAPI service running on Cloud Run.
-    Uses exponential backoff retry for transient failures.
+    Uses exponential backoff retry (with jitter) for transient failures. Requests go through
+    a persistent HTTP/2 client, so concurrent background workers multiplex
+    their calls over shared TLS connections instead of opening one each.
     """
 
     def __init__(self, base_url: str, api_key: str, logger: Optional[EventLogger] = None):
@@ -42,7 +63,18 @@ class BackendClient:
         }
         self.logger = logger
 
-    @retry(max_attempts=3, base_delay=1.0, max_delay=4.0, logger=eprint)
+        # Thread-safe client shared by all worker threads (retries are handled in call_qa_endpoint)
+        self._client = httpx.Client(
+            http2=True,
+            headers=self.headers,
+            timeout=httpx.Timeout(BACKEND_READ_TIMEOUT, connect=BACKEND_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+
+    def close(self) -> None:
+        """Close the HTTP client and its pooled connections."""
+        self._client.close()
+
     def call_qa_endpoint(
         self,
         conversation_id: str,
@@ -55,8 +87,9 @@ class BackendClient:
         """
         Call backend /qa endpoint with retry logic.
 
-        Uses exponential backoff retry (3 attempts: 1s, 2s, 4s delays).
-        Retries on 5xx server errors and timeouts.
+        Uses exponential backoff retry (3 attempts: 1s, 2s delays plus up to
+        0.25s random jitter, so concurrent workers don't retry in lockstep).
+        Retries on 5xx server errors, timeouts and transport errors.
 
         Args:
             conversation_id: Unique conversation identifier
@@ -97,28 +130,85 @@ class BackendClient:
             "query": query,
         }
 
-        # Log backend request
-        if self.logger:
-            self.logger.log_event("backend_request", {
-                "url": url,
-                "area": area,
-                "site": site,
-                "query_length": len(query),
-            }, correlation_id)
+        body = json_utils.dumps(payload)
+
+        for attempt in range(BACKEND_MAX_ATTEMPTS):
+            # Log backend request
+            if self.logger:
+                self.logger.log_event("backend_request", {
+                    "url": url,
+                    "area": area,
+                    "site": site,
+                    "query_length": len(query),
+                }, correlation_id)
+
+            try:
+                return self._post_qa(url, body, correlation_id, timing_ctx)
+            except Exception as e:
+                if attempt >= BACKEND_MAX_ATTEMPTS - 1:
+                    eprint(
+                        f"[RETRY] All {BACKEND_MAX_ATTEMPTS} attempts failed. "
+                        f"Final error: {type(e).__name__}: {e}"
+                    )
+                    raise
+
+                delay = _BACKEND_RETRY_DELAYS[attempt] + random.uniform(0, BACKEND_RETRY_JITTER)
+                eprint(
+                    f"[RETRY] Attempt {attempt + 1}/{BACKEND_MAX_ATTEMPTS} failed "
+                    f"with {type(e).__name__}: {e}. Retrying in {delay:.2f}s..."
+                )
+                time.sleep(delay)
+
+        # Unreachable: the last attempt either returns or raises
+        raise RuntimeError("Retry logic error: no exception but no result")
+
+    def _post_qa(
+        self,
+        url: str,
+        body: bytes,
+        correlation_id: Optional[str],
+        timing_ctx: Optional[TimingContext],
+    ) -> Dict[str, Any]:
+        """
+        Single /qa request attempt.
+
+        Args:
+            url: Full /qa endpoint URL
+            body: Encoded JSON request body
+            correlation_id: Optional correlation ID for request tracing
+            timing_ctx: Optional timing context for performance measurement
+
+        Returns:
+            Backend response dictionary (or error dict for 4xx responses)
 
+        Raises:
+            Exception: On retryable failures (5xx, timeout, transport error)
+        """
         start_time = time.time()
         if timing_ctx:
             timing_ctx.mark("backend_api_call_start")
 
         try:
-            response = requests.post(url, json=payload, headers=self.headers, timeout=60)
+            # Streamed so only a 200 body is read in full (as raw bytes, no text
+            # decoding); the context manager releases the connection on every path.
+            # Content-Type: application/json is preset on the client headers
+            with self._client.stream("POST", url, content=body) as response:
+                status_code = response.status_code
+                if status_code == 200:
+                    raw = response.read()
+                elif status_code < 500:
+                    raw = _read_prefix(response, ERROR_SNIPPET_BYTES)
+                else:
+                    raw = b""
             latency_ms = (time.time() - start_time) * 1000
             if timing_ctx:
                 timing_ctx.mark("backend_api_call_end")
-            eprint(f"[BACKEND] /qa responded with {response.status_code} in {latency_ms:.1f} ms")
+            eprint(f"[BACKEND] /qa responded with {status_code} in {latency_ms:.1f} ms")
 
-            if response.status_code == 200:
-                result = response.json()
+            if status_code == 200:
+                result = _validate_qa_response(
+                    json_utils.loads(raw), self.logger, correlation_id
+                )
                 # Log successful response
                 if self.logger:
                     self.logger.log_event("backend_response", {
@@ -130,40 +220,40 @@ class BackendClient:
                 return result
             else:
                 # Retry on 5xx server errors
-                if response.status_code >= 500:
-                    eprint(f"[BACKEND] Server error {response.status_code}, will retry")
+                if status_code >= 500:
+                    eprint(f"[BACKEND] Server error {status_code}, will retry")
                     if self.logger:
                         self.logger.log_event("backend_error", {
-                            "status_code": response.status_code,
+                            "status_code": status_code,
                             "error_type": "server_error",
                             "will_retry": True,
                         }, correlation_id)
-                    raise Exception(f"Backend error: {response.status_code}")
+                    raise Exception(f"Backend error: {status_code}")
                 else:
                     # 4xx errors are not retryable (client error)
-                    eprint(f"[BACKEND] Client error {response.status_code}: {response.text[:500]}")
+                    eprint(f"[BACKEND] Client error {status_code}: {raw.decode('utf-8', errors='replace')}")
                     if self.logger:
                         self.logger.log_event("backend_error", {
-                            "status_code": response.status_code,
+                            "status_code": status_code,
                             "error_type": "client_error",
                             "will_retry": False,
                         }, correlation_id)
                     return {
-                        "error": f"Backend error: {response.status_code}",
+                        "error": f"Backend error: {status_code}",
                         "response_text": "מצטער, אירעה שגיאה בשרת. נסה שוב בעוד מספר דקות.",
                     }
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             eprint(f"[BACKEND] Timeout after {time.time() - start_time:.1f}s, will retry")
             if self.logger:
                 self.logger.log_event("backend_error", {
                     "error_type": "timeout",
-                    "timeout_seconds": 60,
+                    "timeout_seconds": BACKEND_READ_TIMEOUT,
                     "will_retry": True,
                 }, correlation_id)
             raise Exception("Backend timeout")
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             eprint(f"[BACKEND] Request exception: {type(e).__name__}: {e}, will retry")
             if self.logger:
                 self.logger.log_event("backend_error", {
@@ -172,3 +262,100 @@ class BackendClient:
                     "will_retry": True,
                 }, correlation_id)
             raise Exception(f"Backend request failed: {e}")
+
+
+def _read_prefix(response: httpx.Response, limit: int) -> bytes:
+    """
+    Read at most about limit bytes of a streamed response body.
+
+    Args:
+        response: Streamed httpx response
+        limit: Maximum bytes to return
+
+    Returns:
+        Body prefix (the rest of the body is never downloaded)
+    """
+    prefix = bytearray()
+    for chunk in response.iter_bytes():
+        prefix.extend(chunk)
+        if len(prefix) >= limit:
+            break
+    return bytes(prefix[:limit])
+
+
+def _validate_qa_response(
+    result: Any,
+    logger: Optional[EventLogger],
+    correlation_id: Optional[str],
+) -> Dict[str, Any]:
+    """
+    Check field types of a decoded /qa response once, at the client boundary.
+
+    Callers can then read response_text, images and the first image's
+    uri/caption without their own isinstance guards. Malformed fields are
+    coerced (response_text to str) or dropped (images, a non-str caption), and
+    each problem is logged as an "error" event. A null response_text is
+    treated as missing.
+
+    Args:
+        result: Decoded JSON body
+        logger: Optional event logger
+        correlation_id: Optional correlation ID for logging
+
+    Returns:
+        Response dictionary with well-typed fields
+    """
+    def report(error_type: str, message: str, **details: Any) -> None:
+        eprint(message)
+        if logger:
+            logger.log_event("error", {"type": error_type, **details}, correlation_id)
+
+    if not isinstance(result, dict):
+        report(
+            "invalid_response_type",
+            f"[ERROR] Backend response is not an object! Type: {type(result)}. Ignoring it.",
+            actual_type=str(type(result)),
+        )
+        return {}
+
+    response_text = result.get("response_text")
+    if response_text is None:
+        # null reads as missing, so callers' .get() defaults apply
+        result.pop("response_text", None)
+    elif not isinstance(response_text, str):
+        report(
+            "invalid_response_text_type",
+            f"[ERROR] response_text is not a string! Type: {type(response_text)}. Converting to string.",
+            actual_type=str(type(response_text)),
+            value=str(response_text)[:200],
+        )
+        result["response_text"] = str(response_text)
+
+    images = result.get("images")
+    if images is None:
+        return result
+    if not isinstance(images, list):
+        report(
+            "invalid_images_type",
+            f"[WARNING] images field is not a list! Type: {type(images)}. Ignoring images.",
+            actual_type=str(type(images)),
+        )
+        result["images"] = []
+    elif images:
+        # Only the first image is ever sent (backend sorts by relevance)
+        first_image = images[0]
+        if not isinstance(first_image, dict):
+            report(
+                "invalid_image_entry_type",
+                f"[WARNING] First image entry is not a dict! Type: {type(first_image)}. Skipping image send.",
+                actual_type=str(type(first_image)),
+            )
+            result["images"] = []
+        elif not isinstance(first_image.get("caption", ""), str):
+            report(
+                "invalid_caption_type",
+                f"[WARNING] Caption field is not a string! Type: {type(first_image['caption'])}. Using empty caption.",
+                actual_type=str(type(first_image["caption"])),
+            )
+            first_image["caption"] = ""
+    return result
@@ -1,26 +1,147 @@
 """
 Background task management with timeout and graceful shutdown.
 
-Provides thread management for async message processing with timeout monitoring
-and graceful shutdown coordination.
+Provides a bounded worker pool for async message processing with timeout monitoring,
+backpressure and graceful shutdown coordination.
 """
 
 from __future__ import annotations
 
+import heapq
+import itertools
+import os
 import threading
 import time
-from typing import Callable, Any, Set, Optional
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Any, Optional
 
 from .logging_utils import eprint, EventLogger
 
+try:
+    from gevent import monkey as gevent_monkey
+    GEVENT_AVAILABLE = True
+except ImportError:
+    GEVENT_AVAILABLE = False
+
+# Pool size when threads are gevent greenlets (gunicorn -k gevent)
+GEVENT_POOL_SIZE = 64
+# Bounds for the CPU-derived OS-thread pool size
+MIN_POOL_SIZE = 4
+MAX_POOL_SIZE = 16
+# How long execute_async() waits for a free slot before the overflow path
+SATURATION_TIMEOUT_SECONDS = 5.0
+
+
+def threads_are_greenlets() -> bool:
+    """
+    Check whether threading has been monkey-patched by gevent.
+
+    True under gunicorn's gevent worker, which patches before importing the app.
+
+    Returns:
+        True if pool "threads" are cooperative greenlets
+    """
+    return GEVENT_AVAILABLE and gevent_monkey.is_module_patched("threading")
+
+
+def default_pool_size() -> int:
+    """
+    Default worker pool size: 2x CPU count clamped to 4-16, or 64 under gevent.
+
+    Message processing is I/O-bound (GCS, backend QA call, WhatsApp API), so the
+    pool is sized above the core count. The floor keeps a 1-vCPU instance from
+    handling only two messages at a time while each waits seconds on the backend;
+    the cap limits GIL handoffs and context switches on large hosts (os.cpu_count()
+    reports host CPUs, not the container's quota). Under gevent, workers are
+    greenlets that yield on every socket wait, so a much larger pool costs little.
+
+    Returns:
+        Number of worker threads
+    """
+    if threads_are_greenlets():
+        return GEVENT_POOL_SIZE
+    return min(MAX_POOL_SIZE, max(MIN_POOL_SIZE, 2 * (os.cpu_count() or 1)))
+
+
+class _Task:
+    """One submitted call: runs the target with start/completion logging."""
+
+    __slots__ = ("manager", "target", "args", "kwargs", "correlation_id", "done")
+
+    def __init__(
+        self,
+        manager: BackgroundTaskManager,
+        target: Callable[..., None],
+        args: tuple,
+        kwargs: dict,
+        correlation_id: Optional[str],
+    ):
+        self.manager = manager
+        self.target = target
+        self.args = args
+        self.kwargs = kwargs
+        self.correlation_id = correlation_id
+        self.done = False
+
+    def run(self) -> None:
+        """Run target on a pool worker with timeout monitoring."""
+        manager = self.manager
+        correlation_id = self.correlation_id
+        logger = manager._logger
+
+        with manager._threads_lock:
+            manager._queued_count -= 1
+
+        # Register deadline with the shared monitor thread
+        with manager._deadline_cv:
+            if manager._monitor is None:
+                manager._monitor = threading.Thread(
+                    target=manager._monitor_deadlines, name="wa-bg-monitor", daemon=True
+                )
+                manager._monitor.start()
+            heapq.heappush(manager._deadlines, (
+                time.monotonic() + manager._timeout_seconds,
+                next(manager._deadline_seq),
+                self,
+            ))
+            manager._deadline_cv.notify()
+
+        try:
+            # Log start
+            if logger:
+                logger.log_event("background_task_started", {
+                    "correlation_id": correlation_id,
+                }, correlation_id)
+
+            # Run the actual target function
+            self.target(*self.args, **self.kwargs)
+
+            # Log completion
+            if logger:
+                logger.log_event("background_task_completed", {
+                    "correlation_id": correlation_id,
+                }, correlation_id)
+
+        finally:
+            # Completed before timeout: the monitor drops the stale entry. The
+            # heap holds this task until its deadline, so release the payload.
+            self.done = True
+            self.target = self.args = self.kwargs = None
+
 
 class BackgroundTaskManager:
     """
     Background task manager with timeout monitoring and graceful shutdown.
 
-    Manages background threads for async message processing:
-    - Tracks active threads
-    - Monitors for timeouts (60 seconds default)
+    Runs async message processing on a fixed-size thread pool:
+    - Reuses worker threads across webhooks (no per-message thread creation)
+    - Bounded queue: when saturated, logs "queue_saturated" and blocks the caller
+      until a slot frees up (backpressure instead of unbounded growth), for at
+      most saturation_timeout_seconds; after that the task runs on a one-off
+      overflow thread and "queue_overflow" is logged, so the webhook ack is
+      never held indefinitely
+    - Monitors for timeouts (60 seconds default) from one shared monitor thread
     - Coordinates graceful shutdown (waits up to 30 seconds)
     - Periodic monitoring (every 10 messages)
     """
@@ -28,21 +149,50 @@ class BackgroundTaskManager:
     def __init__(
         self,
         timeout_seconds: int = 60,
-        logger: Optional[EventLogger] = None
+        logger: Optional[EventLogger] = None,
+        max_workers: Optional[int] = None,
+        max_queue_size: int = 100,
+        saturation_timeout_seconds: float = SATURATION_TIMEOUT_SECONDS,
     ):
         """
         Initialize background task manager.
 
         Args:
-            timeout_seconds: Timeout for background threads in seconds (default: 60)
+            timeout_seconds: Timeout for background tasks in seconds (default: 60)
             logger: Optional event logger for monitoring
+            max_workers: Worker pool size (default: default_pool_size())
+            max_queue_size: Tasks allowed to wait for a free worker before
+                execute_async() blocks (default: 100)
+            saturation_timeout_seconds: Longest execute_async() blocks on a
+                saturated pool before running the task on an overflow thread
+                (default: 5)
         """
-        self._active_threads: Set[threading.Thread] = set()
+        self._max_workers = max_workers or default_pool_size()
+        # A pool rather than an asyncio loop: the whole pipeline is blocking code
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix="wa-bg",
+        )
+        # One slot per running or queued task
+        self._slots = threading.BoundedSemaphore(self._max_workers + max_queue_size)
+        # Plain counters for the hot path; wait_for_completion() sleeps on
+        # _idle, which the last finishing task notifies
+        self._active_count = 0
+        self._queued_count = 0
         self._threads_lock = threading.Lock()
+        self._idle = threading.Condition(self._threads_lock)
         self._timeout_seconds = timeout_seconds
-        self._message_counter = 0
-        self._counter_lock = threading.Lock()
+        self._saturation_timeout = saturation_timeout_seconds
+        self._closed = False  # Set by shutdown(): overflow threads are refused too
+        # itertools.count increments in C without releasing the GIL: no lock needed
+        self._message_counter = itertools.count(1)
         self._logger = logger
+        # Min-heap of (deadline, seq, task) watched by one shared monitor
+        # thread instead of a Timer thread per task
+        self._deadlines: list = []
+        self._deadline_seq = itertools.count()
+        self._deadline_cv = threading.Condition()
+        self._monitor: Optional[threading.Thread] = None  # Started with the first task
 
     def execute_async(
         self,
@@ -50,12 +200,14 @@ class BackgroundTaskManager:
         *args: Any,
         correlation_id: Optional[str] = None,
         **kwargs: Any
-    ) -> threading.Thread:
+    ) -> Future:
         """
-        Execute function in background thread with timeout monitoring.
+        Execute function on the worker pool with timeout monitoring.
 
-        Creates daemon thread that runs target function with timeout wrapper.
-        Thread is automatically tracked and removed when complete.
+        Submits target to the pool wrapped with timeout monitoring. The task is
+        tracked until it completes. If all workers are busy and the queue is full,
+        blocks until a slot frees up, for at most saturation_timeout_seconds;
+        then the task runs on its own overflow thread instead.
 
         Args:
             target: Function to execute in background
@@ -64,122 +216,229 @@ class BackgroundTaskManager:
             **kwargs: Keyword arguments for target function
 
         Returns:
-            Thread object (already started)
+            Future for the submitted task
+
+        Raises:
+            RuntimeError: If the manager has been shut down
 
         Example:
             manager = BackgroundTaskManager()
-            thread = manager.execute_async(
+            future = manager.execute_async(
                 process_message,
                 phone="972501234567",
                 text="שלום",
                 correlation_id="uuid-123"
             )
-            # Thread runs in background, manager monitors for timeout
+            # Task runs on the pool, manager monitors for timeout
         """
-        # Create timeout wrapper
-        thread = None  # Will be set in lambda
+        # Include correlation_id in kwargs if it was provided. **kwargs is a
+        # fresh dict owned by this call, so it's updated in place, not copied.
+        if correlation_id is not None:
+            kwargs["correlation_id"] = correlation_id
+
+        task = _Task(self, target, args, kwargs, correlation_id)
+
+        # Backpressure: wait for a free slot when the pool and queue are full
+        if not self._slots.acquire(blocking=False):
+            queue_depth = self.get_queue_depth()
+            eprint(f"[MONITOR] Task queue saturated ({queue_depth} queued), waiting for a free worker")
+            if self._logger:
+                self._logger.log_event("queue_saturated", {
+                    "queue_depth": queue_depth,
+                    "max_workers": self._max_workers,
+                }, correlation_id)
+            if not self._slots.acquire(timeout=self._saturation_timeout):
+                future = self._run_overflow(task)
+                self._report_progress(correlation_id)
+                return future
+
+        # Count before submitting so the worker's decrement can't run first
+        with self._threads_lock:
+            self._queued_count += 1
+            self._active_count += 1
+
+        try:
+            future = self._executor.submit(task.run)
+        except RuntimeError:
+            # Shut down: undo the bookkeeping for a task that will never run
+            with self._threads_lock:
+                self._queued_count -= 1
+                self._active_count -= 1
+                if not self._active_count:
+                    self._idle.notify_all()
+            self._slots.release()
+            raise
+        future.add_done_callback(
+            lambda done: self._on_task_done(done, correlation_id)
+        )
+        self._report_progress(correlation_id)
+        return future
+
+    def _run_overflow(self, task: _Task) -> Future:
+        """
+        Run a task on a one-off thread when no pool slot freed up in time.
 
-        def timeout_wrapper():
-            """Wrapper that runs target with timeout monitoring."""
-            # Create timeout timer
-            timeout_event = threading.Event()
+        The task holds no slot, so it is counted as active but never releases
+        one. Timeout monitoring and error reporting work as for pooled tasks.
 
-            def timeout_handler():
-                """Called when timeout expires."""
-                eprint(
-                    f"[TIMEOUT] Background task timed out after "
-                    f"{self._timeout_seconds}s: {correlation_id}"
-                )
-                if self._logger:
-                    self._logger.log_event("background_task_timeout", {
-                        "correlation_id": correlation_id,
-                        "timeout_seconds": self._timeout_seconds,
-                    }, correlation_id)
-                timeout_event.set()
-
-            # Start timeout timer
-            timer = threading.Timer(self._timeout_seconds, timeout_handler)
-            timer.daemon = True
-            timer.start()
+        Args:
+            task: Task that could not get a pool slot
+
+        Returns:
+            Future for the task
+        """
+        if self._closed:
+            raise RuntimeError("cannot schedule new tasks after shutdown")
+
+        correlation_id = task.correlation_id
+        eprint(
+            f"[MONITOR] No worker free after {self._saturation_timeout}s, "
+            f"running task on an overflow thread: {correlation_id}"
+        )
+        if self._logger:
+            self._logger.log_event("queue_overflow", {
+                "queue_depth": self.get_queue_depth(),
+                "max_workers": self._max_workers,
+                "waited_seconds": self._saturation_timeout,
+            }, correlation_id)
 
-            try:
-                # Log start
-                if self._logger:
-                    self._logger.log_event("background_task_started", {
-                        "correlation_id": correlation_id,
-                    }, correlation_id)
-
-                # Run the actual target function
-                # Include correlation_id in kwargs if it was provided
-                target_kwargs = kwargs.copy()
-                if correlation_id is not None:
-                    target_kwargs['correlation_id'] = correlation_id
-                target(*args, **target_kwargs)
-
-                # Log completion
-                if self._logger:
-                    self._logger.log_event("background_task_completed", {
-                        "correlation_id": correlation_id,
-                    }, correlation_id)
-
-            finally:
-                # Cancel timeout timer if completed before timeout
-                timer.cancel()
-
-                # Remove from active threads
-                with self._threads_lock:
-                    if thread:
-                        self._active_threads.discard(thread)
-
-        # Create thread
-        thread = threading.Thread(target=timeout_wrapper, daemon=True)
-
-        # Track active thread
         with self._threads_lock:
-            self._active_threads.add(thread)
+            self._queued_count += 1
+            self._active_count += 1
+
+        future: Future = Future()
+        future.add_done_callback(
+            lambda done: self._on_task_done(done, correlation_id, release_slot=False)
+        )
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                task.run()
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(None)
 
-        # Start thread
-        thread.start()
+        threading.Thread(target=run, name="wa-bg-overflow", daemon=True).start()
+        return future
 
+    def _report_progress(self, correlation_id: Optional[str]) -> None:
+        """Count a submitted task; report pool load every 10 messages."""
         # Periodic monitoring (every 10 messages)
-        with self._counter_lock:
-            self._message_counter += 1
-            if self._message_counter % 10 == 0:
-                with self._threads_lock:
-                    active_count = len(self._active_threads)
-                eprint(f"[MONITOR] Processed {self._message_counter} messages, {active_count} active threads")
-                if self._logger:
-                    self._logger.log_event("periodic_monitor", {
-                        "total_messages": self._message_counter,
-                        "active_threads": active_count,
-                    }, correlation_id)
-
-        return thread
+        message_count = next(self._message_counter)
+        if message_count % 10 == 0:
+            active_count = self._active_count
+            queue_depth = self._queued_count
+            eprint(
+                f"[MONITOR] Processed {message_count} messages, "
+                f"{active_count} active tasks, {queue_depth} queued"
+            )
+            if self._logger:
+                self._logger.log_event("periodic_monitor", {
+                    "total_messages": message_count,
+                    "active_threads": active_count,
+                    "queue_depth": queue_depth,
+                }, correlation_id)
+
+    def _monitor_deadlines(self) -> None:
+        """Monitor thread loop: sleep until the earliest deadline, report timeouts."""
+        while True:
+            with self._deadline_cv:
+                while not self._deadlines:
+                    self._deadline_cv.wait()
+                delay = self._deadlines[0][0] - time.monotonic()
+                if delay > 0:
+                    self._deadline_cv.wait(timeout=delay)
+                    continue
+                _, _, task = heapq.heappop(self._deadlines)
+
+            if not task.done:
+                self._on_task_timeout(task.correlation_id)
+
+    def _on_task_timeout(self, correlation_id: Optional[str]) -> None:
+        """Report a task still running past its deadline."""
+        eprint(
+            f"[TIMEOUT] Background task timed out after "
+            f"{self._timeout_seconds}s: {correlation_id}"
+        )
+        if self._logger:
+            self._logger.log_event("background_task_timeout", {
+                "correlation_id": correlation_id,
+                "timeout_seconds": self._timeout_seconds,
+            }, correlation_id)
+
+    def _on_task_error(self, error: BaseException, correlation_id: Optional[str]) -> None:
+        """Report an exception raised by a background task, with its traceback."""
+        eprint(f"[ERROR] Background task failed: {correlation_id}")
+        eprint("".join(traceback.format_exception(error)).rstrip())
+        if self._logger:
+            self._logger.log_event("background_task_error", {
+                "correlation_id": correlation_id,
+                "error": str(error),
+                "error_type": type(error).__name__,
+            }, correlation_id)
+
+    def _on_task_done(
+        self,
+        future: Future,
+        correlation_id: Optional[str] = None,
+        release_slot: bool = True,
+    ) -> None:
+        """Report a task that raised, count it as finished and free its pool slot."""
+        cancelled = future.cancelled()
+        # The pool keeps exceptions in the Future: nothing else reports them
+        if not cancelled and (error := future.exception()) is not None:
+            self._on_task_error(error, correlation_id)
+
+        with self._threads_lock:
+            if cancelled:
+                # Cancelled while queued (shutdown): _Task.run never dequeued it
+                self._queued_count -= 1
+            # Floor at zero: clear_active_threads() may have reset the count
+            if self._active_count:
+                self._active_count -= 1
+            if not self._active_count:
+                self._idle.notify_all()
+        if release_slot:
+            self._slots.release()
 
     def get_active_count(self) -> int:
         """
-        Get count of active background threads.
+        Get count of active (running or queued) background tasks.
+
+        Lock-free read of a single int (never torn on CPython).
+
+        Returns:
+            Number of active tasks
+        """
+        return self._active_count
+
+    def get_queue_depth(self) -> int:
+        """
+        Get count of tasks waiting for a free worker.
 
         Thread-safe operation.
 
         Returns:
-            Number of active threads
+            Number of submitted tasks that have not started yet
         """
         with self._threads_lock:
-            return len(self._active_threads)
+            return self._queued_count
 
     def wait_for_completion(self, max_wait_seconds: int = 30) -> int:
         """
-        Wait for all active threads to complete (graceful shutdown).
+        Wait for all active tasks to complete (graceful shutdown).
 
         Called on SIGTERM/SIGINT signals. Waits up to max_wait_seconds for all
-        active threads to complete, then returns.
+        active tasks to complete, then returns.
 
         Args:
             max_wait_seconds: Maximum time to wait in seconds (default: 30)
 
         Returns:
-            Number of threads still active after wait timeout
+            Number of tasks still active after wait timeout
 
         Example:
             manager = BackgroundTaskManager()
@@ -189,26 +448,17 @@ class BackgroundTaskManager:
             if remaining > 0:
                 print(f"Warning: {remaining} threads still active")
         """
-        with self._threads_lock:
-            active_count = len(self._active_threads)
-            active_threads_snapshot = list(self._active_threads)
-
-        if active_count == 0:
-            eprint("✓ No active threads, exiting immediately")
-            return 0
+        with self._idle:
+            active_count = self._active_count
+            if not active_count:
+                eprint("✓ No active threads, exiting immediately")
+                return 0
 
-        eprint(f"⏳ Waiting for {active_count} active thread(s) to complete (max {max_wait_seconds}s)...")
+            eprint(f"⏳ Waiting for {active_count} active thread(s) to complete (max {max_wait_seconds}s)...")
 
-        # Wait for threads with timeout
-        start_time = time.time()
-        for thread in active_threads_snapshot:
-            remaining_time = max_wait_seconds - (time.time() - start_time)
-            if remaining_time <= 0:
-                break
-            thread.join(timeout=remaining_time)
-
-        with self._threads_lock:
-            remaining = len(self._active_threads)
+            # Single wait, woken as soon as the last task finishes
+            self._idle.wait_for(lambda: not self._active_count, timeout=max_wait_seconds)
+            remaining = self._active_count
 
         if remaining == 0:
             eprint(f"✓ All threads completed, exiting")
@@ -217,12 +467,25 @@ class BackgroundTaskManager:
 
         return remaining
 
+    def shutdown(self) -> None:
+        """
+        Stop the worker pool without waiting.
+
+        Call after wait_for_completion(): tasks still queued are cancelled so
+        they don't start while the process exits. Running tasks are left to
+        finish (or be killed with the process); new submissions raise
+        RuntimeError.
+        """
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
     def clear_active_threads(self) -> None:
         """
-        Clear all active threads from tracking.
+        Clear all active tasks from tracking.
 
         Thread-safe operation. Useful for testing to reset state between test cases.
-        Note: This only clears tracking, does not stop running threads.
+        Note: This only clears tracking, does not stop running tasks.
         """
         with self._threads_lock:
-            self._active_threads.clear()
+            self._active_count = 0
+            self._idle.notify_all()
@@ -9,8 +9,9 @@ from __future__ import annotations
 import os
 import sys
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, FrozenSet, Optional
 
 
 @dataclass
@@ -58,12 +59,23 @@ class WhatsAppConfig:
     # True when PHONE_NUMBER_MAP env var was explicitly set (vs. auto-seeded primary)
     multi_number_mode: bool = False
 
+    # True on Cloud Run / App Engine (K_SERVICE or GAE_ENV set)
+    is_production: bool = False
+
     # Logging
     log_dir: Path = field(default_factory=lambda: Path("whatsapp_logs"))
+    log_event_types: Optional[FrozenSet[str]] = None  # None = log every event type
 
     # Background task configuration
     background_task_timeout_seconds: int = 180
     message_dedup_ttl_seconds: int = 300
+    message_dedup_max_entries: int = 10_000
+    conversation_cache_size: int = 0  # 0 = load every conversation from GCS
+    background_task_pool_size: Optional[int] = None  # None = 2x CPU count, clamped to 4-16
+    background_task_queue_size: int = 100
+
+    # Optional Redis for deduplication shared across processes/instances
+    redis_url: Optional[str] = None
 
     @staticmethod
     def _parse_phone_number_map(raw: str, default_area: str, default_site: str) -> Dict[str, PhoneNumberConfig]:
@@ -128,32 +140,38 @@ class WhatsAppConfig:
         Raises:
             RuntimeError: If required environment variables are missing
         """
+        # Read the environ mapping directly: one dict lookup per variable
+        env = os.environ
+
+        # Detect production environment (Cloud Run sets K_SERVICE, App Engine sets GAE_ENV)
+        is_production = bool(env.get("K_SERVICE") or env.get("GAE_ENV"))
+
         # Auto-detect environment: use local backend in dev, Cloud Run backend in production
-        use_local_backend_str = os.getenv(
+        use_local_backend_str = env.get(
             "USE_LOCAL_BACKEND",
-            "false" if os.getenv("K_SERVICE") else "true"
+            "false" if env.get("K_SERVICE") else "true"
         )
         use_local_backend = use_local_backend_str.lower() in ("true", "1", "yes")
 
-        backend_port = int(os.getenv("BACKEND_PORT", "8001"))
-        backend_api_url = os.getenv(
+        backend_port = int(env.get("BACKEND_PORT", "8001"))
+        backend_api_url = env.get(
             "BACKEND_API_URL",
             f"http://localhost:{backend_port}" if use_local_backend
             else "https://tourism-rag-backend-347968285860.me-west1.run.app"
         )
 
         # Backward compatible PORT handling: Cloud Run uses PORT, local dev may use WHATSAPP_LISTENER_PORT
-        port_env = os.getenv("PORT") or os.getenv("WHATSAPP_LISTENER_PORT")
+        port_env = env.get("PORT") or env.get("WHATSAPP_LISTENER_PORT")
         port = int(port_env) if port_env else 8080
 
         default_area = "עמק חפר"  # Hefer Valley
         default_site = "אגמון חפר"  # Agamon Hefer
 
-        primary_phone_number_id = os.getenv("WHATSAPP_PHONE_NUMBER_ID", "")
-        primary_access_token = os.getenv("WHATSAPP_ACCESS_TOKEN", "")
+        primary_phone_number_id = env.get("WHATSAPP_PHONE_NUMBER_ID", "")
+        primary_access_token = env.get("WHATSAPP_ACCESS_TOKEN", "")
 
         # Build phone_number_map from PHONE_NUMBER_MAP env var
-        phone_number_map_raw = os.getenv("PHONE_NUMBER_MAP", "")
+        phone_number_map_raw = env.get("PHONE_NUMBER_MAP", "")
         phone_number_map = cls._parse_phone_number_map(phone_number_map_raw, default_area, default_site)
         multi_number_mode = bool(phone_number_map)  # True only if PHONE_NUMBER_MAP had entries
 
@@ -166,25 +184,37 @@ class WhatsAppConfig:
                 site=default_site,
             )
 
+        pool_size_env = env.get("BACKGROUND_TASK_POOL_SIZE")
+        log_event_types = frozenset(
+            t.strip() for t in env.get("WHATSAPP_LOG_EVENTS", "").split(",") if t.strip()
+        )
+
         return cls(
-            verify_token=os.getenv("WHATSAPP_VERIFY_TOKEN", "your-verify-token-here"),
+            verify_token=env.get("WHATSAPP_VERIFY_TOKEN", "your-verify-token-here"),
             access_token=primary_access_token,
             phone_number_id=primary_phone_number_id,
-            app_secret=os.getenv("WHATSAPP_APP_SECRET"),
+            app_secret=env.get("WHATSAPP_APP_SECRET"),
             backend_api_url=backend_api_url,
-            backend_api_key=os.getenv("BACKEND_API_KEY", ""),
-            gcs_bucket=os.getenv("GCS_BUCKET", ""),
-            graph_api_version=os.getenv("META_GRAPH_API_VERSION", "v22.0"),
+            backend_api_key=env.get("BACKEND_API_KEY", ""),
+            gcs_bucket=env.get("GCS_BUCKET", ""),
+            graph_api_version=env.get("META_GRAPH_API_VERSION", "v22.0"),
             port=port,
             use_local_backend=use_local_backend,
+            is_production=is_production,
             backend_port=backend_port,
             default_area=default_area,
             default_site=default_site,
             phone_number_map=phone_number_map,
             multi_number_mode=multi_number_mode,
             log_dir=Path("whatsapp_logs"),
+            log_event_types=log_event_types or None,
             background_task_timeout_seconds=180,  # 3 minutes (handles large image uploads)
             message_dedup_ttl_seconds=300,  # 5 minutes
+            message_dedup_max_entries=int(env.get("MESSAGE_DEDUP_MAX_ENTRIES", "10000")),
+            conversation_cache_size=int(env.get("CONVERSATION_CACHE_SIZE", "0")),
+            background_task_pool_size=int(pool_size_env) if pool_size_env else None,
+            background_task_queue_size=int(env.get("BACKGROUND_TASK_QUEUE_SIZE", "100")),
+            redis_url=env.get("REDIS_URL") or None,
         )
 
     def validate(self) -> None:
@@ -224,8 +254,7 @@ class WhatsAppConfig:
             }
 
         # In production, WHATSAPP_APP_SECRET is also required for webhook signature validation
-        is_production = os.getenv("K_SERVICE") or os.getenv("GAE_ENV")
-        if is_production:
+        if self.is_production:
             required_vars["WHATSAPP_APP_SECRET"] = (
                 "Meta app secret for webhook signature validation (required in production)",
                 self.app_secret or ""
@@ -245,10 +274,13 @@ class WhatsAppConfig:
         self.log_dir.mkdir(exist_ok=True)
 
 
+@lru_cache()
 def is_production_environment() -> bool:
     """
     Detect if running in production environment.
 
+    Read once per process: the platform variables don't change after boot.
+
     Returns:
         True if running on Cloud Run or App Engine, False otherwise
     """
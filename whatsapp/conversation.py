@@ -7,12 +7,20 @@ Area and site are always passed explicitly at call sites for multi-number routin
 
 from __future__ import annotations
 
-from typing import Optional
-
-from backend.conversation_storage.conversations import ConversationStore, Conversation
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
 from .logging_utils import eprint
 
+if TYPE_CHECKING:
+    # Annotations only: the backend package (and google-cloud-storage) is
+    # imported when dependencies builds the store
+    from backend.conversation_storage.conversations import ConversationStore, Conversation
+
 
 class ConversationLoader:
     """
@@ -24,16 +32,39 @@ class ConversationLoader:
 
     Area and site are passed explicitly at each call site, supporting
     multi-number routing where each phone number maps to a different location.
+
+    Optional LRU cache (cache_size > 0): loaded conversations are kept in memory
+    for cache_ttl_seconds after their GCS read, so a user's follow-up messages
+    skip the GCS download. Messages are added to the cached object in place and
+    saved through to GCS by ConversationStore.add_message(), so the cache stays
+    current with this process's writes. Only enable it when one process serves
+    each user: writes from another instance aren't seen until the entry expires.
     """
 
-    def __init__(self, conversation_store: ConversationStore):
+    def __init__(
+        self,
+        conversation_store: ConversationStore,
+        cache_size: int = 0,
+        cache_ttl_seconds: float = 300,
+    ):
         """
         Initialize conversation loader.
 
         Args:
             conversation_store: GCS-backed conversation store
+            cache_size: Maximum cached conversations (default: 0 = no cache)
+            cache_ttl_seconds: Seconds a cached conversation is reused after
+                its GCS read (default: 300)
         """
         self.conversation_store = conversation_store
+        self._cache_size = cache_size
+        self._cache_ttl_seconds = cache_ttl_seconds
+        # {conversation_id: (conversation, monotonic time of GCS read)}, least recently used first
+        self._cache: OrderedDict[str, Tuple[Conversation, float]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
 
     def load_conversation(
         self,
@@ -64,33 +95,34 @@ class ConversationLoader:
         """
         conversation_id = self._generate_conversation_id(phone)
 
+        conv = self._cache_get(conversation_id)
+        if conv is not None:
+            if profile_name:
+                self.conversation_store.update_profile_name(conv, profile_name)
+            eprint(f"[CONV] Loaded cached conversation: {conversation_id} ({len(conv.messages)} messages)")
+            return conv
+
         try:
-            # Try to load existing conversation from GCS
-            conv = self.conversation_store.get_conversation(conversation_id)
-            if conv:
-                # Update profile name if provided (handles name changes)
-                if profile_name:
-                    self.conversation_store.update_profile_name(conv, profile_name)
-
-                # Check if all messages were expired (conversation exists but empty after filtering)
-                if len(conv.messages) == 0:
-                    eprint(f"[CONV] Loaded conversation with all messages expired: {conversation_id}")
-                    eprint(f"[CONV] Starting fresh conversation after expiration")
-                else:
-                    eprint(f"[CONV] Loaded existing conversation: {conversation_id} ({len(conv.messages)} messages)")
+            # Load existing conversation, or create it with one conditional GCS write
+            conv, created = self.conversation_store.get_or_create_conversation(
+                conversation_id, area=area, site=site, profile_name=profile_name
+            )
+            self._cache_put(conversation_id, conv)
+            if created:
+                eprint(f"[CONV] Created new conversation: {conversation_id}")
                 return conv
+
+            # Update profile name if provided (handles name changes)
+            if profile_name:
+                self.conversation_store.update_profile_name(conv, profile_name)
+
+            # Check if all messages were expired (conversation exists but empty after filtering)
+            if len(conv.messages) == 0:
+                eprint(f"[CONV] Loaded conversation with all messages expired: {conversation_id}")
+                eprint(f"[CONV] Starting fresh conversation after expiration")
             else:
-                # Create new conversation
-                eprint(f"[CONV] Creating new conversation: {conversation_id}")
-                conv = self.conversation_store.create_conversation(
-                    area=area,
-                    site=site,
-                    conversation_id=conversation_id,
-                    profile_name=profile_name,
-                )
-                # Save immediately to GCS
-                self.conversation_store.save_conversation(conv)
-                return conv
+                eprint(f"[CONV] Loaded existing conversation: {conversation_id} ({len(conv.messages)} messages)")
+            return conv
         except Exception as e:
             eprint(f"[ERROR] Failed to load/create conversation: {e}")
             # Fail-fast: re-raise exception to trigger error response
@@ -132,18 +164,72 @@ class ConversationLoader:
 
             # Save immediately to GCS
             self.conversation_store.save_conversation(conv)
+            self._cache_put(conversation_id, conv)
 
             eprint(f"[CONV] Conversation reset: {conversation_id}")
             return conv
         except Exception as e:
+            # Don't serve the pre-reset conversation from the cache
+            self._cache_discard(conversation_id)
             eprint(f"[ERROR] Failed to reset conversation: {e}")
             raise
 
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        Get conversation cache statistics.
+
+        Returns:
+            Dict with size, hits, misses and evictions (all 0 when caching is off)
+        """
+        with self._cache_lock:
+            return {
+                "size": len(self._cache),
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "evictions": self._cache_evictions,
+            }
+
+    def _cache_get(self, conversation_id: str) -> Optional[Conversation]:
+        """Return a cached conversation still within its TTL, or None."""
+        if not self._cache_size:
+            return None
+        with self._cache_lock:
+            entry = self._cache.get(conversation_id)
+            if entry is not None:
+                conv, loaded_at = entry
+                if time.monotonic() - loaded_at <= self._cache_ttl_seconds:
+                    self._cache.move_to_end(conversation_id)
+                    self._cache_hits += 1
+                    return conv
+                del self._cache[conversation_id]  # Expired: re-read from GCS
+            self._cache_misses += 1
+            return None
+
+    def _cache_put(self, conversation_id: str, conv: Conversation) -> None:
+        """Cache a conversation just read from (or written to) GCS."""
+        if not self._cache_size:
+            return
+        with self._cache_lock:
+            self._cache[conversation_id] = (conv, time.monotonic())
+            self._cache.move_to_end(conversation_id)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+                self._cache_evictions += 1
+
+    def _cache_discard(self, conversation_id: str) -> None:
+        """Drop a conversation from the cache."""
+        with self._cache_lock:
+            self._cache.pop(conversation_id, None)
+
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _generate_conversation_id(phone: str) -> str:
         """
         Generate conversation ID from phone number.
 
+        Memoized and interned: repeat senders get the same string object
+        instead of a fresh allocation per message.
+
         Args:
             phone: Normalized phone number (digits only)
 
@@ -154,4 +240,4 @@ class ConversationLoader:
             conv_id = ConversationLoader._generate_conversation_id("972501234567")
             # Returns: "whatsapp_972501234567"
         """
-        return f"whatsapp_{phone}"
+        return sys.intern(f"whatsapp_{phone}")
@@ -2,14 +2,33 @@
 Message deduplication cache.
 
 Prevents duplicate processing of messages on webhook retries using thread-safe
-in-memory cache with TTL (5 minutes default).
+in-memory cache with TTL (5 minutes default) and a size bound.
 """
 
 from __future__ import annotations
 
 import threading
 import time
-from typing import Dict
+from collections import OrderedDict
+from typing import Any
+
+from .logging_utils import eprint
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+    _REDIS_ERRORS: tuple = (redis.RedisError,)
+except ImportError:
+    REDIS_AVAILABLE = False
+    _REDIS_ERRORS = ()
+
+
+# Hot layer: IDs seen in the last 100 ms (bounded), checked without the lock
+_HOT_WINDOW_SECONDS = 0.1
+_HOT_MAX_ENTRIES = 4096
+# Redis connect/read timeouts: the check runs inside the webhook request, so an
+# unreachable server must fail open quickly instead of waiting on TCP timeouts
+REDIS_SOCKET_TIMEOUT_SECONDS = 0.25
 
 
 class MessageDeduplicator:
@@ -20,19 +39,39 @@ class MessageDeduplicator:
     from Meta will deliver the same message ID multiple times, so we need to
     deduplicate to avoid processing the same message twice.
 
-    Self-cleaning: Expired entries are automatically removed on each check.
+    Hot path: IDs seen within the last 100 ms (e.g. the same message twice in
+    one webhook batch, or two near-simultaneous webhook retries) are answered
+    from a small lock-free dict before taking the cache lock.
+
+    Fast path: the check-and-set is a single dict.setdefault() call, atomic under
+    the GIL, so the lock is only taken for the periodic sweep and for re-seen IDs
+    whose entry has expired.
+
+    Self-cleaning: The cache is kept in insertion (time) order, so expired entries
+    are popped from the front - no full scan. The sweep runs at most every 30
+    seconds (same gating as DeliveryTracker); lookups check the entry's age, so
+    an expired entry awaiting the sweep is still treated as new.
+
+    Bounded: a burst of unique IDs can't grow the cache past max_entries before
+    the sweep runs. The oldest entries (the first to expire anyway) are evicted.
     """
 
-    def __init__(self, ttl_seconds: int = 300):
+    def __init__(self, ttl_seconds: int = 300, max_entries: int = 10_000):
         """
         Initialize deduplication cache.
 
         Args:
             ttl_seconds: Time-to-live for cache entries in seconds (default: 300 = 5 minutes)
+            max_entries: Maximum cached message IDs; the oldest are evicted
+                beyond it (default: 10,000)
         """
-        self._cache: Dict[str, float] = {}  # {message_id: timestamp}
+        self._cache: OrderedDict[str, float] = OrderedDict()  # {message_id: monotonic time}, oldest first
         self._lock = threading.Lock()
         self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._last_cleanup = time.monotonic()
+        self._cleanup_interval = 30  # Sweep expired entries every 30 seconds
+        self._hot: OrderedDict[str, float] = OrderedDict()  # {message_id: monotonic time}
 
     def is_duplicate(self, message_id: str) -> bool:
         """
@@ -42,7 +81,7 @@ class MessageDeduplicator:
         processed and returns False. If message was recently processed (within TTL),
         returns True.
 
-        Also performs cleanup of expired entries (TTL expiration).
+        Also performs cleanup of expired entries (TTL expiration) every 30 seconds.
 
         Args:
             message_id: WhatsApp message ID from webhook
@@ -57,36 +96,92 @@ class MessageDeduplicator:
                 return
             # Process message...
         """
-        with self._lock:
-            now = time.time()
+        # One monotonic reading for every layer: immune to wall-clock (NTP) jumps
+        now = time.monotonic()
+
+        # Hot layer: single dict ops are atomic under the GIL, no lock needed
+        hot = self._hot
+        seen_at = hot.get(message_id)
+        if seen_at is not None and now - seen_at < _HOT_WINDOW_SECONDS:
+            return True  # Duplicate (seen moments ago)
+        hot[message_id] = now
+        try:
+            hot.move_to_end(message_id)
+        except KeyError:
+            pass  # Evicted or cleared concurrently: the main cache still decides
+        if len(hot) > _HOT_MAX_ENTRIES:
+            try:
+                hot.popitem(last=False)
+            except KeyError:
+                pass  # Emptied concurrently
 
-            # Cleanup expired entries (TTL expiration)
-            self._cleanup_expired(now)
+        # Trigger automatic cleanup periodically (TTL expiration)
+        if now - self._last_cleanup > self._cleanup_interval:
+            with self._lock:
+                if now - self._last_cleanup > self._cleanup_interval:
+                    self._cleanup_expired(now)
+                    self._last_cleanup = now
 
-            # Check if message already processed
-            if message_id in self._cache:
-                return True  # Duplicate
+        # Check-and-set in one step: setdefault is atomic under the GIL, so
+        # concurrent webhooks don't serialize on the lock
+        cache = self._cache
+        prev = cache.setdefault(message_id, now)
+        if prev is now:
+            if len(cache) > self._max_entries:
+                self._evict_oldest()
+            return False  # New message
+        if now - prev <= self._ttl_seconds:
+            return True  # Duplicate
 
-            # Mark as processed
-            self._cache[message_id] = now
+        # Expired entry awaiting the sweep: refresh it under the lock so two
+        # threads re-seeing the same ID can't both treat it as new
+        with self._lock:
+            if cache.get(message_id, prev) is not prev:
+                return True  # Refreshed by another thread
+            cache[message_id] = now
+            cache.move_to_end(message_id)
             return False  # New message
 
     def _cleanup_expired(self, now: float) -> None:
         """
         Remove expired entries from cache.
 
-        Called automatically during each is_duplicate() check.
-        Must be called with lock held.
+        Called automatically from is_duplicate() every cleanup interval.
+        Must be called with lock held. New IDs are appended concurrently
+        without the lock, but only at the back; the front (oldest) entries
+        are only touched under the lock.
 
         Args:
-            now: Current timestamp (from time.time())
+            now: Current timestamp (from time.monotonic())
+        """
+        # Entries are in insertion order: pop from the front until one is live.
+        # OrderedDict pops the head in O(1); a plain dict's next(iter()) has to
+        # skip the deleted slots left at the front until the next resize.
+        cache = self._cache
+        while cache:
+            try:
+                mid, ts = next(iter(cache.items()))
+            except RuntimeError:
+                continue  # Appended to concurrently, retry
+            if now - ts <= self._ttl_seconds:
+                break
+            del cache[mid]
+
+    def _evict_oldest(self) -> None:
+        """
+        Evict the oldest entries until the cache is back within max_entries.
+
+        Entries are in insertion (time) order, so these are the ones closest
+        to expiring. The front is only touched under the lock (see
+        _cleanup_expired()).
         """
-        expired_ids = [
-            mid for mid, ts in self._cache.items()
-            if now - ts > self._ttl_seconds
-        ]
-        for mid in expired_ids:
-            del self._cache[mid]
+        cache = self._cache
+        with self._lock:
+            while len(cache) > self._max_entries:
+                try:
+                    cache.popitem(last=False)
+                except KeyError:
+                    break  # Emptied concurrently (clear())
 
     def get_cache_size(self) -> int:
         """
@@ -108,3 +203,93 @@ class MessageDeduplicator:
         """
         with self._lock:
             self._cache.clear()
+            self._hot.clear()
+
+
+class RedisMessageDeduplicator(MessageDeduplicator):
+    """
+    Message deduplicator shared across processes and instances via Redis.
+
+    The in-memory cache is per process, so a Meta retry routed to another
+    gunicorn worker or Cloud Run instance would be processed again. Here the
+    check-and-set is a single atomic SET NX EX round trip, and Redis expires
+    keys on its own (no Python-side sweep).
+
+    The in-process layers still run first: an ID this process has already
+    seen is answered without a round trip. If Redis is unreachable, the
+    in-process result is used (fail open to per-process deduplication rather
+    than dropping webhooks).
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        ttl_seconds: int = 300,
+        key_prefix: str = "wa:dedup:",
+        max_entries: int = 10_000,
+    ):
+        """
+        Initialize Redis-backed deduplication.
+
+        Args:
+            client: redis.Redis client (or compatible object with set())
+            ttl_seconds: Time-to-live for message IDs in seconds (default: 300 = 5 minutes)
+            key_prefix: Prefix for Redis keys
+            max_entries: Maximum message IDs in the in-process layer
+        """
+        super().__init__(ttl_seconds=ttl_seconds, max_entries=max_entries)
+        self._client = client
+        self._key_prefix = key_prefix
+
+    @classmethod
+    def from_url(
+        cls, url: str, ttl_seconds: int = 300, max_entries: int = 10_000
+    ) -> RedisMessageDeduplicator:
+        """
+        Create a deduplicator connected to the Redis server at url.
+
+        Connects and reads with REDIS_SOCKET_TIMEOUT_SECONDS timeouts, so a
+        server that is down or drops packets falls back to per-process
+        deduplication within a fraction of a second.
+
+        Args:
+            url: Redis URL (e.g. redis://10.0.0.3:6379/0)
+            ttl_seconds: Time-to-live for message IDs in seconds
+            max_entries: Maximum message IDs in the in-process layer
+
+        Returns:
+            RedisMessageDeduplicator instance
+
+        Raises:
+            RuntimeError: If the redis package is not installed
+        """
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("REDIS_URL is set but the redis package is not installed")
+        client = redis.Redis.from_url(
+            url,
+            socket_connect_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+        )
+        return cls(client, ttl_seconds=ttl_seconds, max_entries=max_entries)
+
+    def is_duplicate(self, message_id: str) -> bool:
+        """
+        Check if message ID has been processed recently by any process.
+
+        Args:
+            message_id: WhatsApp message ID from webhook
+
+        Returns:
+            True if message is duplicate (already processed), False if new
+        """
+        if super().is_duplicate(message_id):
+            return True  # Seen by this process
+
+        try:
+            created = self._client.set(
+                self._key_prefix + message_id, b"1", nx=True, ex=self._ttl_seconds
+            )
+        except _REDIS_ERRORS as e:
+            eprint(f"[DEDUP] Redis unavailable, using per-process deduplication: {e}")
+            return False
+        return not created
@@ -8,8 +8,33 @@ from WhatsApp webhooks (sent/delivered/read timestamps).
 from __future__ import annotations
 
 import time
-from typing import Dict, Optional
-from threading import Lock
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+from threading import Event, Lock, Thread
+
+
+@dataclass(slots=True)
+class PendingMessage:
+    """
+    Metadata for an outgoing message awaiting delivery status updates.
+
+    Attributes:
+        correlation_id: Request correlation ID
+        phone: User phone number
+        conversation_id: Conversation ID
+        sent_timestamp_ms: Wall-clock send time (ms since epoch)
+        registered_at: Registration time (time.monotonic(), used for TTL)
+    """
+    correlation_id: str
+    phone: str
+    conversation_id: str
+    sent_timestamp_ms: float
+    registered_at: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the metadata as a plain dict."""
+        return asdict(self)
 
 
 class DeliveryTracker:
@@ -20,21 +45,34 @@ class DeliveryTracker:
     WhatsApp message_id. When status webhooks arrive, looks up the metadata
     to construct complete timing breakdown.
 
-    Thread-safe with automatic expiration (30-minute TTL).
+    Thread-safe with automatic expiration (30-minute TTL). Lookups and removals
+    rely on dict.get/dict.pop being atomic under the GIL; the lock only guards
+    multi-step operations (registration, expiry sweeps). Entries are never
+    modified after registration, so a PendingMessage returned by get() stays
+    consistent even if it expires while the caller reads it.
     """
 
-    def __init__(self, ttl_seconds: int = 1800):
+    def __init__(self, ttl_seconds: int = 1800, cleanup_interval: float = 300):
         """
         Initialize delivery tracker.
 
+        Starts a daemon janitor thread that sweeps expired entries every
+        cleanup_interval seconds, so no webhook request pays for the sweep.
+
         Args:
             ttl_seconds: Time-to-live for pending messages (default: 1800s = 30min)
+            cleanup_interval: Seconds between expiry sweeps (default: 300s = 5min)
         """
         self.ttl_seconds = ttl_seconds
-        self.pending: Dict[str, Dict] = {}  # message_id -> metadata
+        # message_id -> metadata, in registration (time) order
+        self.pending: OrderedDict[str, PendingMessage] = OrderedDict()
         self.lock = Lock()
-        self._last_cleanup = time.time()
-        self._cleanup_interval = 300  # Cleanup every 5 minutes
+        self._cleanup_interval = cleanup_interval
+        self._stop = Event()
+        self._janitor_thread = Thread(
+            target=self._janitor, name="delivery-tracker-janitor", daemon=True
+        )
+        self._janitor_thread.start()
 
     def register_outgoing_message(
         self,
@@ -54,16 +92,14 @@ class DeliveryTracker:
             conversation_id: Conversation ID
             sent_timestamp_ms: Timestamp when message was sent (ms since epoch)
         """
+        now = time.monotonic()
         with self.lock:
-            self.pending[message_id] = {
-                "correlation_id": correlation_id,
-                "phone": phone,
-                "conversation_id": conversation_id,
-                "sent_timestamp_ms": sent_timestamp_ms,
-                "registered_at": time.time(),
-            }
+            self.pending[message_id] = PendingMessage(
+                correlation_id, phone, conversation_id, sent_timestamp_ms, now
+            )
+            self.pending.move_to_end(message_id)  # Keep time order on re-register
 
-    def get(self, message_id: str) -> Optional[Dict]:
+    def get(self, message_id: str) -> Optional[PendingMessage]:
         """
         Get metadata for a message without removing it.
 
@@ -74,69 +110,89 @@ class DeliveryTracker:
             message_id: WhatsApp message ID
 
         Returns:
-            Metadata dict or None if not found
+            PendingMessage or None if not found
         """
-        with self.lock:
-            return self.pending.get(message_id)
+        return self.pending.get(message_id)
 
-    def get_and_remove(self, message_id: str) -> Optional[Dict]:
+    def get_and_remove(self, message_id: str) -> Optional[PendingMessage]:
         """
         Get and remove metadata for a message.
 
         Used when delivery status arrives - retrieves metadata and cleans up.
-        Automatically triggers cleanup of expired entries every 5 minutes.
 
         Args:
             message_id: WhatsApp message ID
 
         Returns:
-            Metadata dict or None if not found
+            PendingMessage or None if not found
         """
-        # Trigger automatic cleanup periodically (similar to MessageDeduplicator pattern)
-        now = time.time()
-        if now - self._last_cleanup > self._cleanup_interval:
-            self._cleanup_expired_internal()
-            self._last_cleanup = now
-
-        with self.lock:
-            return self.pending.pop(message_id, None)
+        # dict.pop is atomic under the GIL - no lock needed on the status-update path
+        return self.pending.pop(message_id, None)
 
     def _cleanup_expired_internal(self) -> int:
         """
         Internal method to remove expired entries (older than TTL).
-        Called automatically by get_and_remove every 5 minutes.
+        Called by the janitor thread every cleanup interval.
 
         Returns:
             Number of entries removed
         """
-        now = time.time()
-        cutoff = now - self.ttl_seconds
-
         with self.lock:
-            expired = [
-                msg_id
-                for msg_id, metadata in self.pending.items()
-                if metadata["registered_at"] < cutoff
-            ]
+            return self._remove_expired(time.monotonic())
+
+    def _remove_expired(self, now: float) -> int:
+        """
+        Remove entries older than TTL.
+
+        Must be called with lock held.
 
-            for msg_id in expired:
-                del self.pending[msg_id]
+        Args:
+            now: Current time (from time.monotonic())
 
-        return len(expired)
+        Returns:
+            Number of entries removed
+        """
+        cutoff = now - self.ttl_seconds
+        pending = self.pending
+        removed = 0
+        # Entries are in registration order: pop from the front until one is live
+        while pending:
+            try:
+                msg_id, entry = next(iter(pending.items()))
+            except (RuntimeError, StopIteration):
+                continue  # get_and_remove() popped concurrently (no lock), retry
+            if entry.registered_at >= cutoff:
+                break
+            if pending.pop(msg_id, None) is entry:
+                removed += 1
+
+        return removed
 
     def cleanup_expired(self) -> int:
         """
         Manually trigger cleanup of expired entries (older than TTL).
 
         This method can be called explicitly, but cleanup also happens automatically
-        every 5 minutes when get_and_remove() is called.
+        every 5 minutes on the janitor thread.
 
         Returns:
             Number of entries removed
         """
-        count = self._cleanup_expired_internal()
-        self._last_cleanup = time.time()
-        return count
+        return self._cleanup_expired_internal()
+
+    def _janitor(self) -> None:
+        """Janitor thread loop: sweep expired entries until stop() is called."""
+        while not self._stop.wait(self._cleanup_interval):
+            self._cleanup_expired_internal()
+
+    def stop(self) -> None:
+        """
+        Stop the janitor thread.
+
+        Called on graceful shutdown. Tracking keeps working, but expired
+        entries are only removed by explicit cleanup_expired() calls.
+        """
+        self._stop.set()
 
     def get_pending_count(self) -> int:
         """
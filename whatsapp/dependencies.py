@@ -2,28 +2,42 @@
 Dependency injection for WhatsApp bot.
 
 Provides singleton instances of services via @lru_cache() pattern (following backend/).
+
+Getters use the unbounded cache (maxsize=None): a zero-argument getter only
+ever holds one entry, and the unbounded wrapper is a plain dict lookup with no
+LRU bookkeeping or lock. create_app() resolves them once at startup and closes
+over the instances, so only per-message lookups such as
+get_whatsapp_client_for() hit the cache at request time. Resolving at startup
+also avoids the first-call race: lru_cache doesn't lock, so concurrent first
+calls could each build an instance. cache_clear() still resets a singleton
+(used by tests).
 """
 
 from __future__ import annotations
 
+import logging
 from functools import lru_cache
-
-from backend.conversation_storage.conversations import ConversationStore
-from backend.gcs_storage import GCSStorage
+from typing import TYPE_CHECKING
 
 from .backend_client import BackendClient
 from .background_tasks import BackgroundTaskManager
 from .config import WhatsAppConfig
 from .conversation import ConversationLoader
-from .deduplication import MessageDeduplicator
+from .deduplication import MessageDeduplicator, RedisMessageDeduplicator
 from .delivery_tracker import DeliveryTracker
 from .error_rate_limiter import ErrorRateLimiter
 from .logging_utils import EventLogger
 from .query_logger import WhatsAppQueryLogger
 from .whatsapp_client import WhatsAppClient
 
+if TYPE_CHECKING:
+    from backend.conversation_storage.conversations import ConversationStore
+    from backend.gcs_storage import GCSStorage
+
+_log = logging.getLogger(__name__)
 
-@lru_cache()
+
+@lru_cache(maxsize=None)
 def get_config() -> WhatsAppConfig:
     """
     Get configuration singleton.
@@ -43,7 +57,7 @@ def get_config() -> WhatsAppConfig:
     return config
 
 
-@lru_cache()
+@lru_cache(maxsize=None)
 def get_gcs_storage() -> GCSStorage:
     """
     Get GCS storage backend singleton.
@@ -56,6 +70,9 @@ def get_gcs_storage() -> GCSStorage:
     Raises:
         Exception: If GCS initialization fails (fail-fast)
     """
+    # Imported on first use: google-cloud-storage dominates import time
+    from backend.gcs_storage import GCSStorage
+
     config = get_config()
     try:
         storage = GCSStorage(config.gcs_bucket, credentials_json=None)  # None enables ADC
@@ -64,7 +81,7 @@ def get_gcs_storage() -> GCSStorage:
         raise RuntimeError(f"Failed to initialize GCS storage: {e}")
 
 
-@lru_cache()
+@lru_cache(maxsize=None)
 def get_conversation_store() -> ConversationStore:
     """
     Get conversation store singleton.
@@ -78,16 +95,19 @@ def get_conversation_store() -> ConversationStore:
         store = get_conversation_store()
         conv = store.get_conversation("whatsapp_972501234567")
     """
+    from backend.conversation_storage.conversations import ConversationStore
+
     storage = get_gcs_storage()
     return ConversationStore(storage)
 
 
-@lru_cache()
+@lru_cache(maxsize=None)
 def get_event_logger() -> EventLogger:
     """
     Get event logger singleton.
 
-    Logs events to daily JSONL files in configured log directory.
+    Logs events to daily JSONL files in configured log directory. With
+    WHATSAPP_LOG_EVENTS set, only the listed event types (plus "error") are logged.
 
     Returns:
         EventLogger instance
@@ -97,10 +117,10 @@ def get_event_logger() -> EventLogger:
         logger.log_event("incoming_message", {"from": "972501234567"})
     """
     config = get_config()
-    return EventLogger(config.log_dir)
+    return EventLogger(config.log_dir, event_types=config.log_event_types)
 
 
-@lru_cache()
+@lru_cache(maxsize=None)
 def get_whatsapp_clients() -> dict:
     """
     Get a dict of WhatsApp API clients, one per configured phone number.
@@ -142,9 +162,6 @@ def get_whatsapp_client_for(phone_number_id: str) -> WhatsAppClient:
         client = get_whatsapp_client_for("123456789")
         client.send_text_message("+972501234567", "Hello!")
     """
-    import logging as _logging
-    _log = _logging.getLogger(__name__)
-
     clients = get_whatsapp_clients()
     if phone_number_id in clients:
         return clients[phone_number_id]
@@ -171,7 +188,7 @@ def get_whatsapp_client_for(phone_number_id: str) -> WhatsAppClient:
     raise RuntimeError("No WhatsApp clients configured")
 
 
-@lru_cache()
+@lru_cache(maxsize=None)
 def get_backend_client() -> BackendClient:
     """
     Get backend API client singleton.
@@ -198,7 +215,7 @@ def get_backend_client() -> BackendClient:
     )
 
 
-@lru_cache()
+@lru_cache(maxsize=None)
 def get_conversation_loader() -> ConversationLoader:
     """
     Get conversation loader singleton.
@@ -214,18 +231,23 @@ def get_conversation_loader() -> ConversationLoader:
         conv = loader.load_conversation("972501234567", area="עמק חפר", site="אגמון חפר")
     """
     conversation_store = get_conversation_store()
-    return ConversationLoader(conversation_store=conversation_store)
+    return ConversationLoader(
+        conversation_store=conversation_store,
+        cache_size=get_config().conversation_cache_size,
+    )
 
 
-@lru_cache()
+@lru_cache(maxsize=None)
 def get_message_deduplicator() -> MessageDeduplicator:
     """
     Get message deduplicator singleton.
 
-    Thread-safe deduplication cache with 5-minute TTL.
+    Thread-safe deduplication cache with 5-minute TTL. When REDIS_URL is set,
+    message IDs are also shared through Redis so retries routed to another
+    worker or instance are still caught.
 
     Returns:
-        MessageDeduplicator instance
+        MessageDeduplicator instance (RedisMessageDeduplicator with REDIS_URL)
 
     Example:
         dedup = get_message_deduplicator()
@@ -233,10 +255,19 @@ def get_message_deduplicator() -> MessageDeduplicator:
             print("Duplicate message")
     """
     config = get_config()
-    return MessageDeduplicator(ttl_seconds=config.message_dedup_ttl_seconds)
+    if config.redis_url:
+        return RedisMessageDeduplicator.from_url(
+            config.redis_url,
+            ttl_seconds=config.message_dedup_ttl_seconds,
+            max_entries=config.message_dedup_max_entries,
+        )
+    return MessageDeduplicator(
+        ttl_seconds=config.message_dedup_ttl_seconds,
+        max_entries=config.message_dedup_max_entries,
+    )
 
 
-@lru_cache()
+@lru_cache(maxsize=None)
 def get_error_rate_limiter() -> ErrorRateLimiter:
     """
     Get error rate limiter singleton.
@@ -254,19 +285,20 @@ def get_error_rate_limiter() -> ErrorRateLimiter:
     return ErrorRateLimiter(cooldown_seconds=120)
 
 
-@lru_cache()
+@lru_cache(maxsize=None)
 def get_task_manager() -> BackgroundTaskManager:
     """
     Get background task manager singleton.
 
-    Manages background threads with timeout monitoring and graceful shutdown.
+    Runs background tasks on a bounded worker pool with timeout monitoring
+    and graceful shutdown.
 
     Returns:
         BackgroundTaskManager instance
 
     Example:
         manager = get_task_manager()
-        thread = manager.execute_async(
+        future = manager.execute_async(
             process_message,
             phone="972501234567",
             text="שלום",
@@ -277,16 +309,19 @@ def get_task_manager() -> BackgroundTaskManager:
     logger = get_event_logger()
     return BackgroundTaskManager(
         timeout_seconds=config.background_task_timeout_seconds,
-        logger=logger
+        logger=logger,
+        max_workers=config.background_task_pool_size,
+        max_queue_size=config.background_task_queue_size,
     )
 
 
-@lru_cache()
+@lru_cache(maxsize=None)
 def get_query_logger() -> WhatsAppQueryLogger:
     """
     Get WhatsApp query logger singleton.
 
-    Logs queries with timing data to GCS for analytics.
+    Logs queries with timing data to GCS for analytics. Entries are queued and
+    written in batches (one GCS read-modify-write per second at most).
 
     Returns:
         WhatsAppQueryLogger instance
@@ -306,10 +341,11 @@ def get_query_logger() -> WhatsAppQueryLogger:
         )
     """
     storage = get_gcs_storage()
-    return WhatsAppQueryLogger(storage)
+    # Batch GCS appends from concurrent workers into one write per second
+    return WhatsAppQueryLogger(storage, flush_interval=1.0)
 
 
-@lru_cache()
+@lru_cache(maxsize=None)
 def get_delivery_tracker() -> DeliveryTracker:
     """
     Get delivery status tracker singleton.
@@ -0,0 +1,74 @@
+"""
+Fast JSON encoding/decoding helpers.
+
+Uses orjson when installed (faster parsing, UTF-8 bytes output) and falls back
+to the stdlib json module otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Parse JSON from bytes or str.
+
+    Args:
+        data: JSON document (UTF-8 bytes or str)
+
+    Returns:
+        Parsed Python object
+
+    Raises:
+        ValueError: If data is not valid JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize object to compact UTF-8 JSON bytes (non-ASCII kept as-is).
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        UTF-8 encoded JSON document
+
+    Raises:
+        TypeError: If obj is not JSON-serializable
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_line(obj: Any) -> bytes:
+    """
+    Serialize object to one JSONL line: compact UTF-8 JSON plus a newline.
+
+    Non-string dict keys (ints, etc.) are converted to strings, matching the
+    stdlib json module.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        UTF-8 encoded JSON document ending in b"\\n"
+
+    Raises:
+        TypeError: If obj is not JSON-serializable
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
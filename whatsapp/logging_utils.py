@@ -6,11 +6,23 @@ Provides structured logging to daily JSONL files and stderr output.
 
 from __future__ import annotations
 
+import atexit
 import json
+import os
+import queue
 import sys
-from datetime import datetime, timezone
+import threading
+import time
+from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Optional, Any
+from typing import Optional, Any, Iterable, List, Tuple
+
+from . import json_utils
+
+
+_SECONDS_PER_DAY = 86400
+# date.fromordinal(_EPOCH_ORDINAL + n) is the UTC date n days after the epoch
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
 
 
 class EventLogger:
@@ -19,52 +31,234 @@ class EventLogger:
 
     Logs events to daily files in format: {timestamp, event_type, correlation_id, data}
     Also echoes events to stderr for real-time monitoring.
+
+    log_event() never does I/O on the caller's thread: events are queued and a
+    background writer thread appends them in batches (up to batch_size events,
+    or whatever arrived within flush_interval seconds). The writer keeps the
+    day's file open and only reopens at UTC date rollover, so a batch costs a
+    single os.write() call. close() stops the writer; events logged after
+    that are written on the caller's thread.
     """
 
-    def __init__(self, log_dir: Path):
+    def __init__(
+        self,
+        log_dir: Path,
+        batch_size: int = 256,
+        flush_interval: float = 0.02,
+        event_types: Optional[Iterable[str]] = None,
+    ):
         """
         Initialize event logger.
 
         Args:
             log_dir: Directory for log files (created if doesn't exist)
+            batch_size: Maximum events written per batch (default: 256)
+            flush_interval: Seconds to wait for more events before writing a batch (default: 0.02)
+            event_types: Event types to log; others are dropped before being
+                serialized. "error" is always logged. None (default) logs all.
         """
         self.log_dir = log_dir
+        self._event_types = None if event_types is None else frozenset(event_types) | {"error"}
         self.log_dir.mkdir(exist_ok=True)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        # Open daily file descriptor; only touched by the writer thread and close()
+        self._fd: Optional[int] = None
+        self._fd_day: Optional[int] = None  # UTC day number (days since epoch) of _fd
+        self._fh_lock = threading.Lock()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run_writer, name="event-logger", daemon=True)
+        self._writer.start()
+        # Writer is a daemon thread - drain pending events on interpreter exit
+        atexit.register(self.close)
 
     def log_event(
         self,
         event_type: str,
         data: dict[str, Any],
-        correlation_id: Optional[str] = None
+        correlation_id: Optional[str] = None,
+        timestamp: Optional[float] = None,
     ) -> None:
         """
-        Log event to daily JSONL file and stderr.
+        Queue event for the daily JSONL file and stderr.
+
+        Non-blocking: the event is timestamped and serialized now (so later
+        changes to data by the caller can't leak into the log) and written by
+        the background writer thread.
 
         Args:
             event_type: Event type identifier (e.g., "incoming_message", "error")
             data: Event data dictionary
             correlation_id: Optional correlation ID for request tracing
+            timestamp: Event time in epoch seconds, for events logged after the
+                fact (default: now)
         """
-        timestamp = datetime.now(timezone.utc).isoformat()
+        # Filtered-out types cost one set lookup: no timestamp, JSON or queueing
+        if self._event_types is not None and event_type not in self._event_types:
+            return
+
+        epoch = time.time() if timestamp is None else timestamp
+        now = datetime.fromtimestamp(epoch, timezone.utc)
+        # Fixed precision: one isoformat() branch, same width for every event
+        timestamp = now.isoformat(timespec="microseconds")
+        # A plain dict on purpose: orjson serializes a dict literal about twice
+        # as fast as a slotted dataclass carrying the same four fields
         log_entry = {
             "timestamp": timestamp,
             "event_type": event_type,
             "correlation_id": correlation_id,
             "data": data,
         }
-
-        # Log to daily file
-        log_file = self.log_dir / f"{datetime.now(timezone.utc).date()}.jsonl"
         try:
-            with open(log_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+            line = json_utils.dumps_line(log_entry)
         except Exception as e:
             self.eprint(f"[ERROR] Failed to write log: {e}")
+            return
+
+        # Error events are also pretty-printed to stderr by the writer
+        event = (
+            int(epoch // _SECONDS_PER_DAY), timestamp, event_type, line, data if event_type == "error" else None
+        )
+        if self._closed:
+            self._write_batch([event])  # Writer stopped: write it here
+        else:
+            self._queue.put_nowait(event)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Block until all events queued so far have been written.
+
+        Args:
+            timeout: Maximum time to wait in seconds (default: 5.0)
+
+        Returns:
+            True if pending events were written, False on timeout
+        """
+        if self._closed:
+            return True  # Events are written synchronously after close()
+        done = threading.Event()
+        self._queue.put_nowait(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Write pending events, stop the writer thread and close the open log file.
+
+        Safe to call more than once. A later event is written synchronously
+        and reopens the file.
+
+        Args:
+            timeout: Maximum time to wait for pending events in seconds (default: 5.0)
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put_nowait(None)  # Sentinel: write what's queued, then exit
+            self._writer.join(timeout)
+            atexit.unregister(self.close)
+            # Events queued by log_event() calls that raced with the sentinel
+            leftovers = []
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, threading.Event):
+                    item.set()
+                elif item is not None:
+                    leftovers.append(item)
+            if leftovers:
+                self._write_batch(leftovers)
+        with self._fh_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = self._fd_day = None
+
+    def _run_writer(self) -> None:
+        """Writer thread loop: collect a batch of events, then write it (until close())."""
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._batch_size:
+                if batch[-1] is None or isinstance(batch[-1], threading.Event):
+                    break  # Flush or stop requested - write now
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            stopping = batch[-1] is None
+            events = [
+                item for item in batch
+                if item is not None and not isinstance(item, threading.Event)
+            ]
+            try:
+                self._write_batch(events)
+            except Exception as e:
+                self.eprint(f"[ERROR] Failed to write log batch: {e}")
+
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _write_batch(self, events: List[Tuple[int, str, str, bytes, Optional[dict]]]) -> None:
+        """
+        Append events to their daily JSONL files and echo them to stderr.
+
+        Args:
+            events: Queued (utc_day_number, timestamp, event_type, json_line, error_data) tuples
+        """
+        lines_by_day: dict[int, List[bytes]] = {}
+        console: List[str] = []
+        for day, timestamp, event_type, line, error_data in events:
+            lines_by_day.setdefault(day, []).append(line)
+            console.append(f"[{timestamp}] {event_type}")
+            if error_data is not None:
+                console.append(json.dumps(error_data, ensure_ascii=False, indent=2))
 
-        # Also print to console
-        self.eprint(f"[{timestamp}] {event_type}")
-        if event_type == "error":
-            self.eprint(json.dumps(data, ensure_ascii=False, indent=2))
+        # Also print to console: one stderr write per batch, so the writer takes
+        # the stderr lock once instead of contending with workers per event
+        if console:
+            self.eprint("\n".join(console))
+
+        # Log to daily file(s): one os.write() per file, straight to the kernel
+        with self._fh_lock:
+            for day, lines in lines_by_day.items():
+                try:
+                    fd = self._open_log_file(day)
+                    payload = memoryview(b"".join(lines))
+                    while payload:
+                        payload = payload[os.write(fd, payload):]
+                except Exception as e:
+                    self.eprint(f"[ERROR] Failed to write log: {e}")
+
+    def _open_log_file(self, day: int) -> int:
+        """
+        Return the open descriptor for a UTC day's file, reopening on rollover.
+
+        The rollover check is one int comparison; the file name is only built
+        when the day changes. A raw O_APPEND descriptor: no Python buffer layer,
+        and each write lands at the end of the file even with other processes
+        appending to it. Must be called with _fh_lock held.
+
+        Args:
+            day: UTC day number (days since the epoch)
+
+        Returns:
+            Open file descriptor in append mode
+        """
+        if day != self._fd_day:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = self._fd_day = None
+            log_file = self.log_dir / f"{date.fromordinal(_EPOCH_ORDINAL + day)}.jsonl"
+            self._fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._fd_day = day
+        return self._fd
 
     def eprint(self, *args: object) -> None:
         """
@@ -73,14 +267,18 @@ class EventLogger:
         Args:
             *args: Values to print (same as print())
         """
-        print(*args, file=sys.stderr)
+        eprint(*args)
 
 
 def eprint(*args: object) -> None:
     """
     Standalone utility to print to stderr.
 
+    Joins the values into one line and issues a single write(), where print()
+    writes each value, separator and newline separately. sys.stderr is looked
+    up per call so redirection (e.g. test capture) keeps working.
+
     Args:
         *args: Values to print (same as print())
     """
-    print(*args, file=sys.stderr)
+    sys.stderr.write(" ".join(map(str, args)) + "\n")
@@ -19,6 +19,20 @@ from .query_logger import WhatsAppQueryLogger
 from .timing import TimingContext
 from .whatsapp_client import WhatsAppClient
 
+# User-facing replies (Hebrew), defined once and shared by every message
+_MSG_UNAVAILABLE = "מצטער, המערכת אינה זמינה כרגע. נסה שוב בעוד מספר דקות."
+_MSG_NOT_UNDERSTOOD = "מצטער, לא הצלחתי להבין את השאלה."
+_MSG_SEND_FAILED = "מצטער, לא הצלחתי לשלוח את התשובה. נסה שוב בעוד מספר דקות."
+_MSG_RESET_OK = "השיחה אופסה. אפשר להתחיל מחדש!"
+_MSG_RESET_FAILED = "מצטער, לא הצלחתי לאפס את השיחה. אנא נסה שוב."
+_MSG_RESET_FAILED_RESULT = "מצטער, לא הצלחתי לאפס את השיחה."
+
+# Commands that reset the conversation (matched case-insensitively)
+_RESET_COMMANDS = frozenset(("reset", "התחל מחדש"))
+# Longer messages can't be a command: skip lowercasing them
+_MAX_COMMAND_LENGTH = max(map(len, _RESET_COMMANDS))
+
+
 def process_message(
     phone: str,
     text: str,
@@ -104,7 +118,7 @@ def process_message(
         except Exception as e:
             eprint(f"[ERROR] Failed to load conversation: {e}")
             _send_rate_limited_error(
-                phone, "מצטער, המערכת אינה זמינה כרגע. נסה שוב בעוד מספר דקות.",
+                phone, _MSG_UNAVAILABLE,
                 whatsapp_client, error_rate_limiter, logger,
                 error_type="conversation_load_failure",
                 correlation_id=correlation_id,
@@ -135,7 +149,7 @@ def process_message(
         except Exception as e:
             eprint(f"[ERROR] Failed to save user message: {e}")
             _send_rate_limited_error(
-                phone, "מצטער, המערכת אינה זמינה כרגע. נסה שוב בעוד מספר דקות.",
+                phone, _MSG_UNAVAILABLE,
                 whatsapp_client, error_rate_limiter, logger,
                 error_type="user_message_save_failure",
                 correlation_id=correlation_id,
@@ -153,46 +167,11 @@ def process_message(
         )
         timing_ctx.mark("backend_response_received")
 
-        # Validate and extract response
-        response_text = backend_response.get(
-            "response_text", "מצטער, לא הצלחתי להבין את השאלה."
-        )
-
-        # Defensive type validation for response_text (follow pattern from PR #58)
-        if not isinstance(response_text, str):
-            eprint(
-                f"[ERROR] response_text is not a string! Type: {type(response_text)}. Converting to string."
-            )
-            logger.log_event(
-                "error",
-                {
-                    "type": "invalid_response_text_type",
-                    "actual_type": str(type(response_text)),
-                    "value": str(response_text)[:200],
-                },
-                correlation_id,
-            )
-            response_text = str(response_text)
-
-        # Extract image data
+        # Field types were checked once by BackendClient (_validate_qa_response)
+        response_text = backend_response.get("response_text", _MSG_NOT_UNDERSTOOD)
         should_include_images = backend_response.get("should_include_images", False)
         images = backend_response.get("images", [])
 
-        # Defensive validation for images field
-        if not isinstance(images, list):
-            eprint(
-                f"[WARNING] images field is not a list! Type: {type(images)}. Ignoring images."
-            )
-            logger.log_event(
-                "error",
-                {
-                    "type": "invalid_images_type",
-                    "actual_type": str(type(images)),
-                },
-                correlation_id,
-            )
-            images = []
-
         # Re-trigger typing indicator before sending images (initial typing may have expired)
         # Backend API call can take 10-15 seconds, and typing indicators expire after 25 seconds
         if should_include_images and images:
@@ -239,7 +218,7 @@ def process_message(
             # Send failed, try fallback error message
             eprint(f"[ERROR] Failed to send response, status: {status}")
             _send_rate_limited_error(
-                phone, "מצטער, לא הצלחתי לשלוח את התשובה. נסה שוב בעוד מספר דקות.",
+                phone, _MSG_SEND_FAILED,
                 whatsapp_client, error_rate_limiter, logger,
                 error_type="send_response_failure",
                 correlation_id=correlation_id,
@@ -251,8 +230,7 @@ def process_message(
             # Extract WhatsApp message ID from API response
             outgoing_msg_id = send_response.get("messages", [{}])[0].get("id")
             if outgoing_msg_id:
-                breakdown = timing_ctx.get_breakdown()
-                sent_timestamp_ms = breakdown.get("text_sent", 0)
+                sent_timestamp_ms = timing_ctx.get_checkpoint("text_sent") or 0
                 delivery_tracker.register_outgoing_message(
                     message_id=outgoing_msg_id,
                     correlation_id=correlation_id,
@@ -282,6 +260,7 @@ def process_message(
         timing_ctx.mark("request_completed")
         try:
             total_latency = timing_ctx.get_total_elapsed() or 0.0
+            timing_breakdown = timing_ctx.get_breakdown()
             query_logger.log_query(
                 conversation_id=conv.conversation_id,
                 area=conv.area,
@@ -296,11 +275,11 @@ def process_message(
                 images=images if (should_include_images and images) else [],
                 should_include_images=should_include_images,
                 image_relevance=backend_response.get("image_relevance"),
-                timing_breakdown=timing_ctx.get_breakdown(),
+                timing_breakdown=timing_breakdown,
                 delivery_status=None,  # Will be updated by status webhooks later
                 error=None,
             )
-            eprint(f"[TIMING] Query logged with {len(timing_ctx.checkpoints)} timing checkpoints")
+            eprint(f"[TIMING] Query logged with {len(timing_breakdown)} timing checkpoints")
         except Exception as e:
             eprint(f"[WARNING] Failed to log query timing: {e}")
             # Don't fail message processing if logging fails
@@ -322,7 +301,7 @@ def process_message(
         # Try to send error message to user (rate-limited)
         try:
             _send_rate_limited_error(
-                phone, "מצטער, המערכת אינה זמינה כרגע. נסה שוב בעוד מספר דקות.",
+                phone, _MSG_UNAVAILABLE,
                 whatsapp_client, error_rate_limiter, logger,
                 error_type="background_task_exception",
                 correlation_id=correlation_id,
@@ -330,6 +309,11 @@ def process_message(
         except Exception:
             pass  # Failed to send error message, nothing more we can do
 
+    finally:
+        # Write the send events WhatsAppClient deferred during the request
+        if timing_ctx is not None:
+            timing_ctx.flush_events(logger)
+
 
 def _send_rate_limited_error(
     phone: str,
@@ -395,18 +379,18 @@ def handle_special_command(
             print(f"Command handled: {response}")
     """
     # Reset command
-    if text.lower() in ("reset", "התחל מחדש"):
+    if len(text) <= _MAX_COMMAND_LENGTH and (
+        text in _RESET_COMMANDS or text.lower() in _RESET_COMMANDS
+    ):
         try:
             conversation_loader.reset_conversation(phone, area=area, site=site)
-            whatsapp_client.send_text_message(phone, "השיחה אופסה. אפשר להתחיל מחדש!")
+            whatsapp_client.send_text_message(phone, _MSG_RESET_OK)
             eprint("✓ Conversation reset")
-            return "השיחה אופסה. אפשר להתחיל מחדש!"
+            return _MSG_RESET_OK
         except Exception as e:
             eprint(f"[ERROR] Failed to reset conversation: {e}")
-            whatsapp_client.send_text_message(
-                phone, "מצטער, לא הצלחתי לאפס את השיחה. אנא נסה שוב."
-            )
-            return "מצטער, לא הצלחתי לאפס את השיחה."
+            whatsapp_client.send_text_message(phone, _MSG_RESET_FAILED)
+            return _MSG_RESET_FAILED_RESULT
 
     # TODO: Handle location switch command (future)
     # if text.lower().startswith("switch to") or text.startswith("עבור ל"):
@@ -429,7 +413,7 @@ def send_images_if_needed(
     Send images if available and flagged by LLM.
 
     Sends only the first image (backend sorted by relevance).
-    Performs defensive validation on image data structure.
+    Image entries are type-checked by BackendClient before they get here.
 
     Args:
         images: List of image objects from backend
@@ -458,40 +442,9 @@ def send_images_if_needed(
     # Send only the first image (backend sorted by relevance)
     first_image = images[0]
 
-    # Defensive validation: ensure first_image is a dictionary
-    if not isinstance(first_image, dict):
-        eprint(
-            f"[WARNING] First image entry is not a dict! Type: {type(first_image)}. Skipping image send."
-        )
-        logger.log_event(
-            "error",
-            {
-                "type": "invalid_image_entry_type",
-                "actual_type": str(type(first_image)),
-            },
-            correlation_id,
-        )
-        return
-
+    # Entry types were checked by BackendClient (_validate_qa_response)
     image_url = first_image.get("uri")  # GCS signed URL
-    caption_raw = first_image.get("caption", "")
-
-    # Defensive validation: ensure caption is a string
-    if not isinstance(caption_raw, str):
-        eprint(
-            f"[WARNING] Caption field is not a string! Type: {type(caption_raw)}. Using empty caption."
-        )
-        logger.log_event(
-            "error",
-            {
-                "type": "invalid_caption_type",
-                "actual_type": str(type(caption_raw)),
-            },
-            correlation_id,
-        )
-        caption = ""
-    else:
-        caption = caption_raw
+    caption = first_image.get("caption", "")
 
     if image_url:
         eprint(f"[IMAGE] Sending image: {caption[:50]}...")
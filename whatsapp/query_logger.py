@@ -7,14 +7,21 @@ detailed timing breakdowns from webhook arrival to message delivery.
 
 from __future__ import annotations
 
+import atexit
 import logging
-from typing import Dict, List, Optional, Any
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 
-from backend.gcs_storage import StorageBackend
-from backend.query_logging.query_logger import QueryLogger as BackendQueryLogger
+if TYPE_CHECKING:
+    from backend.gcs_storage import StorageBackend
 
 logger = logging.getLogger(__name__)
 
+# Timing keys for the known WhatsApp delivery statuses (built once, not per log)
+_DELIVERY_KEYS = {status: f"whatsapp_{status}" for status in ("sent", "delivered", "read", "failed")}
+
 
 class WhatsAppQueryLogger:
     """
@@ -22,17 +29,49 @@ class WhatsAppQueryLogger:
 
     Wraps backend QueryLogger and adds WhatsApp-specific fields like
     phone number, message_id, and detailed timing checkpoints.
+
+    Each GCS append is a read-modify-write of the whole daily file. With
+    flush_interval set, log_query() only builds the entry and queues it; a
+    background thread writes everything queued within the interval with a
+    single read-modify-write (and, being the only writer, avoids concurrent
+    workers overwriting each other's appends). close() stops the flusher;
+    entries logged after that are written synchronously.
     """
 
-    def __init__(self, storage_backend: StorageBackend, gcs_prefix: str = "whatsapp_query_logs"):
+    def __init__(
+        self,
+        storage_backend: StorageBackend,
+        gcs_prefix: str = "whatsapp_query_logs",
+        flush_interval: Optional[float] = None,
+        max_batch_size: int = 100,
+    ):
         """
         Initialize WhatsApp query logger.
 
         Args:
             storage_backend: GCS storage backend
             gcs_prefix: GCS prefix for WhatsApp query logs (default: "whatsapp_query_logs")
+            flush_interval: Seconds to collect entries before each batched write.
+                None (default) writes synchronously on every log_query() call.
+            max_batch_size: Maximum entries per batched write (default: 100)
         """
+        # Deferred: the backend package pulls in google-cloud-storage
+        from backend.query_logging.query_logger import QueryLogger as BackendQueryLogger
+
         self.backend_logger = BackendQueryLogger(storage_backend, gcs_prefix)
+        self._flush_interval = flush_interval
+        self._max_batch_size = max_batch_size
+        self._queue: Optional[queue.SimpleQueue] = None
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+        if flush_interval is not None:
+            self._queue = queue.SimpleQueue()
+            self._flusher = threading.Thread(
+                target=self._run_flusher, name="query-log-flusher", daemon=True
+            )
+            self._flusher.start()
+            # Flusher is a daemon thread - write pending entries on interpreter exit
+            atexit.register(self.close)
         logger.info(f"WhatsAppQueryLogger initialized with prefix: {gcs_prefix}")
 
     def log_query(
@@ -80,17 +119,20 @@ class WhatsAppQueryLogger:
             delivery_status: Optional dict with delivery confirmation timestamps
             error: Error message if query failed
         """
-        # Build enhanced timing breakdown with WhatsApp-specific fields
-        enhanced_timing = timing_breakdown.copy() if timing_breakdown else {}
-
-        # Add delivery status timestamps if available
+        # Build enhanced timing breakdown with WhatsApp-specific fields. Without
+        # delivery status (the common case) the caller's dict is used as is:
+        # nothing is added, so there is nothing to copy.
         if delivery_status:
+            enhanced_timing = dict(timing_breakdown) if timing_breakdown else {}
             for status_type, timestamp in delivery_status.items():
-                enhanced_timing[f"whatsapp_{status_type}"] = timestamp
+                key = _DELIVERY_KEYS.get(status_type) or f"whatsapp_{status_type}"
+                enhanced_timing[key] = timestamp
+        else:
+            enhanced_timing = timing_breakdown or {}
 
         # Call backend logger with all fields
         try:
-            self.backend_logger.log_query(
+            entry_fields = dict(
                 conversation_id=conversation_id,
                 area=area,
                 site=site,
@@ -108,6 +150,10 @@ class WhatsAppQueryLogger:
                 images=images,
                 timing_breakdown=enhanced_timing,
             )
+            if self._queue is not None and not self._closed:
+                self._queue.put_nowait(self.backend_logger.build_entry(**entry_fields))
+            else:
+                self.backend_logger.log_query(**entry_fields)
 
             logger.debug(
                 f"Logged WhatsApp query: {correlation_id} - "
@@ -117,3 +163,87 @@ class WhatsAppQueryLogger:
         except Exception as e:
             # Log error but don't fail message processing
             logger.error(f"Failed to log WhatsApp query: {e}")
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        Block until all queued entries have been written.
+
+        No-op when batching is disabled.
+
+        Args:
+            timeout: Maximum time to wait in seconds (default: 10.0)
+
+        Returns:
+            True if pending entries were written, False on timeout
+        """
+        if self._queue is None or self._closed:
+            return True  # Nothing queued: entries are written synchronously
+        done = threading.Event()
+        self._queue.put_nowait(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """
+        Write queued entries and stop the flusher thread.
+
+        Safe to call more than once; no-op when batching is disabled. Later
+        log_query() calls write synchronously.
+
+        Args:
+            timeout: Maximum time to wait for queued entries in seconds (default: 10.0)
+        """
+        if self._flusher is None or self._closed:
+            return
+        self._closed = True
+        self._queue.put_nowait(None)  # Sentinel: write what's queued, then exit
+        self._flusher.join(timeout)
+        atexit.unregister(self.close)
+        # Entries queued by log_query() calls that raced with the sentinel
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is not None:
+                leftovers.append(item)
+        if leftovers:
+            self._write_entries(leftovers)
+
+    def _run_flusher(self) -> None:
+        """Flusher thread loop: collect entries for flush_interval, then write them once (until close())."""
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._max_batch_size:
+                if batch[-1] is None or isinstance(batch[-1], threading.Event):
+                    break  # Flush or stop requested - write now
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            stopping = batch[-1] is None
+            entries = [
+                item for item in batch
+                if item is not None and not isinstance(item, threading.Event)
+            ]
+            if entries:
+                self._write_entries(entries)
+
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _write_entries(self, entries: List[dict]) -> None:
+        """Append a batch of entries, logging (not raising) failures."""
+        try:
+            self.backend_logger.log_batch(entries)
+        except Exception as e:
+            logger.error(f"Failed to write WhatsApp query log batch: {e}")
@@ -15,6 +15,14 @@ T = TypeVar('T')
 F = TypeVar('F', bound=Callable[..., Any])
 
 
+class PermanentError(Exception):
+    """
+    Failure that retrying cannot fix (e.g. HTTP 4xx for an invalid recipient).
+
+    Raised through @retry immediately, without backoff delays or further attempts.
+    """
+
+
 def retry(
     max_attempts: int = 3,
     base_delay: float = 1.0,
@@ -27,6 +35,7 @@ def retry(
 
     Retries a function up to max_attempts times with exponential backoff delay.
     Delay calculation: min(base_delay * (2 ** attempt), max_delay) seconds.
+    PermanentError is never retried.
 
     Args:
         max_attempts: Number of retry attempts (default: 3)
@@ -46,48 +55,48 @@ def retry(
 
         # Retries on failure: 0s → 1s delay → 2s delay → 4s delay → raise
     """
+    # Backoff schedule is fixed per decorator: compute it once, not per retry
+    delays = tuple(
+        min(base_delay * (1 << attempt), max_delay) for attempt in range(max_attempts - 1)
+    )
+
     def decorator(func: F) -> F:
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            last_exception: Exception | None = None
+            # Fast path: a healthy call returns without entering the retry loop
+            try:
+                return func(*args, **kwargs)
+            except PermanentError:
+                raise
+            except exceptions as e:
+                last_exception = e
+
+            for attempt, delay in enumerate(delays, 1):
+                # Log retry attempt if logger provided
+                if logger:
+                    logger(
+                        f"[RETRY] Attempt {attempt}/{max_attempts} failed "
+                        f"with {type(last_exception).__name__}: {last_exception}. "
+                        f"Retrying in {delay}s..."
+                    )
 
-            for attempt in range(max_attempts):
-                try:
-                    # Attempt the function call
-                    result = func(*args, **kwargs)
-                    return result
+                # Wait before retry
+                time.sleep(delay)
 
+                try:
+                    return func(*args, **kwargs)
+                except PermanentError:
+                    raise
                 except exceptions as e:
                     last_exception = e
 
-                    # Don't retry on final attempt
-                    if attempt >= max_attempts - 1:
-                        break
-
-                    # Calculate exponential backoff delay
-                    delay = min(base_delay * (2 ** attempt), max_delay)
-
-                    # Log retry attempt if logger provided
-                    if logger:
-                        logger(
-                            f"[RETRY] Attempt {attempt + 1}/{max_attempts} failed "
-                            f"with {type(e).__name__}: {e}. Retrying in {delay}s..."
-                        )
-
-                    # Wait before retry
-                    time.sleep(delay)
-
             # All retries exhausted, raise last exception
-            if last_exception:
-                if logger:
-                    logger(
-                        f"[RETRY] All {max_attempts} attempts failed. "
-                        f"Final error: {type(last_exception).__name__}: {last_exception}"
-                    )
-                raise last_exception
-
-            # Should never reach here, but make type checker happy
-            raise RuntimeError("Retry logic error: no exception but no result")
+            if logger:
+                logger(
+                    f"[RETRY] All {max_attempts} attempts failed. "
+                    f"Final error: {type(last_exception).__name__}: {last_exception}"
+                )
+            raise last_exception
 
         return wrapper  # type: ignore
 
@@ -6,15 +6,77 @@ Provides HMAC-SHA256 signature verification for Meta webhooks.
 
 from __future__ import annotations
 
-import hashlib
 import hmac
 import os
-import sys
-from typing import List, Optional
+from functools import lru_cache
+from typing import Iterable, List, Optional, Union
 
+from .config import is_production_environment
+from .logging_utils import eprint
 
+# Digest by name: hmac dispatches straight to OpenSSL's EVP implementation,
+# which uses the CPU's SHA extensions (SHA-NI / ARMv8 SHA2) where available
+_DIGEST = "sha256"
+# X-Hub-Signature-256 header: "sha256=" prefix + hex-encoded 32-byte digest
+_SIGNATURE_PREFIX = "sha256="
+_HEX_DIGEST_LENGTH = 64
+_SIGNATURE_LENGTH = len(_SIGNATURE_PREFIX) + _HEX_DIGEST_LENGTH
+
+
+@lru_cache()
+def _env_app_secret() -> Optional[str]:
+    """
+    WHATSAPP_APP_SECRET from the environment, read once per process.
+
+    Returns:
+        The secret, or None if unset
+    """
+    return os.getenv("WHATSAPP_APP_SECRET")
+
+
+@lru_cache(maxsize=16)
+def _hmac_template(secret: str) -> hmac.HMAC:
+    """
+    Keyed HMAC state for an app secret, built once per secret.
+
+    The key schedule (padded key hashed into the inner/outer SHA-256 states)
+    only depends on the secret, so each request copies this template instead
+    of re-deriving it. The template itself is never updated.
+
+    Args:
+        secret: Meta app secret
+
+    Returns:
+        HMAC object with no message data, to be copied per request
+    """
+    return hmac.new(secret.encode(), digestmod=_DIGEST)
+
+
+@lru_cache(maxsize=None)
+def _warn_missing_secret(production: bool) -> None:
+    """
+    Warn that WHATSAPP_APP_SECRET is unset, once per process (per mode).
+
+    Without a secret every webhook takes this path, so a per-request warning
+    would write to stderr on each request - including attacker floods in
+    production, where they are all rejected anyway.
+
+    Args:
+        production: True if requests are being rejected (production),
+            False if signature validation is skipped (local dev)
+    """
+    if production:
+        eprint("[SECURITY] WHATSAPP_APP_SECRET not set in production - rejecting all webhook requests")
+    else:
+        eprint(
+            "[WARNING] WHATSAPP_APP_SECRET not set - skipping signature validation "
+            "(local dev mode)"
+        )
+
+
+# Kept in pure Python: hashing, hex decoding and the digest comparison already run in C
 def verify_webhook_signature(
-    payload: bytes,
+    payload: Union[bytes, Iterable[bytes]],
     signature: str,
     app_secret: Optional[str] = None,
     extra_secrets: Optional[List[str]] = None,
@@ -27,10 +89,15 @@ def verify_webhook_signature(
     - Local dev: Warn but allow (for testing without Meta app secret)
     - All secrets always checked (no early exit) to avoid timing side-channels
 
+    The body can be passed as an iterable of chunks, so the caller can hash it
+    while reading it off the request stream (one pass over the bytes). Chunks
+    are only consumed once a signature check is actually needed.
+
     Args:
-        payload: Raw request body bytes
+        payload: Raw request body bytes, or an iterable of body chunks
         signature: X-Hub-Signature-256 header value (format: "sha256=<hex>")
-        app_secret: Meta app secret (default: from WHATSAPP_APP_SECRET env var)
+        app_secret: Meta app secret (default: from WHATSAPP_APP_SECRET env var,
+            read once per process)
         extra_secrets: Additional app secrets to try (for multi-app setups)
 
     Returns:
@@ -44,54 +111,48 @@ def verify_webhook_signature(
     """
     # Use provided app_secret or get from environment
     if app_secret is None:
-        app_secret = os.getenv("WHATSAPP_APP_SECRET")
-
-    # Detect production environment (Cloud Run sets K_SERVICE, App Engine sets GAE_ENV)
-    is_production = bool(os.getenv("K_SERVICE") or os.getenv("GAE_ENV"))
+        app_secret = _env_app_secret()
 
     # Collect all secrets to try (primary + extras, filtering out None/empty)
     secrets_to_try = [s for s in ([app_secret] + (extra_secrets or [])) if s]
 
     if not secrets_to_try:
-        if is_production:
-            # Production: Fail closed - reject all requests without app secret
-            print(
-                "[SECURITY] WHATSAPP_APP_SECRET not set in production - rejecting request",
-                file=sys.stderr
-            )
-            return False
-        else:
-            # Local dev: Warn but allow (for testing without Meta app secret)
-            print(
-                "[WARNING] WHATSAPP_APP_SECRET not set - skipping signature validation "
-                "(local dev mode)",
-                file=sys.stderr
-            )
-            return True
-
-    if not signature or not signature.startswith("sha256="):
+        # Production: Fail closed - reject all requests without app secret.
+        # Local dev: Warn but allow (for testing without Meta app secret)
+        production = is_production_environment()
+        _warn_missing_secret(production)
+        return not production
+
+    # Cheap header checks before any hashing: "sha256=" + 64 hex digits.
+    # removeprefix() strips and checks the prefix in one call: if it's
+    # missing, nothing is removed and the lengths can't both match
+    hex_digest = signature.removeprefix(_SIGNATURE_PREFIX)
+    if len(hex_digest) != _HEX_DIGEST_LENGTH or len(signature) != _SIGNATURE_LENGTH:
+        return False
+
+    # Decode hex signature so digests are compared as raw bytes
+    try:
+        expected_digest = bytes.fromhex(hex_digest)
+    except ValueError:
         return False
 
-    # Extract hex signature from header
-    expected_signature = signature[7:]  # Remove "sha256=" prefix
+    macs = [_hmac_template(secret).copy() for secret in secrets_to_try]
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        for mac in macs:
+            mac.update(payload)
+    else:
+        # Streamed body: feed each chunk to every secret's HMAC as it arrives
+        for chunk in payload:
+            for mac in macs:
+                mac.update(chunk)
+    computed_digests = [mac.digest() for mac in macs]
 
     # Try each secret — accept if any matches.
     # All secrets are always checked (no early exit) to avoid timing side-channels.
     matched = False
-    for secret in secrets_to_try:
-        mac = hmac.new(secret.encode(), msg=payload, digestmod=hashlib.sha256)
-        computed_signature = mac.hexdigest()
-        if hmac.compare_digest(computed_signature, expected_signature):
+    for computed_digest in computed_digests:
+        if hmac.compare_digest(computed_digest, expected_digest):
             matched = True
 
     return matched
 
-
-def is_production_environment() -> bool:
-    """
-    Detect if running in production environment.
-
-    Returns:
-        True if running on Cloud Run or App Engine, False otherwise
-    """
-    return bool(os.getenv("K_SERVICE") or os.getenv("GAE_ENV"))
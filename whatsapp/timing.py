@@ -7,7 +7,16 @@ Provides TimingContext for tracking timing checkpoints throughout message proces
 from __future__ import annotations
 
 import time
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .logging_utils import EventLogger
+
+_NS_PER_MS = 1_000_000
+
+# mark() calls timed to estimate its own cost
+_CALIBRATION_MARKS = 10_000
 
 
 class TimingContext:
@@ -24,17 +33,70 @@ class TimingContext:
         ctx.mark("conversation_loaded")
         breakdown = ctx.get_breakdown()
         # {"webhook_received": 1234567890123, "conversation_loaded": 1234567890500}
+
+    Checkpoints are stored as integer epoch nanoseconds and converted to
+    milliseconds only when read. Each context reads the wall clock once, at
+    construction, and marks perf_counter_ns() offsets from that base: marks
+    within a request never jump with clock adjustments, and each new context
+    re-anchors to the wall clock (checkpoints are logged and compared with
+    WhatsApp delivery timestamps). One is created per message, so the class
+    uses __slots__ (no per-instance __dict__). Initial checkpoints can be
+    passed at construction.
+
+    Attributes:
+        correlation_id: Optional correlation ID for cross-referencing with logs
+        checkpoints: Checkpoint names mapped to timestamps (milliseconds since epoch)
     """
 
-    def __init__(self, correlation_id: Optional[str] = None):
+    # No per-instance __dict__: one context is created per message
+    __slots__ = (
+        "correlation_id", "_ns", "_base_ns", "_events",
+        "_first_ns", "_last_ns", "_bounds_stale",
+    )
+
+    def __init__(
+        self,
+        correlation_id: Optional[str] = None,
+        checkpoints: Optional[Mapping[str, float]] = None,
+    ):
         """
         Initialize timing context.
 
         Args:
             correlation_id: Optional correlation ID for cross-referencing with logs
+            checkpoints: Optional initial checkpoints (milliseconds since epoch)
         """
         self.correlation_id = correlation_id
-        self.checkpoints: Dict[str, float] = {}
+        # Name-keyed dict on purpose: faster per mark() than an enum-indexed array
+        self._ns: Dict[str, int] = {}
+        # Earliest/latest checkpoint, kept up to date as checkpoints are added so
+        # get_total_elapsed() needn't scan; only overwriting a checkpoint (which
+        # may remove the earliest or latest value) forces a rescan
+        self._first_ns: Optional[int] = None
+        self._last_ns: Optional[int] = None
+        self._bounds_stale = False
+        # Epoch ns minus perf_counter ns: the one wall-clock read per context
+        self._base_ns = time.time_ns() - time.perf_counter_ns()
+        # Deferred (event_type, data, epoch_ns) log events; created on first use
+        self._events: Optional[List[Tuple[str, Dict[str, Any], int]]] = None
+        if checkpoints:
+            for checkpoint_name, timestamp_ms in checkpoints.items():
+                self.set_checkpoint(checkpoint_name, timestamp_ms)
+
+    @property
+    def checkpoints(self) -> Dict[str, float]:
+        """Checkpoint names mapped to timestamps (milliseconds since epoch)."""
+        return {name: ns / _NS_PER_MS for name, ns in self._ns.items()}
+
+    @staticmethod
+    def now_ms() -> float:
+        """
+        Current time in milliseconds since epoch (the unit used for checkpoints).
+
+        Returns:
+            Timestamp in milliseconds since epoch
+        """
+        return time.time_ns() / _NS_PER_MS
 
     def mark(self, checkpoint_name: str) -> float:
         """
@@ -49,14 +111,77 @@ class TimingContext:
         Example:
             timestamp_ms = ctx.mark("backend_request_sent")
         """
-        timestamp_ms = time.time() * 1000
-        self.checkpoints[checkpoint_name] = timestamp_ms
-        return timestamp_ms
+        ns = time.perf_counter_ns() + self._base_ns
+        # _store() inlined: mark() runs ~20 times per message
+        checkpoints = self._ns
+        if checkpoint_name in checkpoints:
+            self._bounds_stale = True
+        checkpoints[checkpoint_name] = ns
+        if self._first_ns is None:
+            self._first_ns = self._last_ns = ns
+        elif ns > self._last_ns:
+            self._last_ns = ns
+        elif ns < self._first_ns:
+            self._first_ns = ns
+        return ns / _NS_PER_MS
+
+    def defer_event(self, event_type: str, data: Dict[str, Any]) -> None:
+        """
+        Record a log event now and write it later with flush_events().
+
+        Keeps log formatting and serialization out of the spans being timed:
+        recording is a timestamp read and a list append. The event keeps the
+        time it was recorded at.
+
+        Args:
+            event_type: Event type identifier (e.g., "outgoing_message")
+            data: Event data dictionary (not copied: don't mutate it afterwards)
+
+        Example:
+            ctx.defer_event("message_sent", {"status_code": 200})
+        """
+        if self._events is None:
+            self._events = []
+        self._events.append((event_type, data, time.perf_counter_ns() + self._base_ns))
+
+    def flush_events(self, logger: EventLogger) -> None:
+        """
+        Log all deferred events in the order they were recorded.
+
+        Args:
+            logger: Event logger to write to (events use this context's correlation_id)
+
+        Example:
+            ctx.flush_events(event_logger)  # at the end of the request
+        """
+        events, self._events = self._events, None
+        for event_type, data, ns in events or ():
+            logger.log_event(event_type, data, self.correlation_id, timestamp=ns / 1e9)
+
+    def get_checkpoint(self, checkpoint_name: str) -> Optional[float]:
+        """
+        Get one checkpoint's timestamp without building the full breakdown.
+
+        Args:
+            checkpoint_name: Name of the checkpoint
+
+        Returns:
+            Timestamp in milliseconds since epoch, or None if not marked
+
+        Example:
+            sent_ms = ctx.get_checkpoint("text_sent")
+        """
+        ns = self._ns.get(checkpoint_name)
+        return None if ns is None else ns / _NS_PER_MS
 
     def get_breakdown(self) -> Dict[str, float]:
         """
         Get timing breakdown as dict of checkpoint names to timestamps.
 
+        Builds a new dict (checkpoints are stored as nanoseconds), which the
+        caller owns: it can be queued for logging or modified freely. Use
+        get_checkpoint() to read a single checkpoint.
+
         Returns:
             Dict mapping checkpoint names to timestamps (milliseconds since epoch)
 
@@ -68,7 +193,7 @@ class TimingContext:
             #   "backend_request_sent": 1234567891000
             # }
         """
-        return self.checkpoints.copy()
+        return self.checkpoints
 
     def get_elapsed(self, start_checkpoint: str, end_checkpoint: str) -> Optional[float]:
         """
@@ -85,10 +210,46 @@ class TimingContext:
             elapsed_ms = ctx.get_elapsed("webhook_received", "conversation_loaded")
             # 377.0 (ms)
         """
-        if start_checkpoint not in self.checkpoints or end_checkpoint not in self.checkpoints:
+        # One lookup per checkpoint (get() instead of `in` followed by [])
+        start_ns = self._ns.get(start_checkpoint)
+        end_ns = self._ns.get(end_checkpoint)
+        if start_ns is None or end_ns is None:
+            return None
+
+        # Integer subtraction: no float rounding on large epoch values
+        return (end_ns - start_ns) / _NS_PER_MS
+
+    def get_elapsed_adjusted(
+        self, start_checkpoint: str, end_checkpoint: str, intermediate_count: int
+    ) -> Optional[float]:
+        """
+        Elapsed time between two checkpoints minus the cost of the marks between them.
+
+        Each mark() inside a measured span adds its own (sub-microsecond) cost
+        to the span. This subtracts intermediate_count times the calibrated
+        per-mark cost, measured once per process on first use.
+
+        Args:
+            start_checkpoint: Starting checkpoint name
+            end_checkpoint: Ending checkpoint name
+            intermediate_count: Number of mark() calls made between the two
+
+        Returns:
+            Adjusted elapsed time in milliseconds (never negative), or None if
+            checkpoints don't exist
+
+        Example:
+            # 3 intermediate checkpoints between webhook and response
+            ctx.get_elapsed_adjusted("webhook_received", "text_sent", 3)
+        """
+        start_ns = self._ns.get(start_checkpoint)
+        end_ns = self._ns.get(end_checkpoint)
+        if start_ns is None or end_ns is None:
             return None
 
-        return self.checkpoints[end_checkpoint] - self.checkpoints[start_checkpoint]
+        elapsed_ns = end_ns - start_ns
+        adjusted_ns = elapsed_ns - intermediate_count * mark_overhead_ns()
+        return max(adjusted_ns, 0) / _NS_PER_MS
 
     def get_total_elapsed(self) -> Optional[float]:
         """
@@ -101,11 +262,14 @@ class TimingContext:
             total_ms = ctx.get_total_elapsed()
             # 5432.1 (ms from first to last checkpoint)
         """
-        if len(self.checkpoints) < 2:
+        if len(self._ns) < 2:
             return None
 
-        timestamps = list(self.checkpoints.values())
-        return max(timestamps) - min(timestamps)
+        if self._bounds_stale:
+            self._first_ns = min(self._ns.values())
+            self._last_ns = max(self._ns.values())
+            self._bounds_stale = False
+        return (self._last_ns - self._first_ns) / _NS_PER_MS
 
     def set_checkpoint(self, checkpoint_name: str, timestamp_ms: float) -> None:
         """
@@ -120,4 +284,36 @@ class TimingContext:
         Example:
             ctx.set_checkpoint("webhook_received", 1234567890123.45)
         """
-        self.checkpoints[checkpoint_name] = timestamp_ms
+        self._store(checkpoint_name, round(timestamp_ms * _NS_PER_MS))
+
+    def _store(self, checkpoint_name: str, ns: int) -> None:
+        """Store a checkpoint and extend the first/last bounds."""
+        checkpoints = self._ns
+        if checkpoint_name in checkpoints:
+            self._bounds_stale = True
+        checkpoints[checkpoint_name] = ns
+        if self._first_ns is None:
+            self._first_ns = self._last_ns = ns
+        elif ns > self._last_ns:
+            self._last_ns = ns
+        elif ns < self._first_ns:
+            self._first_ns = ns
+
+
+@lru_cache(maxsize=None)
+def mark_overhead_ns() -> int:
+    """
+    Average cost of one TimingContext.mark() call, measured once per process.
+
+    Calibrated lazily (first call) rather than at import, so importing the
+    module stays cheap.
+
+    Returns:
+        Per-mark overhead in nanoseconds
+    """
+    ctx = TimingContext()
+    mark = ctx.mark
+    start = time.perf_counter_ns()
+    for _ in range(_CALIBRATION_MARKS):
+        mark("calibration")
+    return (time.perf_counter_ns() - start) // _CALIBRATION_MARKS
@@ -7,20 +7,68 @@ via WhatsApp Business API.
 
 from __future__ import annotations
 
-import imghdr
-import json
-import os
-import tempfile
 import urllib.request
-import urllib.error
 from typing import Tuple, Dict, Any, Optional
 
+import httpx
+
+from . import json_utils
 from .logging_utils import eprint, EventLogger
-from .retry import retry
+from .retry import PermanentError, retry
 from .timing import TimingContext
 
 # Import WhatsApp utility functions for media upload and messaging
-from whatsapp_utils import upload_media, send_image_message, send_read_receipt
+from whatsapp_utils import upload_media_bytes, send_image_message, send_read_receipt
+
+# Graph API / image download timeout (seconds)
+WHATSAPP_TIMEOUT = 30
+
+
+def image_suffix(image_bytes: bytes) -> str:
+    """
+    File extension for an image, detected from its magic number.
+
+    Checks the formats WhatsApp accepts directly instead of going through the
+    deprecated imghdr module (removed in Python 3.13).
+
+    Args:
+        image_bytes: Raw image bytes (only the first 12 are read)
+
+    Returns:
+        ".jpg", ".png", ".gif" or ".webp"; ".jpg" when the format is unknown
+
+    Example:
+        suffix = image_suffix(downloaded_png)  # ".png"
+    """
+    header = image_bytes[:12]
+    if header.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if header.startswith(b"GIF8"):
+        return ".gif"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return ".webp"
+    return ".jpg"  # Default to .jpg
+
+
+def _api_error(status: int, message: str) -> Exception:
+    """
+    Exception for a failed API call, marking client errors as not retryable.
+
+    A 4xx response (other than 429 rate limiting) fails the same way on every
+    attempt, so it's raised as PermanentError and @retry gives up immediately.
+
+    Args:
+        status: HTTP status code (0 for transport errors)
+        message: Exception message
+
+    Returns:
+        PermanentError for 4xx except 429, plain Exception (retried) otherwise
+    """
+    if 400 <= status < 500 and status != 429:
+        return PermanentError(message)
+    return Exception(message)
 
 
 class WhatsAppClient:
@@ -29,8 +77,14 @@ class WhatsAppClient:
 
     Handles text messages, images, typing indicators, read receipts, and phone
     number normalization. Uses exponential backoff retry for transient failures.
+    All calls (Graph API and image downloads) go through one persistent HTTP/2
+    client, so a send reuses a pooled connection instead of paying a TCP+TLS
+    handshake each time.
     """
 
+    # Separators dropped by normalize_phone() in one str.translate() pass
+    _PHONE_STRIP_TABLE = str.maketrans("", "", " -().")
+
     def __init__(
         self,
         access_token: str,
@@ -52,6 +106,50 @@ class WhatsAppClient:
         self.graph_api_version = graph_api_version
         self.base_url = f"https://graph.facebook.com/{graph_api_version}/{phone_number_id}"
         self.logger = logger
+        # Per-request headers: the pooled client also downloads images from
+        # signed GCS URLs, which must not receive the Graph API token
+        self._json_headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+        }
+
+        # Thread-safe client shared by all worker threads (retries are handled by @retry)
+        self._client = httpx.Client(
+            http2=True,
+            timeout=WHATSAPP_TIMEOUT,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=16),
+        )
+
+    def close(self) -> None:
+        """Close the HTTP client and its pooled connections."""
+        self._client.close()
+
+    def _log_event(
+        self,
+        event_type: str,
+        data: Dict[str, Any],
+        correlation_id: Optional[str],
+        timing_ctx: Optional[TimingContext],
+    ) -> None:
+        """
+        Log an event, deferring it to the request's timing context when there is one.
+
+        Deferred events are written by the message handler when the request
+        finishes (TimingContext.flush_events), keeping serialization out of
+        the timed send spans; they keep the time they were recorded at.
+
+        Args:
+            event_type: Event type identifier
+            data: Event data dictionary
+            correlation_id: Optional correlation ID for request tracing
+            timing_ctx: Optional timing context of the current request
+        """
+        if not self.logger:
+            return
+        if timing_ctx is not None and timing_ctx.correlation_id == correlation_id:
+            timing_ctx.defer_event(event_type, data)
+        else:
+            self.logger.log_event(event_type, data, correlation_id)
 
     @retry(max_attempts=3, base_delay=1.0, max_delay=4.0, logger=eprint)
     def send_text_message(
@@ -64,7 +162,8 @@ class WhatsAppClient:
         """
         Send text message via WhatsApp API with retry logic.
 
-        Uses exponential backoff retry (3 attempts: 1s, 2s, 4s delays).
+        Uses exponential backoff retry (3 attempts: 1s, 2s, 4s delays). Client
+        errors (4xx other than 429) are not retried.
 
         Args:
             to_phone: Recipient phone number (will be normalized)
@@ -76,6 +175,7 @@ class WhatsAppClient:
             Tuple of (status_code, response_dict)
 
         Raises:
+            PermanentError: On a 4xx response other than 429 (not retried)
             Exception: On final retry failure (after 3 attempts)
 
         Example:
@@ -99,59 +199,47 @@ class WhatsAppClient:
         }
 
         # Log outgoing message
-        if self.logger:
-            self.logger.log_event("outgoing_message", {
-                "to_phone": normalized_phone,
-                "message_type": "text",
-                "text_length": len(text),
-            }, correlation_id)
-
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(
-            url=url,
-            data=data,
-            method="POST",
-            headers={
-                "Authorization": f"Bearer {self.access_token}",
-                "Content-Type": "application/json",
-            },
-        )
+        self._log_event("outgoing_message", {
+            "to_phone": normalized_phone,
+            "message_type": "text",
+            "text_length": len(text),
+        }, correlation_id, timing_ctx)
+
+        # Compact UTF-8 (orjson when installed): Hebrew text isn't \u-escaped
+        data = json_utils.dumps(payload)
 
         if timing_ctx:
             timing_ctx.mark("whatsapp_text_api_call_start")
 
+        resp = self._client.post(url, content=data, headers=self._json_headers)
+        status = resp.status_code
+        # Parsed straight from the body bytes (no decode to str first)
+        raw = resp.content
+
+        if status < 400:
+            response = json_utils.loads(raw) if raw else {}
+            if timing_ctx:
+                timing_ctx.mark("whatsapp_text_api_call_end")
+            # Log success
+            self._log_event("message_sent", {
+                "to_phone": normalized_phone,
+                "status_code": status,
+                "message_type": "text",
+            }, correlation_id, timing_ctx)
+            return status, response
+
         try:
-            with urllib.request.urlopen(req, timeout=30) as resp:
-                status = resp.getcode()
-                body = resp.read().decode("utf-8", errors="replace")
-                response = json.loads(body) if body else {}
-                if timing_ctx:
-                    timing_ctx.mark("whatsapp_text_api_call_end")
-                # Log success
-                if self.logger:
-                    self.logger.log_event("message_sent", {
-                        "to_phone": normalized_phone,
-                        "status_code": status,
-                        "message_type": "text",
-                    }, correlation_id)
-                return status, response
-
-        except urllib.error.HTTPError as e:
-            status = e.code
-            body = e.read().decode("utf-8", errors="replace")
-            try:
-                response = json.loads(body) if body else {"error": {"message": "Empty error body"}}
-            except json.JSONDecodeError:
-                response = {"error": {"message": body}}
-            # Log error
-            if self.logger:
-                self.logger.log_event("message_send_error", {
-                    "to_phone": normalized_phone,
-                    "status_code": status,
-                    "error": response.get('error', {}).get('message', 'Unknown error'),
-                }, correlation_id)
-            # Re-raise to trigger retry
-            raise Exception(f"HTTP {status}: {response.get('error', {}).get('message', 'Unknown error')}")
+            response = json_utils.loads(raw) if raw else {"error": {"message": "Empty error body"}}
+        except ValueError:
+            response = {"error": {"message": raw.decode("utf-8", errors="replace")}}
+        # Log error
+        self._log_event("message_send_error", {
+            "to_phone": normalized_phone,
+            "status_code": status,
+            "error": response.get('error', {}).get('message', 'Unknown error'),
+        }, correlation_id, timing_ctx)
+        # Raise to trigger retry (unless the error is permanent)
+        raise _api_error(status, f"HTTP {status}: {response.get('error', {}).get('message', 'Unknown error')}")
 
     @retry(max_attempts=3, base_delay=1.0, max_delay=4.0, logger=eprint)
     def send_image(
@@ -179,7 +267,8 @@ class WhatsAppClient:
             Tuple of (status_code, response_dict)
 
         Raises:
-            Exception: On final retry failure or if image > 5MB
+            PermanentError: If image > 5MB or on a 4xx response other than 429 (not retried)
+            Exception: On final retry failure
 
         Example:
             client = WhatsAppClient(token, phone_id)
@@ -191,105 +280,88 @@ class WhatsAppClient:
             )
         """
         normalized_phone = self.normalize_phone(to_phone)
-        temp_file: Optional[str] = None
 
         # Log outgoing image message
-        if self.logger:
-            self.logger.log_event("outgoing_message", {
-                "to_phone": normalized_phone,
-                "message_type": "image",
-                "image_url": image_url[:100],
-                "caption_length": len(caption),
-            }, correlation_id)
+        self._log_event("outgoing_message", {
+            "to_phone": normalized_phone,
+            "message_type": "image",
+            "image_url": image_url[:100],
+            "caption_length": len(caption),
+        }, correlation_id, timing_ctx)
+
+        # Download image
+        eprint(f"[IMAGE] Downloading from {image_url[:50]}...")
+        if timing_ctx:
+            timing_ctx.mark("image_download_start")
+        image_bytes = self.download_image_from_url(image_url, client=self._client)
+        if timing_ctx:
+            timing_ctx.mark("image_downloaded")
 
-        try:
-            # Download image
-            eprint(f"[IMAGE] Downloading from {image_url[:50]}...")
-            if timing_ctx:
-                timing_ctx.mark("image_download_start")
-            image_bytes = self.download_image_from_url(image_url)
-            if timing_ctx:
-                timing_ctx.mark("image_downloaded")
+        # Check size (WhatsApp 5MB limit)
+        size_mb = len(image_bytes) / (1024 * 1024)
+        if size_mb > 5:
+            eprint(f"[WARNING] Image too large: {size_mb:.2f}MB > 5MB limit")
+            raise PermanentError(f"Image too large: {size_mb:.2f}MB")
 
-            # Check size (WhatsApp 5MB limit)
-            size_mb = len(image_bytes) / (1024 * 1024)
-            if size_mb > 5:
-                eprint(f"[WARNING] Image too large: {size_mb:.2f}MB > 5MB limit")
-                raise Exception(f"Image too large: {size_mb:.2f}MB")
+        suffix = image_suffix(image_bytes)
 
-            # Detect image format from magic numbers
-            image_format = imghdr.what(None, h=image_bytes[:32])
-            suffix = f'.{image_format}' if image_format else '.jpg'  # Default to .jpg
+        eprint(f"[IMAGE] Uploading to WhatsApp ({size_mb:.2f}MB)...")
 
-            # Save to temp file with correct extension
-            with tempfile.NamedTemporaryFile(mode='wb', suffix=suffix, delete=False) as f:
-                f.write(image_bytes)
-                temp_file = f.name
+        if timing_ctx:
+            timing_ctx.mark("image_upload_start")
+        # Upload to WhatsApp straight from memory (no temp file round trip)
+        status, upload_response = upload_media_bytes(
+            self.access_token,
+            self.phone_number_id,
+            image_bytes,
+            f"image{suffix}",  # Extension sets the upload's MIME type
+            client=self._client,
+        )
 
-            eprint(f"[IMAGE] Uploading to WhatsApp ({size_mb:.2f}MB)...")
+        if status < 200 or status >= 300 or "id" not in upload_response:
+            eprint(f"[ERROR] Upload failed: status={status}, response={upload_response}")
+            raise _api_error(status, f"Upload failed: {upload_response.get('error', {}).get('message', 'Unknown error')}")
 
-            if timing_ctx:
-                timing_ctx.mark("image_upload_start")
-            # Upload to WhatsApp
-            status, upload_response = upload_media(
-                self.access_token,
-                self.phone_number_id,
-                temp_file
-            )
-
-            if status < 200 or status >= 300 or "id" not in upload_response:
-                eprint(f"[ERROR] Upload failed: status={status}, response={upload_response}")
-                raise Exception(f"Upload failed: {upload_response.get('error', {}).get('message', 'Unknown error')}")
+        media_id = upload_response["id"]
+        eprint(f"[IMAGE] Upload successful, media_id={media_id}")
+        if timing_ctx:
+            timing_ctx.mark("image_uploaded")
 
-            media_id = upload_response["id"]
-            eprint(f"[IMAGE] Upload successful, media_id={media_id}")
-            if timing_ctx:
-                timing_ctx.mark("image_uploaded")
+        # Send image message
+        eprint(f"[IMAGE] Sending image with caption...")
+        if timing_ctx:
+            timing_ctx.mark("image_message_send_start")
+        status, send_response = send_image_message(
+            self.access_token,
+            self.phone_number_id,
+            normalized_phone,
+            media_id,
+            caption[:1024],  # Truncate to WhatsApp limit
+            client=self._client,
+        )
 
-            # Send image message
-            eprint(f"[IMAGE] Sending image with caption...")
+        if 200 <= status < 300:
+            eprint(f"✓ Image sent successfully")
             if timing_ctx:
-                timing_ctx.mark("image_message_send_start")
-            status, send_response = send_image_message(
-                self.access_token,
-                self.phone_number_id,
-                normalized_phone,
-                media_id,
-                caption[:1024]  # Truncate to WhatsApp limit
-            )
-
-            if 200 <= status < 300:
-                eprint(f"✓ Image sent successfully")
-                if timing_ctx:
-                    timing_ctx.mark("image_message_sent")
-                # Log success
-                if self.logger:
-                    self.logger.log_event("message_sent", {
-                        "to_phone": normalized_phone,
-                        "status_code": status,
-                        "message_type": "image",
-                        "image_size_mb": size_mb,
-                    }, correlation_id)
-                return status, send_response
-            else:
-                eprint(f"[ERROR] Send failed: status={status}, response={send_response}")
-                # Log error
-                if self.logger:
-                    self.logger.log_event("message_send_error", {
-                        "to_phone": normalized_phone,
-                        "status_code": status,
-                        "message_type": "image",
-                        "error": send_response.get('error', {}).get('message', 'Unknown error'),
-                    }, correlation_id)
-                raise Exception(f"Send failed: {send_response.get('error', {}).get('message', 'Unknown error')}")
-
-        finally:
-            # Clean up temp file
-            if temp_file and os.path.exists(temp_file):
-                try:
-                    os.unlink(temp_file)
-                except Exception as e:
-                    eprint(f"[WARNING] Failed to delete temp file {temp_file}: {e}")
+                timing_ctx.mark("image_message_sent")
+            # Log success
+            self._log_event("message_sent", {
+                "to_phone": normalized_phone,
+                "status_code": status,
+                "message_type": "image",
+                "image_size_mb": size_mb,
+            }, correlation_id, timing_ctx)
+            return status, send_response
+        else:
+            eprint(f"[ERROR] Send failed: status={status}, response={send_response}")
+            # Log error
+            self._log_event("message_send_error", {
+                "to_phone": normalized_phone,
+                "status_code": status,
+                "message_type": "image",
+                "error": send_response.get('error', {}).get('message', 'Unknown error'),
+            }, correlation_id, timing_ctx)
+            raise _api_error(status, f"Send failed: {send_response.get('error', {}).get('message', 'Unknown error')}")
 
     def send_read_receipt(self, message_id: str, typing_indicator: bool = False) -> Tuple[int, Dict[str, Any]]:
         """
@@ -318,7 +390,8 @@ class WhatsAppClient:
                 self.access_token,
                 self.phone_number_id,
                 message_id,
-                typing_indicator=typing_indicator
+                typing_indicator=typing_indicator,
+                client=self._client,
             )
         except Exception as e:
             eprint(f"[WARNING] Failed to send read receipt: {e}")
@@ -348,19 +421,20 @@ class WhatsAppClient:
         s = raw.strip()
         if s.startswith("+"):
             s = s[1:]
-        for ch in (" ", "-", "(", ")", "."):
-            s = s.replace(ch, "")
+        s = s.translate(WhatsAppClient._PHONE_STRIP_TABLE)
         if not s.isdigit():
             raise ValueError(f"Invalid phone number: {raw}")
         return s
 
     @staticmethod
-    def download_image_from_url(url: str) -> bytes:
+    def download_image_from_url(url: str, client: Optional[httpx.Client] = None) -> bytes:
         """
         Download image from URL (GCS signed URL).
 
         Args:
             url: Image URL to download (GCS signed URL from backend)
+            client: Optional pooled httpx client to download with; by default a
+                new urllib connection is opened
 
         Returns:
             Raw image bytes
@@ -373,8 +447,15 @@ class WhatsAppClient:
                 "https://storage.googleapis.com/..."
             )
         """
+        if client is not None:
+            # Follow redirects like urlopen() does (image hosts may answer 30x)
+            resp = client.get(url, follow_redirects=True)
+            if resp.status_code != 200:
+                raise _api_error(resp.status_code, f"Download failed with status {resp.status_code}")
+            return resp.content
+
         req = urllib.request.Request(url, method="GET")
-        with urllib.request.urlopen(req, timeout=30) as resp:
+        with urllib.request.urlopen(req, timeout=WHATSAPP_TIMEOUT) as resp:
             if resp.getcode() != 200:
                 raise Exception(f"Download failed with status {resp.getcode()}")
             return resp.read()
@@ -15,7 +15,9 @@ import os
 import signal
 import sys
 import subprocess
+import threading
 import time
+from typing import Optional
 
 import requests
 from dotenv import load_dotenv
@@ -35,6 +37,19 @@ from backend.gcs_storage import GCSStorage
 
 load_dotenv()
 
+# Graceful shutdown: wait this long for background tasks, then force exit if
+# the rest of shutdown (flushes, interpreter teardown) hangs past the buffer
+SHUTDOWN_WAIT_SECONDS = 30
+SHUTDOWN_HARD_KILL_BUFFER_SECONDS = 5
+
+# ngrok's local API, polled for the public URL after starting ngrok
+NGROK_API_URL = "http://127.0.0.1:4040/api/tunnels"
+NGROK_START_TIMEOUT_SECONDS = 10
+NGROK_POLL_INTERVAL_SECONDS = 0.25
+
+# Time processes on the local backend port get to exit after SIGTERM
+PORT_RELEASE_TIMEOUT_SECONDS = 2
+
 # Import other functions that tests might need
 from whatsapp.message_handler import process_message
 from whatsapp.whatsapp_client import WhatsAppClient
@@ -159,12 +174,106 @@ def send_image_with_retry(to_phone: str, image_url: str, caption: str, correlati
 backend_process = None
 
 
+def _find_ngrok_tunnel(port: int) -> Optional[str]:
+    """
+    Get the public URL of a running ngrok tunnel to the given local port.
+
+    Args:
+        port: Local port the tunnel forwards to
+
+    Returns:
+        Public tunnel URL, or None if ngrok isn't running or has no such tunnel
+    """
+    try:
+        ngrok_api_response = requests.get(NGROK_API_URL, timeout=2)
+        if ngrok_api_response.status_code != 200:
+            return None
+        tunnels_data = ngrok_api_response.json()
+    except Exception:
+        # ngrok API not available (not running yet), or unreadable response
+        return None
+
+    for tunnel in tunnels_data.get("tunnels", []):
+        # Look for tunnel on our port
+        config_addr = tunnel.get("config", {}).get("addr", "")
+        if f"localhost:{port}" in config_addr or f"127.0.0.1:{port}" in config_addr:
+            public_url = tunnel.get("public_url")
+            if public_url:
+                return public_url
+    return None
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process exists (signal 0 probes without signalling)."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by another user
+    return True
+
+
+def _free_port(port: int) -> None:
+    """
+    Terminate the processes holding a local port: SIGTERM, then SIGKILL.
+
+    Finds the PIDs with one lsof call and signals them in-process with
+    os.kill (no kill subprocess per PID). Processes get up to
+    PORT_RELEASE_TIMEOUT_SECONDS to exit after SIGTERM; the wait ends as soon
+    as they're all gone instead of sleeping a fixed time.
+
+    Args:
+        port: Local TCP port to free
+    """
+    result = subprocess.run(
+        ["lsof", "-ti", f":{port}"],
+        capture_output=True,
+        text=True,
+        timeout=5
+    )
+    pids = {int(pid) for pid in result.stdout.split()}
+    if not pids:
+        return
+
+    for pid in pids:
+        eprint(f"   Terminating process {pid} on port {port}")
+        # Try graceful termination first (SIGTERM)
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    # Wait for graceful shutdown, polling until every process has exited
+    deadline = time.monotonic() + PORT_RELEASE_TIMEOUT_SECONDS
+    while pids and time.monotonic() < deadline:
+        time.sleep(0.1)
+        pids = {pid for pid in pids if _pid_alive(pid)}
+
+    # Force kill any processes still running
+    for pid in pids:
+        eprint(f"   Force killing process {pid} (SIGKILL)")
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    if pids:
+        time.sleep(1)
+
+
+def _force_exit() -> None:
+    """Hard-kill the process when graceful shutdown overruns its budget."""
+    eprint(f"⚠️  Shutdown still running after {SHUTDOWN_WAIT_SECONDS + SHUTDOWN_HARD_KILL_BUFFER_SECONDS}s, forcing exit")
+    os._exit(0)
+
+
 def graceful_shutdown(signum=None, frame=None):
     """
     Graceful shutdown handler - waits for active background threads to complete.
 
     Called on SIGTERM/SIGINT signals. Waits up to 30 seconds for active threads
-    to complete, then exits.
+    to complete, then exits. A watchdog forces exit 5 seconds after that if
+    flushing or interpreter shutdown hangs.
 
     Args:
         signum: Signal number (from signal handler)
@@ -172,8 +281,25 @@ def graceful_shutdown(signum=None, frame=None):
     """
     eprint("\n🛑 Shutdown signal received, waiting for active threads...")
 
+    # Bounded shutdown even if a thread is stuck in C code: os._exit skips
+    # interpreter teardown, so it can't be blocked by what it's escaping
+    hard_kill = threading.Timer(
+        SHUTDOWN_WAIT_SECONDS + SHUTDOWN_HARD_KILL_BUFFER_SECONDS, _force_exit
+    )
+    hard_kill.daemon = True
+    hard_kill.start()
+
     task_manager = get_task_manager()
-    remaining = task_manager.wait_for_completion(max_wait_seconds=30)
+    remaining = task_manager.wait_for_completion(max_wait_seconds=SHUTDOWN_WAIT_SECONDS)
+    task_manager.shutdown()
+    get_delivery_tracker().stop()
+
+    # Release pooled backend/WhatsApp connections and write out queued query logs / events
+    get_backend_client().close()
+    for whatsapp_client in get_whatsapp_clients().values():
+        whatsapp_client.close()
+    get_query_logger().close()
+    get_event_logger().close()
 
     sys.exit(0)
 
@@ -210,33 +336,7 @@ if __name__ == "__main__":
                 # Kill any existing process on backend port
                 eprint(f"\n🔍 Checking for processes on port {config.backend_port}...")
                 try:
-                    result = subprocess.run(
-                        ["lsof", "-ti", f":{config.backend_port}"],
-                        capture_output=True,
-                        text=True,
-                        timeout=5
-                    )
-                    if result.stdout.strip():
-                        pids = result.stdout.strip().split('\n')
-                        for pid in pids:
-                            eprint(f"   Terminating process {pid} on port {config.backend_port}")
-                            # Try graceful termination first (SIGTERM)
-                            subprocess.run(["kill", pid], timeout=5)
-                        # Wait for graceful shutdown
-                        time.sleep(2)
-                        # Check if any processes still running, force kill if necessary
-                        result2 = subprocess.run(
-                            ["lsof", "-ti", f":{config.backend_port}"],
-                            capture_output=True,
-                            text=True,
-                            timeout=5
-                        )
-                        if result2.stdout.strip():
-                            remaining_pids = result2.stdout.strip().split('\n')
-                            for pid in remaining_pids:
-                                eprint(f"   Force killing process {pid} (SIGKILL)")
-                                subprocess.run(["kill", "-9", pid], timeout=5)
-                            time.sleep(1)
+                    _free_port(config.backend_port)
                 except Exception as e:
                     eprint(f"   (Could not check/kill processes: {e})")
 
@@ -263,23 +363,11 @@ if __name__ == "__main__":
         # Setup and start ngrok tunnel
         public_url = None
         try:
-            # First, check if ngrok is already running
-            # ngrok exposes a local API at http://127.0.0.1:4040/api/tunnels
-            try:
-                ngrok_api_response = requests.get("http://127.0.0.1:4040/api/tunnels", timeout=2)
-                if ngrok_api_response.status_code == 200:
-                    tunnels_data = ngrok_api_response.json()
-                    for tunnel in tunnels_data.get("tunnels", []):
-                        # Look for tunnel on our port
-                        config_addr = tunnel.get("config", {}).get("addr", "")
-                        if f"localhost:{config.port}" in config_addr or f"127.0.0.1:{config.port}" in config_addr:
-                            public_url = tunnel.get("public_url")
-                            if public_url:
-                                eprint(f"\n✓ Found existing ngrok tunnel")
-                                break
-            except Exception:
-                # ngrok API not available (not running)
-                pass
+            # First, check if ngrok is already running (tunnels persist across
+            # bot restarts, so a warm restart reuses the tunnel and its URL)
+            public_url = _find_ngrok_tunnel(config.port)
+            if public_url:
+                eprint(f"\n✓ Found existing ngrok tunnel")
 
             # If no existing tunnel found, start ngrok as background process
             if not public_url:
@@ -297,28 +385,16 @@ if __name__ == "__main__":
                     start_new_session=True  # Detach from parent process
                 )
 
-                # Wait for ngrok to start and get the tunnel URL
-                for attempt in range(10):
-                    time.sleep(1)
-                    try:
-                        ngrok_api_response = requests.get("http://127.0.0.1:4040/api/tunnels", timeout=2)
-                        if ngrok_api_response.status_code == 200:
-                            tunnels_data = ngrok_api_response.json()
-                            for tunnel in tunnels_data.get("tunnels", []):
-                                config_addr = tunnel.get("config", {}).get("addr", "")
-                                if f"localhost:{config.port}" in config_addr or f"127.0.0.1:{config.port}" in config_addr:
-                                    public_url = tunnel.get("public_url")
-                                    if public_url:
-                                        eprint(f"✓ ngrok tunnel started (persists across bot restarts)")
-                                        break
-                            if public_url:
-                                break
-                    except Exception:
-                        # Retry on any error (network, JSON parsing, etc.)
-                        continue
+                # Wait for ngrok to start and get the tunnel URL. Poll at a short
+                # interval: the tunnel is usually up well within the first second
+                deadline = time.monotonic() + NGROK_START_TIMEOUT_SECONDS
+                while not public_url and time.monotonic() < deadline:
+                    time.sleep(NGROK_POLL_INTERVAL_SECONDS)
+                    public_url = _find_ngrok_tunnel(config.port)
 
                 if not public_url:
-                    raise Exception("Failed to get ngrok tunnel URL after 10 seconds")
+                    raise Exception(f"Failed to get ngrok tunnel URL after {NGROK_START_TIMEOUT_SECONDS} seconds")
+                eprint(f"✓ ngrok tunnel started (persists across bot restarts)")
 
             if public_url:
                 eprint(f"\n🌐 Local:      http://127.0.0.1:{config.port}")
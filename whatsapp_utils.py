@@ -17,15 +17,76 @@ from __future__ import annotations
 import json
 import mimetypes
 import os
+import urllib.error
 import urllib.parse
 import urllib.request
 import uuid
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import httpx
 
 
 GRAPH_API_VERSION = os.getenv("META_GRAPH_API_VERSION", "v22.0")
 
 
+def _decode_error_body(raw: bytes) -> dict:
+    """Parse an HTTP error body, wrapping empty or non-JSON bodies in an error dict."""
+    body = raw.decode("utf-8", errors="replace")
+    if not body:
+        return {"error": {"message": "Empty error body"}}
+    try:
+        return json.loads(body)
+    except json.JSONDecodeError:
+        return {"error": {"message": body}}
+
+
+def _do_request(
+    req: urllib.request.Request, timeout: int, client: Optional[httpx.Client] = None
+) -> tuple[int, dict]:
+    """
+    Execute a Graph API request and normalize the outcome.
+
+    Args:
+        req: Prepared urllib request
+        timeout: Socket timeout in seconds
+        client: Optional pooled httpx client to send the request on (reuses its
+            keep-alive connections); by default a new urllib connection is opened
+
+    Returns:
+        Tuple of (status_code, response_dict). Status is 0 for transport errors.
+    """
+    if client is not None:
+        try:
+            resp = client.request(
+                req.get_method(),
+                req.full_url,
+                content=req.data,
+                headers=dict(req.header_items()),
+                timeout=timeout,
+            )
+        except Exception as e:
+            return 0, {"error": {"message": f"{type(e).__name__}: {e}"}}
+        if resp.status_code >= 400:
+            return resp.status_code, _decode_error_body(resp.content)
+        # json.loads() takes the body bytes directly. A non-JSON 2xx body is
+        # reported like the urllib path below reports it (status 0)
+        try:
+            return resp.status_code, json.loads(resp.content) if resp.content else {}
+        except ValueError as e:
+            return 0, {"error": {"message": f"{type(e).__name__}: {e}"}}
+
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            status = resp.getcode()
+            body = resp.read().decode("utf-8", errors="replace")
+            return status, json.loads(body) if body else {}
+    except urllib.error.HTTPError as e:
+        return e.code, _decode_error_body(e.read())
+    except Exception as e:
+        return 0, {"error": {"message": f"{type(e).__name__}: {e}"}}
+
+
 def normalize_msisdn(raw: str) -> str:
     """
     WhatsApp Cloud API expects phone numbers in international format, digits only.
@@ -53,7 +114,12 @@ def normalize_msisdn(raw: str) -> str:
     return s
 
 
-def upload_media(token: str, phone_number_id: str, file_path: str) -> tuple[int, dict]:
+def upload_media(
+    token: str,
+    phone_number_id: str,
+    file_path: str,
+    client: Optional[httpx.Client] = None,
+) -> tuple[int, dict]:
     """
     Upload a media file to WhatsApp and return the media ID.
 
@@ -61,17 +127,11 @@ def upload_media(token: str, phone_number_id: str, file_path: str) -> tuple[int,
         token: WhatsApp access token
         phone_number_id: WhatsApp phone number ID
         file_path: Path to local file to upload
+        client: Optional pooled httpx client (keep-alive connection reuse)
 
     Returns:
         Tuple of (status_code, response_dict with 'id' key on success)
     """
-    url = f"https://graph.facebook.com/{GRAPH_API_VERSION}/{phone_number_id}/media"
-
-    # Determine MIME type based on file extension
-    mime_type, _ = mimetypes.guess_type(file_path)
-    if not mime_type:
-        mime_type = "application/octet-stream"
-
     # Read file
     try:
         with open(file_path, "rb") as f:
@@ -79,6 +139,40 @@ def upload_media(token: str, phone_number_id: str, file_path: str) -> tuple[int,
     except Exception as e:
         return 0, {"error": {"message": f"Failed to read file: {e}"}}
 
+    return upload_media_bytes(
+        token, phone_number_id, file_data, os.path.basename(file_path), client=client
+    )
+
+
+def upload_media_bytes(
+    token: str,
+    phone_number_id: str,
+    file_data: bytes,
+    filename: str,
+    client: Optional[httpx.Client] = None,
+) -> tuple[int, dict]:
+    """
+    Upload in-memory media to WhatsApp and return the media ID.
+
+    Same as upload_media() without the round trip through a file on disk.
+
+    Args:
+        token: WhatsApp access token
+        phone_number_id: WhatsApp phone number ID
+        file_data: Raw media bytes
+        filename: File name sent with the upload (its extension sets the MIME type)
+        client: Optional pooled httpx client (keep-alive connection reuse)
+
+    Returns:
+        Tuple of (status_code, response_dict with 'id' key on success)
+    """
+    url = f"https://graph.facebook.com/{GRAPH_API_VERSION}/{phone_number_id}/media"
+
+    # Determine MIME type based on file extension
+    mime_type, _ = mimetypes.guess_type(filename)
+    if not mime_type:
+        mime_type = "application/octet-stream"
+
     # Create multipart form data
     boundary = f"----WebKitFormBoundary{uuid.uuid4().hex[:16]}"
 
@@ -92,7 +186,6 @@ def upload_media(token: str, phone_number_id: str, file_path: str) -> tuple[int,
     body_parts.append("whatsapp\r\n")
 
     # Add file field
-    filename = os.path.basename(file_path)
     body_parts.append(f"--{boundary}\r\n")
     body_parts.append(
         f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
@@ -116,26 +209,15 @@ def upload_media(token: str, phone_number_id: str, file_path: str) -> tuple[int,
         },
     )
 
-    try:
-        with urllib.request.urlopen(req, timeout=60) as resp:
-            status = resp.getcode()
-            body = resp.read().decode("utf-8", errors="replace")
-            return status, json.loads(body) if body else {}
-    except urllib.error.HTTPError as e:
-        status = e.code
-        body = e.read().decode("utf-8", errors="replace")
-        try:
-            return status, (
-                json.loads(body) if body else {"error": {"message": "Empty error body"}}
-            )
-        except json.JSONDecodeError:
-            return status, {"error": {"message": body}}
-    except Exception as e:
-        return 0, {"error": {"message": f"{type(e).__name__}: {e}"}}
+    return _do_request(req, timeout=60, client=client)
 
 
 def send_text_message(
-    token: str, phone_number_id: str, to_msisdn: str, text: str
+    token: str,
+    phone_number_id: str,
+    to_msisdn: str,
+    text: str,
+    client: Optional[httpx.Client] = None,
 ) -> tuple[int, dict]:
     """
     Send a text message via WhatsApp Cloud API.
@@ -145,6 +227,7 @@ def send_text_message(
         phone_number_id: WhatsApp phone number ID
         to_msisdn: Recipient phone number (digits only, international format)
         text: Message text to send
+        client: Optional pooled httpx client (keep-alive connection reuse)
 
     Returns:
         Tuple of (status_code, response_dict)
@@ -169,22 +252,7 @@ def send_text_message(
         },
     )
 
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            status = resp.getcode()
-            body = resp.read().decode("utf-8", errors="replace")
-            return status, json.loads(body) if body else {}
-    except urllib.error.HTTPError as e:
-        status = e.code
-        body = e.read().decode("utf-8", errors="replace")
-        try:
-            return status, (
-                json.loads(body) if body else {"error": {"message": "Empty error body"}}
-            )
-        except json.JSONDecodeError:
-            return status, {"error": {"message": body}}
-    except Exception as e:
-        return 0, {"error": {"message": f"{type(e).__name__}: {e}"}}
+    return _do_request(req, timeout=30, client=client)
 
 
 def send_image_message(
@@ -193,6 +261,7 @@ def send_image_message(
     to_msisdn: str,
     media_id: str,
     caption: Optional[str] = None,
+    client: Optional[httpx.Client] = None,
 ) -> tuple[int, dict]:
     """
     Send an image message using a media ID.
@@ -203,6 +272,7 @@ def send_image_message(
         to_msisdn: Recipient phone number (digits only, international format)
         media_id: Media ID from upload_media()
         caption: Optional image caption (max 1024 chars for WhatsApp)
+        client: Optional pooled httpx client (keep-alive connection reuse)
 
     Returns:
         Tuple of (status_code, response_dict)
@@ -231,26 +301,15 @@ def send_image_message(
         },
     )
 
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            status = resp.getcode()
-            body = resp.read().decode("utf-8", errors="replace")
-            return status, json.loads(body) if body else {}
-    except urllib.error.HTTPError as e:
-        status = e.code
-        body = e.read().decode("utf-8", errors="replace")
-        try:
-            return status, (
-                json.loads(body) if body else {"error": {"message": "Empty error body"}}
-            )
-        except json.JSONDecodeError:
-            return status, {"error": {"message": body}}
-    except Exception as e:
-        return 0, {"error": {"message": f"{type(e).__name__}: {e}"}}
+    return _do_request(req, timeout=30, client=client)
 
 
 def send_read_receipt(
-    token: str, phone_number_id: str, message_id: str, typing_indicator: bool = False
+    token: str,
+    phone_number_id: str,
+    message_id: str,
+    typing_indicator: bool = False,
+    client: Optional[httpx.Client] = None,
 ) -> tuple[int, dict]:
     """
     Mark message as read (sends blue checkmarks to sender).
@@ -266,6 +325,7 @@ def send_read_receipt(
         phone_number_id: WhatsApp phone number ID
         message_id: Message ID from incoming webhook (required to mark as read)
         typing_indicator: If True, show typing animation (default: False)
+        client: Optional pooled httpx client (keep-alive connection reuse)
 
     Returns:
         Tuple of (status_code, response_dict)
@@ -302,22 +362,7 @@ def send_read_receipt(
         },
     )
 
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            status = resp.getcode()
-            body = resp.read().decode("utf-8", errors="replace")
-            return status, json.loads(body) if body else {}
-    except urllib.error.HTTPError as e:
-        status = e.code
-        body = e.read().decode("utf-8", errors="replace")
-        try:
-            return status, (
-                json.loads(body) if body else {"error": {"message": "Empty error body"}}
-            )
-        except json.JSONDecodeError:
-            return status, {"error": {"message": body}}
-    except Exception as e:
-        return 0, {"error": {"message": f"{type(e).__name__}: {e}"}}
+    return _do_request(req, timeout=30, client=client)
 
 
 # DEPRECATED: send_typing_indicator() has been removed.